@@ -0,0 +1,13 @@
+"""
+Benchmarks du projet.
+
+Chaque module s'exécute depuis la racine du dépôt, par exemple :
+
+    python -m benchmarks.token_generators
+
+Les benchmarks utilisent par défaut le profil `core.settings.test` (SQLite) ;
+la suite de référence (`python -m benchmarks.suite`) utilise `core.settings.benchmark`
+(SQLite entièrement en mémoire) et compare ses résultats à `baselines/suite.json`.
+`python -m benchmarks.startup` mesure le démarrage à froid d'un worker (import de
+core.wsgi / core.asgi et première réponse).
+"""
@@ -0,0 +1,167 @@
+"""
+Compare, sur la même machine et dans le même processus, le débit et la latence
+sous charge concurrente de trois déploiements :
+
+- WSGI : vues synchrones, un thread par requête (comme gunicorn --threads) ;
+- ASGI-sync : vues synchrones sous core/asgi.py (passage par sync_to_async) ;
+- ASGI-async : vues asynchrones (/api/async/ping/, /api/projects/async/).
+
+Les requêtes sont adressées directement aux callables WSGI/ASGI de Django, sans
+serveur ni réseau : l'écart mesuré est celui du framework et de l'ORM.
+
+    python -m benchmarks.asgi_load [--requests N] [--concurrency C] [--projects N]
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from urllib.parse import urlsplit
+
+from benchmarks.utils import setup_django, create_test_database
+
+# (nom, chemin de la vue synchrone, chemin de la vue asynchrone)
+ENDPOINTS = [
+    ("GET ping", "/api/ping/", "/api/async/ping/"),
+    ("GET projects (20)", "/api/projects/?limit=20", "/api/projects/async/?limit=20"),
+]
+
+
+def summarize(durations, elapsed):
+    durations.sort()
+    return {
+        "requests_per_sec": len(durations) / elapsed,
+        "p50_ms": statistics.median(durations) * 1000,
+        "p99_ms": durations[min(len(durations) - 1, int(len(durations) * 0.99))] * 1000,
+    }
+
+
+def run_wsgi(application, url, token, requests, concurrency):
+    path, _, query = url.partition("?")
+    base_environ = {
+        "REQUEST_METHOD": "GET",
+        "PATH_INFO": path,
+        "QUERY_STRING": query,
+        "SERVER_NAME": "testserver",
+        "SERVER_PORT": "80",
+        "SERVER_PROTOCOL": "HTTP/1.1",
+        "HTTP_HOST": "testserver",
+        "HTTP_AUTHORIZATION": f"Bearer {token}",
+        "wsgi.url_scheme": "http",
+        "wsgi.errors": BytesIO(),
+        "wsgi.multithread": True,
+        "wsgi.multiprocess": False,
+        "wsgi.run_once": False,
+    }
+
+    def call(_):
+        statuses = []
+        started = time.perf_counter()
+        environ = {**base_environ, "wsgi.input": BytesIO()}
+        body = application(environ, lambda status, headers, exc_info=None: statuses.append(status))
+        b"".join(body)
+        body.close()
+        assert statuses[0].startswith("200"), statuses[0]
+        return time.perf_counter() - started
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        durations = list(executor.map(call, range(requests)))
+    return summarize(durations, time.perf_counter() - started)
+
+
+async def run_asgi(application, url, token, requests, concurrency):
+    parts = urlsplit(url)
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": parts.path,
+        "raw_path": parts.path.encode(),
+        "query_string": parts.query.encode(),
+        "root_path": "",
+        "headers": [(b"host", b"testserver"), (b"authorization", f"Bearer {token}".encode())],
+        "server": ("testserver", 80),
+        "client": ("127.0.0.1", 50000),
+    }
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def call():
+        async with semaphore:
+            body_sent = False
+            disconnected = asyncio.Event()
+            statuses = []
+
+            async def receive():
+                nonlocal body_sent
+                if not body_sent:
+                    body_sent = True
+                    return {"type": "http.request", "body": b"", "more_body": False}
+                # Le client reste connecté : Django annule cette attente en fin de réponse
+                await disconnected.wait()
+                return {"type": "http.disconnect"}
+
+            async def send(message):
+                if message["type"] == "http.response.start":
+                    statuses.append(message["status"])
+
+            started = time.perf_counter()
+            await application(dict(scope), receive, send)
+            assert statuses[0] == 200, statuses[0]
+            return time.perf_counter() - started
+
+    started = time.perf_counter()
+    durations = await asyncio.gather(*(call() for _ in range(requests)))
+    return summarize(list(durations), time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--projects", type=int, default=100)
+    args = parser.parse_args()
+
+    setup_django()
+    create_test_database()
+
+    from django.core.asgi import get_asgi_application
+    from django.core.wsgi import get_wsgi_application
+    from rest_framework_simplejwt.tokens import RefreshToken
+    from projects.infrastructure.models import ProjectModel, ProjectMemberModel
+    from users.infrastructure.models.user_model import UserModel
+
+    user = UserModel.objects.create_user(email="load@example.com", password="motdepasse123", full_name="Charge")
+    projects = ProjectModel.objects.bulk_create(
+        ProjectModel(name=f"Projet {i}", owner=user) for i in range(args.projects)
+    )
+    ProjectMemberModel.objects.bulk_create(
+        ProjectMemberModel(project=project, user=user, role="ADMIN") for project in projects
+    )
+    token = str(RefreshToken.for_user(user).access_token)
+
+    wsgi_application = get_wsgi_application()
+    asgi_application = get_asgi_application()
+
+    print(f"{args.requests} requêtes, {args.concurrency} en parallèle")
+    print(f"{'':<34}{'req/s':>10}{'p50 (ms)':>12}{'p99 (ms)':>12}")
+    for name, sync_url, async_url in ENDPOINTS:
+        # Un premier passage court remplit les caches (utilisateur, URLconf)
+        run_wsgi(wsgi_application, sync_url, token, args.concurrency, args.concurrency)
+        results = {
+            "WSGI": run_wsgi(wsgi_application, sync_url, token, args.requests, args.concurrency),
+            "ASGI-sync": asyncio.run(run_asgi(asgi_application, sync_url, token, args.requests, args.concurrency)),
+            "ASGI-async": asyncio.run(run_asgi(asgi_application, async_url, token, args.requests, args.concurrency)),
+        }
+        for mode, result in results.items():
+            print(
+                f"{name + ' — ' + mode:<34}{result['requests_per_sec']:>10.0f}"
+                f"{result['p50_ms']:>12.2f}{result['p99_ms']:>12.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Mesure GET /api/projects/<id>/board/ sur un tableau de N tâches assignées, et
+compare la lecture en une requête (TaskMapper.to_entities) à une lecture par
+colonne avec accès paresseux aux assignés (N+1). Code de sortie 1 si la latence
+médiane de l'endpoint dépasse le budget.
+
+    python -m benchmarks.board [--tasks N] [--iterations N] [--budget-ms MS]
+"""
+import argparse
+import sys
+
+from benchmarks.utils import setup_django, create_test_database, measure, print_results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tasks", type=int, default=5000)
+    parser.add_argument("--members", type=int, default=50)
+    parser.add_argument("--iterations", type=int, default=30)
+    parser.add_argument("--budget-ms", type=float, default=500.0, help="p50 maximal de l'endpoint.")
+    args = parser.parse_args()
+
+    setup_django()
+    create_test_database()
+
+    from django.db import connection
+    from rest_framework.test import APIClient
+    from projects.infrastructure.models import ProjectModel, ProjectMemberModel, TaskModel
+    from users.infrastructure.models.user_model import UserModel
+
+    users = UserModel.objects.bulk_create(
+        UserModel(email=f"member{i}@example.com", full_name=f"Membre {i}", password="!")
+        for i in range(args.members)
+    )
+    # Le propriétaire devient membre ADMIN à la création du projet (projects/signals.py)
+    project = ProjectModel.objects.create(name="Projet benchmark", owner=users[0])
+    members = [ProjectMemberModel.objects.get(project=project, user=users[0])]
+    members += ProjectMemberModel.objects.bulk_create(
+        ProjectMemberModel(project=project, user=user, role="MEMBER") for user in users[1:]
+    )
+    statuses = [choice for choice, _ in TaskModel.Status.choices]
+    TaskModel.objects.bulk_create(
+        (
+            TaskModel(
+                project=project,
+                title=f"Tâche {i}",
+                status=statuses[i % len(statuses)],
+                position=i // len(statuses),
+                assignee=members[i % len(members)],
+            )
+            for i in range(args.tasks)
+        ),
+        batch_size=1000,
+    )
+
+    client = APIClient()
+    client.force_authenticate(users[0])
+    url = f"/api/projects/{project.id}/board/"
+
+    def per_column():
+        # Ce que ferait une implémentation naïve : une requête par colonne,
+        # puis assignee.user chargé à la demande pour chaque tâche
+        return [
+            [(task.title, task.assignee.user.full_name) for task in TaskModel.objects.filter(project=project, status=status)]
+            for status in statuses
+        ]
+
+    cases = {
+        "GET board (endpoint)": (lambda: client.get(url), args.iterations),
+        # Quelques itérations suffisent : plusieurs secondes par appel
+        "Lecture par colonne + N+1": (per_column, 3),
+    }
+    results = {}
+    for name, (func, iterations) in cases.items():
+        results[name] = measure(func, iterations=iterations, warmup=1)
+        # Compteur plutôt que CaptureQueriesContext, limité aux 9000 dernières requêtes
+        queries = []
+        with connection.execute_wrapper(lambda execute, *call: queries.append(1) or execute(*call)):
+            func()
+        results[name]["queries"] = len(queries)
+
+    print_results(f"Tableau Kanban de {args.tasks} tâches", results)
+    for name, result in results.items():
+        print(f"{name}: {result['queries']} requête(s) SQL")
+
+    # La médiane plutôt que le p99 : sur quelques dizaines d'itérations, le p99 n'est que le maximum
+    p50 = results["GET board (endpoint)"]["p50_ms"]
+    if p50 > args.budget_ms:
+        print(f"Budget dépassé : p50 {p50:.1f} ms > {args.budget_ms:.0f} ms")
+        sys.exit(1)
+    print(f"Budget respecté : p50 {p50:.1f} ms <= {args.budget_ms:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Mesure l'empreinte mémoire par entité (tracemalloc) des entités du domaine,
+avec __slots__ (version actuelle) et avec un __dict__ par instance (avant).
+
+    python -m benchmarks.entity_memory [--count N]
+"""
+import argparse
+import tracemalloc
+import uuid
+from datetime import datetime
+
+
+def without_slots(cls):
+    """Copie de la classe sans __slots__, équivalente aux entités d'origine."""
+    namespace = {
+        name: value
+        for name, value in vars(cls).items()
+        if name not in ("__slots__", "__dict__", "__weakref__") and name not in cls.__slots__
+    }
+    return type(cls.__name__, (), namespace)
+
+
+def footprint(factory, count):
+    """Octets alloués par entité (les valeurs des attributs sont partagées)."""
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    entities = [factory() for _ in range(count)]
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del entities
+    return (after - before) / count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=100_000)
+    args = parser.parse_args()
+
+    from projects.domain.entities import Project, ProjectMember
+    from users.domain.entities.user import User
+
+    # Valeurs partagées : seule la structure des entités est mesurée
+    ids = uuid.uuid4()
+    now = datetime.utcnow()
+    cases = {
+        "Project": (
+            Project,
+            lambda cls: cls.from_trusted(ids, "Projet", "", ids, now, now),
+        ),
+        "ProjectMember": (
+            ProjectMember,
+            lambda cls: cls.from_trusted(ids, ids, ids, "MEMBER", now),
+        ),
+        "User": (
+            User,
+            lambda cls: cls.from_trusted(ids, "a@example.com", "A", None, None, True, False, now),
+        ),
+    }
+
+    print(f"{args.count} entités par cas")
+    print(f"{'':<16}{'__dict__ (o)':>14}{'__slots__ (o)':>15}{'gain':>8}")
+    for name, (cls, build) in cases.items():
+        legacy = without_slots(cls)
+        with_dict = footprint(lambda: build(legacy), args.count)
+        with_slots = footprint(lambda: build(cls), args.count)
+        print(f"{name:<16}{with_dict:>14.0f}{with_slots:>15.0f}{1 - with_slots / with_dict:>8.0%}")
+
+
+if __name__ == "__main__":
+    main()
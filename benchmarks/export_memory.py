@@ -0,0 +1,101 @@
+"""
+Mesure le RSS du processus pendant l'export en flux des projets et membres
+(stream_export sur ProjectRepository.iter_export_rows), comparé au chargement de
+toutes les entités en mémoire via ProjectMapper. Code de sortie 1 si le RSS de
+l'export en flux augmente de plus de --budget-mb.
+
+    python -m benchmarks.export_memory [--rows N] [--members-per-project M] [--budget-mb MB]
+"""
+import argparse
+import sys
+import threading
+import time
+
+from benchmarks.utils import setup_django, create_test_database
+
+
+def current_rss_mb():
+    with open("/proc/self/status") as status:
+        for line in status:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+class RSSSampler:
+    """Relève le RSS maximal atteint pendant le bloc (échantillonnage toutes les 10 ms)."""
+
+    def __enter__(self):
+        self.baseline = current_rss_mb()
+        self.peak = self.baseline
+        self._running = True
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+        return self
+
+    def _sample(self):
+        while self._running:
+            self.peak = max(self.peak, current_rss_mb())
+            time.sleep(0.01)
+
+    def __exit__(self, *exc_info):
+        self._running = False
+        self._thread.join()
+        self.peak = max(self.peak, current_rss_mb())
+
+    @property
+    def growth(self):
+        return self.peak - self.baseline
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Lignes (projet, membre) à exporter.")
+    parser.add_argument("--members-per-project", type=int, default=5)
+    parser.add_argument("--budget-mb", type=float, default=50.0)
+    args = parser.parse_args()
+
+    setup_django()
+    create_test_database()
+
+    from projects.infrastructure.mappers import ProjectMapper, ProjectMemberMapper
+    from projects.infrastructure.models import ProjectModel, ProjectMemberModel
+    from projects.infrastructure.repositories.project_repository import ProjectRepository
+    from projects.infrastructure.services.project_export import stream_export
+    from users.infrastructure.models.user_model import UserModel
+
+    users = UserModel.objects.bulk_create(
+        UserModel(email=f"member{i}@example.com", full_name=f"Membre {i}", password="!")
+        for i in range(args.members_per_project)
+    )
+    project_count = args.rows // args.members_per_project
+    batch = 10_000
+    for start in range(0, project_count, batch):
+        projects = ProjectModel.objects.bulk_create(
+            ProjectModel(name=f"Projet {i}", description="Description " * 5, owner=users[0])
+            for i in range(start, min(start + batch, project_count))
+        )
+        ProjectMemberModel.objects.bulk_create(
+            ProjectMemberModel(project=project, user=user, role="MEMBER") for project in projects for user in users
+        )
+    print(f"{project_count:,} projets, {project_count * len(users):,} lignes à exporter")
+
+    with RSSSampler() as streaming:
+        size = 0
+        for chunk in stream_export(ProjectRepository().iter_export_rows(), "ndjson"):
+            size += len(chunk)
+    print(f"{'Export en flux':<32}RSS +{streaming.growth:>8.1f} Mo   ({size / 1024 / 1024:,.0f} Mo produits)")
+
+    with RSSSampler() as in_memory:
+        projects = list(ProjectMapper.to_entities(ProjectModel.objects.all()))
+        members = list(ProjectMemberMapper.to_entities(ProjectMemberModel.objects.all()))
+    print(f"{'Entités chargées en mémoire':<32}RSS +{in_memory.growth:>8.1f} Mo   ({len(projects) + len(members):,} entités)")
+
+    if streaming.growth > args.budget_mb:
+        print(f"Budget dépassé : +{streaming.growth:.1f} Mo > {args.budget_mb:.0f} Mo")
+        sys.exit(1)
+    print(f"Budget respecté : +{streaming.growth:.1f} Mo <= {args.budget_mb:.0f} Mo")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Compare les mappers par instance (to_entity sur des modèles Django) et le chemin
+de lecture en masse (to_entities : values_list + iterator + from_trusted).
+
+    python -m benchmarks.mappers [--rows N] [--repeat R]
+"""
+import argparse
+import time
+import tracemalloc
+
+from benchmarks.utils import setup_django, create_test_database
+
+
+def run(label, func, rows, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"{label:<36}{rows / best:>14,.0f}{peak / 1024:>14,.0f}{peak / rows:>14,.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    setup_django()
+    create_test_database()
+
+    from projects.infrastructure.mappers import ProjectMapper, ProjectMemberMapper
+    from projects.infrastructure.models import ProjectModel, ProjectMemberModel
+    from users.infrastructure.mappers.user_mapper import UserMapper
+    from users.infrastructure.models.user_model import UserModel
+
+    users = UserModel.objects.bulk_create(
+        UserModel(email=f"user{i}@example.com", full_name=f"User {i}", password="!")
+        for i in range(args.rows)
+    )
+    projects = ProjectModel.objects.bulk_create(
+        ProjectModel(name=f"Projet {i}", owner=user) for i, user in enumerate(users)
+    )
+    ProjectMemberModel.objects.bulk_create(
+        ProjectMemberModel(project=project, user=project.owner, role="ADMIN") for project in projects
+    )
+
+    cases = [
+        ("Project", ProjectModel, ProjectMapper),
+        ("ProjectMember", ProjectMemberModel, ProjectMemberMapper),
+        ("User", UserModel, UserMapper),
+    ]
+    print(f"{args.rows} lignes par cas")
+    print(f"{'':<36}{'lignes/s':>14}{'pic (Ko)':>14}{'octets/ligne':>14}")
+    for name, model, mapper in cases:
+        run(
+            f"{name} to_entity",
+            lambda: [mapper.to_entity(instance) for instance in model.objects.all()],
+            args.rows,
+            args.repeat,
+        )
+        run(
+            f"{name} to_entities",
+            lambda: list(mapper.to_entities(model.objects.all())),
+            args.rows,
+            args.repeat,
+        )
+
+
+if __name__ == "__main__":
+    main()
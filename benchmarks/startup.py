@@ -0,0 +1,161 @@
+"""
+Coût de démarrage d'un worker : durée d'import de core.wsgi / core.asgi
+(django.setup() compris) et délai jusqu'à la première réponse, mesurés dans un
+interpréteur neuf à chaque essai, comme au lancement d'un worker gunicorn/uvicorn.
+
+La première requête (GET /api/projects/ sans jeton, réponse 401) charge les URLs,
+les vues, DRF et l'authentification JWT, sans dépendre de la base. Code de sortie 1
+si la médiane import + première réponse dépasse --budget-ms.
+
+    python -m benchmarks.startup [--runs N] [--budget-ms MS] [--importtime N]
+
+--importtime N affiche les N paquets les plus coûteux à importer (python -X importtime).
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Exécuté dans un interpréteur neuf ; affiche les mesures en JSON
+_CHILD = """
+import asyncio, io, json, sys, time
+started = time.perf_counter()
+import {module}
+imported = time.perf_counter()
+application = {module}.application
+path = {path!r}
+
+if {module!r} == "core.wsgi":
+    statuses = []
+    environ = {{
+        "REQUEST_METHOD": "GET", "PATH_INFO": path, "QUERY_STRING": "",
+        "SERVER_NAME": "testserver", "SERVER_PORT": "80", "SERVER_PROTOCOL": "HTTP/1.1",
+        "HTTP_HOST": "testserver", "wsgi.url_scheme": "http", "wsgi.input": io.BytesIO(),
+        "wsgi.errors": sys.stderr, "wsgi.multithread": True, "wsgi.multiprocess": True, "wsgi.run_once": False,
+    }}
+    body = application(environ, lambda status, headers, exc_info=None: statuses.append(status))
+    b"".join(body)
+    body.close()
+    status = int(statuses[0].split()[0])
+else:
+    statuses = []
+    scope = {{
+        "type": "http", "asgi": {{"version": "3.0"}}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": path, "raw_path": path.encode(), "query_string": b"", "root_path": "",
+        "headers": [(b"host", b"testserver")], "server": ("testserver", 80), "client": ("127.0.0.1", 50000),
+    }}
+    messages = [{{"type": "http.request", "body": b"", "more_body": False}}]
+
+    async def receive():
+        if messages:
+            return messages.pop()
+        await asyncio.Event().wait()
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            statuses.append(message["status"])
+
+    asyncio.run(application(scope, receive, send))
+    status = statuses[0]
+
+responded = time.perf_counter()
+print(json.dumps({{
+    "import_ms": (imported - started) * 1000,
+    "first_response_ms": (responded - imported) * 1000,
+    "status": status,
+    "modules": len(sys.modules),
+}}))
+"""
+
+
+def run_once(module, path, settings_module, python_args=()):
+    env = {**os.environ, "DJANGO_SETTINGS_MODULE": settings_module}
+    result = subprocess.run(
+        [sys.executable, *python_args, "-c", _CHILD.format(module=module, path=path)],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=False,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Échec du démarrage de {module} :\n{result.stderr[-2000:]}")
+    return json.loads(result.stdout.strip().splitlines()[-1]), result.stderr
+
+
+def measure_startup(module, path, settings_module, runs):
+    samples = [run_once(module, path, settings_module)[0] for _ in range(runs)]
+    import_ms = [sample["import_ms"] for sample in samples]
+    first_ms = [sample["first_response_ms"] for sample in samples]
+    total_ms = [a + b for a, b in zip(import_ms, first_ms)]
+    return {
+        "import_ms": statistics.median(import_ms),
+        "first_response_ms": statistics.median(first_ms),
+        "total_ms": statistics.median(total_ms),
+        "max_total_ms": max(total_ms),
+        "status": samples[-1]["status"],
+        "modules": samples[-1]["modules"],
+    }
+
+
+def import_cost_by_package(module, path, settings_module, top):
+    """
+    Durée d'import propre (hors sous-imports) cumulée par paquet de premier niveau
+    (django, rest_framework, users, ...), d'après python -X importtime : chaque
+    microseconde est attribuée à un seul paquet.
+    """
+    _, stderr = run_once(module, path, settings_module, python_args=("-X", "importtime"))
+    costs = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        own, _, name = line.split(":", 1)[1].split("|")
+        if own.strip().isdigit():
+            package = name.strip().split(".")[0]
+            costs[package] = costs.get(package, 0) + int(own)
+    return sorted(((us, package) for package, us in costs.items()), reverse=True)[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--settings", default="core.settings.benchmark")
+    parser.add_argument("--path", default="/api/projects/")
+    parser.add_argument("--budget-ms", type=float, default=1500.0,
+                        help="médiane maximale import + première réponse, par point d'entrée")
+    parser.add_argument("--importtime", type=int, default=0, metavar="N")
+    parser.add_argument("--output", help="écrit les résultats en JSON dans ce fichier")
+    args = parser.parse_args()
+
+    results = {module: measure_startup(module, args.path, args.settings, args.runs)
+               for module in ("core.wsgi", "core.asgi")}
+
+    print(f"Démarrage d'un worker ({args.runs} essais, médianes, GET {args.path})")
+    print(f"{'':<12}{'import (ms)':>14}{'1re réponse (ms)':>18}{'total (ms)':>12}{'max (ms)':>10}{'modules':>9}")
+    failures = []
+    for module, result in results.items():
+        print(
+            f"{module:<12}{result['import_ms']:>14.1f}{result['first_response_ms']:>18.1f}"
+            f"{result['total_ms']:>12.1f}{result['max_total_ms']:>10.1f}{result['modules']:>9}"
+        )
+        if result["status"] >= 500:
+            failures.append(f"{module} : la première réponse est une erreur {result['status']}")
+        elif result["total_ms"] > args.budget_ms:
+            failures.append(f"{module} : {result['total_ms']:.0f} ms > budget de {args.budget_ms:.0f} ms")
+
+    if args.importtime:
+        print("\nImports les plus coûteux de core.wsgi, par paquet :")
+        for microseconds, name in import_cost_by_package("core.wsgi", args.path, args.settings, args.importtime):
+            print(f"{name:<48}{microseconds / 1000:>10.1f} ms")
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2) + "\n")
+
+    for failure in failures:
+        print(f"ÉCHEC {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,206 @@
+"""
+Suite de benchmarks des chemins critiques : endpoints (RegisterView, LoginView,
+ProjectListCreateView), mappers et ProjectService.create_project, sur le profil
+core.settings.benchmark (SQLite en mémoire).
+
+Pour chaque cas : débit (ops/s), latences p50/p99 et nombre de requêtes SQL par
+opération. Les résultats sont comparés à une référence JSON ; code de sortie 1 si
+un cas dépasse son budget de requêtes SQL ou si sa latence médiane régresse de
+plus de --max-regression % par rapport à la référence.
+
+    python -m benchmarks.suite [--only CAS ...] [--iterations N] [--max-regression PCT]
+    python -m benchmarks.suite --update-baseline   # enregistre la nouvelle référence
+
+La référence dépend de la machine : régénérez-la sur la machine qui exécute la suite.
+"""
+import argparse
+import json
+import platform
+import sys
+from dataclasses import dataclass
+from itertools import count
+from pathlib import Path
+
+from benchmarks.utils import setup_django, create_test_database, measure, print_results
+
+DEFAULT_BASELINE = Path(__file__).parent / "baselines" / "suite.json"
+
+
+@dataclass
+class Case:
+    name: str
+    description: str
+    # Nombre maximal de requêtes SQL par opération
+    max_queries: int
+    setup: callable
+    iterations: int = 500
+
+
+def _user(email, password="motdepasse123"):
+    from users.infrastructure.models.user_model import UserModel
+    return UserModel.objects.create_user(email=email, password=password, full_name="Benchmark")
+
+
+def _client(user=None):
+    from rest_framework.test import APIClient
+    from rest_framework_simplejwt.tokens import RefreshToken
+    client = APIClient()
+    if user is not None:
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {RefreshToken.for_user(user).access_token}")
+    return client
+
+
+def _expect(response, status):
+    if response.status_code != status:
+        raise RuntimeError(f"Statut {response.status_code} au lieu de {status} : {response.content[:200]!r}")
+    return response
+
+
+def setup_register():
+    client = _client()
+    numbers = count()
+
+    def register():
+        i = next(numbers)
+        _expect(client.post("/api/register/", {
+            "email": f"register{i}@example.com",
+            "password": "motdepasse123",
+            "password_confirm": "motdepasse123",
+            "full_name": f"Utilisateur {i}",
+        }, format="json"), 201)
+    return register
+
+
+def setup_login():
+    _user("login@example.com")
+    client = _client()
+    payload = {"email": "login@example.com", "password": "motdepasse123"}
+    return lambda: _expect(client.post("/api/login/", payload, format="json"), 200)
+
+
+def setup_project_create():
+    client = _client(_user("projects@example.com"))
+    payload = {"name": "Projet benchmark", "description": "Créé par la suite de benchmarks"}
+    return lambda: _expect(client.post("/api/projects/", payload, format="json"), 201)
+
+
+def setup_project_list():
+    from projects.infrastructure.models import ProjectModel, ProjectMemberModel
+    user = _user("list@example.com")
+    projects = ProjectModel.objects.bulk_create(ProjectModel(name=f"Projet {i}", owner=user) for i in range(100))
+    ProjectMemberModel.objects.bulk_create(
+        ProjectMemberModel(project=project, user=user, role="ADMIN") for project in projects
+    )
+    client = _client(user)
+    return lambda: _expect(client.get("/api/projects/?limit=20"), 200)
+
+
+def setup_service_create_project():
+    from core.identity_map import identity_map_scope
+    from projects.presentation.views.project_views import get_project_service
+    owner = _user("service@example.com")
+    service = get_project_service()
+
+    def create_project():
+        # Une carte d'identité par opération, comme pendant une requête
+        with identity_map_scope():
+            service.create_project(name="Projet service", description="", owner_id=owner.id)
+    return create_project
+
+
+def setup_mappers():
+    from projects.infrastructure.mappers import ProjectMapper
+    from projects.infrastructure.models import ProjectModel
+    owner = _user("mappers@example.com")
+    ProjectModel.objects.bulk_create(ProjectModel(name=f"Projet {i}", owner=owner) for i in range(1000))
+    queryset = ProjectModel.objects.filter(owner=owner)
+    return lambda: list(ProjectMapper.to_entities(queryset))
+
+
+CASES = [
+    Case("register", "POST /api/register/ (RegisterView)", 2, setup_register),
+    Case("login", "POST /api/login/ (LoginView)", 1, setup_login),
+    Case("project_create", "POST /api/projects/ (ProjectListCreateView)", 2, setup_project_create),
+    Case("project_list", "GET /api/projects/ (ProjectListCreateView)", 2, setup_project_list),
+    Case("service_create_project", "ProjectService.create_project", 2, setup_service_create_project),
+    Case("mapper_to_entities", "ProjectMapper.to_entities (1000 lignes)", 1, setup_mappers, iterations=100),
+]
+
+
+def count_queries(func) -> int:
+    from django.db import connection
+    queries = []
+    with connection.execute_wrapper(lambda execute, *call: queries.append(1) or execute(*call)):
+        func()
+    return len(queries)
+
+
+def run_case(case: Case, iterations: int | None) -> dict:
+    func = case.setup()
+    result = measure(func, iterations=iterations or case.iterations, warmup=20)
+    result["queries"] = count_queries(func)
+    return result
+
+
+def check(results: dict, baseline: dict, max_regression: float) -> list[str]:
+    """Liste des budgets dépassés (vide si tout est dans les clous)."""
+    failures = []
+    cases = {case.name: case for case in CASES}
+    for name, result in results.items():
+        if result["queries"] > cases[name].max_queries:
+            failures.append(f"{name} : {result['queries']} requêtes SQL > budget de {cases[name].max_queries}")
+        reference = baseline.get(name)
+        if reference is None:
+            continue
+        limit = reference["p50_ms"] * (1 + max_regression / 100)
+        if result["p50_ms"] > limit:
+            regression = (result["p50_ms"] / reference["p50_ms"] - 1) * 100
+            failures.append(
+                f"{name} : p50 {result['p50_ms']:.3f} ms, +{regression:.0f} % par rapport à la référence "
+                f"({reference['p50_ms']:.3f} ms, tolérance {max_regression:.0f} %)"
+            )
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--only", nargs="+", choices=[case.name for case in CASES], help="Cas à exécuter.")
+    parser.add_argument("--iterations", type=int, help="Remplace le nombre d'itérations de chaque cas.")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--max-regression", type=float, default=30.0, help="Régression tolérée du p50, en %%.")
+    parser.add_argument("--update-baseline", action="store_true", help="Enregistre les résultats comme référence.")
+    parser.add_argument("--output", type=Path, help="Écrit aussi les résultats dans ce fichier JSON.")
+    args = parser.parse_args()
+
+    setup_django("core.settings.benchmark")
+    create_test_database()
+
+    cases = [case for case in CASES if not args.only or case.name in args.only]
+    results = {case.name: run_case(case, args.iterations) for case in cases}
+
+    print_results("Suite de benchmarks", {case.name: results[case.name] for case in cases})
+    for case in cases:
+        print(f"{case.name} — {case.description} : {results[case.name]['queries']} requête(s) SQL (budget {case.max_queries})")
+
+    document = {"machine": platform.machine(), "python": platform.python_version(), "results": results}
+    if args.output:
+        args.output.write_text(json.dumps(document, indent=2) + "\n")
+    if args.update_baseline:
+        baseline = json.loads(args.baseline.read_text())["results"] if args.baseline.exists() else {}
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps({**document, "results": {**baseline, **results}}, indent=2) + "\n")
+        print(f"Référence enregistrée dans {args.baseline}")
+
+    baseline = {}
+    if args.baseline.exists() and not args.update_baseline:
+        baseline = json.loads(args.baseline.read_text())["results"]
+    failures = check(results, baseline, args.max_regression)
+    for failure in failures:
+        print(f"Budget dépassé — {failure}")
+    if failures:
+        sys.exit(1)
+    print("Tous les budgets sont respectés.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""
+Compare JWTTokenGenerator (relit UserModel en base) et StatelessJWTTokenGenerator
+(construit les tokens à partir de l'entité User).
+
+    python -m benchmarks.token_generators [--iterations N]
+"""
+import argparse
+
+from benchmarks.utils import setup_django, create_test_database, measure, print_results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    setup_django()
+    create_test_database()
+
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+    from users.infrastructure.models.user_model import UserModel
+    from users.infrastructure.mappers.user_mapper import UserMapper
+    from users.infrastructure.services.jwt_token_generator import (
+        JWTTokenGenerator,
+        StatelessJWTTokenGenerator,
+    )
+
+    user = UserMapper.to_entity(
+        UserModel.objects.create_user(
+            email="bench@example.com", password="motdepasse123", full_name="Bench User"
+        )
+    )
+    generators = {
+        "JWTTokenGenerator": JWTTokenGenerator(),
+        "StatelessJWTTokenGenerator": StatelessJWTTokenGenerator(),
+    }
+
+    results = {}
+    for name, generator in generators.items():
+        results[name] = measure(lambda: generator.generate_tokens(user), iterations=args.iterations)
+        with CaptureQueriesContext(connection) as queries:
+            generator.generate_tokens(user)
+        results[name]["queries"] = len(queries)
+
+    print_results("Génération de tokens JWT", results)
+    for name, result in results.items():
+        print(f"{name}: {result['queries']} requête(s) SQL par appel")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+import os
+import statistics
+import time
+
+
+def setup_django(settings_module="core.settings.test"):
+    """Configure Django pour un benchmark lancé hors de manage.py."""
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", settings_module)
+    import django
+    django.setup()
+
+
+def create_test_database():
+    """
+    Crée la base de test (migrations comprises) et retourne son nom.
+    Une base laissée par un benchmark interrompu est remplacée ; elle est
+    supprimée à la sortie du processus.
+    """
+    import atexit
+    from django.db import connection
+    old_name = connection.settings_dict["NAME"]
+    test_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    atexit.register(connection.creation.destroy_test_db, old_name, verbosity=0)
+    return test_name
+
+
+def measure(func, iterations=1000, warmup=50):
+    """
+    Exécute `func` et retourne le débit (ops/s) et les latences p50/p99 en ms.
+    """
+    for _ in range(warmup):
+        func()
+
+    durations = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        durations.append(time.perf_counter() - start)
+
+    durations.sort()
+    total = sum(durations)
+    return {
+        "iterations": iterations,
+        "ops_per_sec": iterations / total if total else float("inf"),
+        "p50_ms": statistics.median(durations) * 1000,
+        "p99_ms": durations[min(len(durations) - 1, int(len(durations) * 0.99))] * 1000,
+    }
+
+
+def print_results(title, results):
+    """Affiche un tableau simple : nom -> métriques."""
+    print(title)
+    print(f"{'':<32}{'ops/s':>12}{'p50 (ms)':>12}{'p99 (ms)':>12}")
+    for name, result in results.items():
+        print(
+            f"{name:<32}{result['ops_per_sec']:>12.0f}"
+            f"{result['p50_ms']:>12.3f}{result['p99_ms']:>12.3f}"
+        )
@@ -0,0 +1,51 @@
+import json
+
+from django.http import JsonResponse
+from django.utils.decorators import method_decorator
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import status
+from rest_framework.exceptions import APIException, NotAuthenticated
+
+
+def parse_json(request):
+    """Corps JSON de la requête, ou None s'il est illisible."""
+    try:
+        return json.loads(request.body or b"{}")
+    except (ValueError, UnicodeDecodeError):
+        return None
+
+
+def error_response(exception: APIException):
+    """Réponse d'erreur au même format que le gestionnaire d'exceptions de DRF."""
+    detail = exception.detail if isinstance(exception.detail, (list, dict)) else {"detail": exception.detail}
+    return JsonResponse(detail, status=exception.status_code, safe=False)
+
+
+@method_decorator(csrf_exempt, name="dispatch")
+class AsyncAPIView(View):
+    """
+    Vue de l'API exécutée nativement sur la boucle d'événements sous core/asgi.py
+    (les APIView de DRF sont synchrones : sous ASGI, chaque requête passerait par
+    un thread). Les handlers (get, post, ...) sont des coroutines.
+
+    Si `authentication_class` est défini, il doit fournir aauthenticate(request) ;
+    la requête est refusée (401) sans identifiants valides, sinon request.user et
+    request.auth sont renseignés comme par DRF.
+    """
+    authentication_class = None
+
+    async def dispatch(self, request, *args, **kwargs):
+        if self.authentication_class is not None:
+            authenticator = self.authentication_class()
+            try:
+                result = await authenticator.aauthenticate(request)
+                if result is None:
+                    raise NotAuthenticated()
+            except APIException as e:
+                response = error_response(e)
+                if e.status_code == status.HTTP_401_UNAUTHORIZED:
+                    response["WWW-Authenticate"] = authenticator.authenticate_header(request)
+                return response
+            request.user, request.auth = result
+        return await super().dispatch(request, *args, **kwargs)
@@ -0,0 +1,40 @@
+import hashlib
+from calendar import timegm
+
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date
+
+
+def make_etag(*parts) -> str:
+    """ETag fort (entre guillemets) dérivé des éléments de version de la ressource."""
+    digest = hashlib.sha256("|".join(str(part) for part in parts).encode()).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def _timestamp(last_modified):
+    return timegm(last_modified.utctimetuple()) if last_modified is not None else None
+
+
+def conditional_response(request, etag: str, last_modified=None):
+    """
+    Évalue If-None-Match / If-Modified-Since (et If-Match / If-Unmodified-Since)
+    à partir de la seule version de la ressource. Retourne la réponse 304 (ou 412)
+    à renvoyer telle quelle, ou None si la ressource doit être produite.
+    """
+    response = get_conditional_response(request, etag=etag, last_modified=_timestamp(last_modified))
+    if response is not None:
+        set_validators(response, etag, last_modified)
+    return response
+
+
+def set_validators(response, etag: str, last_modified=None):
+    """
+    Ajoute ETag et Last-Modified. Les ressources dépendent de l'utilisateur :
+    cache privé, revalidé à chaque utilisation.
+    """
+    response["ETag"] = etag
+    if last_modified is not None:
+        response["Last-Modified"] = http_date(_timestamp(last_modified))
+    patch_cache_control(response, private=True, no_cache=True)
+    patch_vary_headers(response, ["Authorization"])
+    return response
@@ -0,0 +1,151 @@
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+
+class Container:
+    """
+    Conteneur des services applicatifs : chaque service est construit une seule
+    fois par processus, à sa première utilisation (les modules d'infrastructure ne
+    sont importés qu'à ce moment), puis partagé par toutes les requêtes et tous
+    les threads. Les services et repositories sont sans état : le partage est sûr.
+
+    `override()` remplace un service le temps d'un bloc, pour le contexte courant
+    seulement (test, requête) ; les dépendances construites à partir de ce service
+    ne sont pas recalculées, il faut remplacer le service utilisé par la vue.
+    """
+
+    def __init__(self):
+        self._providers = {}
+        self._instances = {}
+        self._lock = threading.RLock()
+        self._overrides = ContextVar(f"container_overrides_{id(self)}", default={})
+
+    def register(self, name: str, provider):
+        """`provider(container)` construit le service ; il peut résoudre ses dépendances."""
+        with self._lock:
+            self._providers[name] = provider
+            self._instances.pop(name, None)
+
+    def resolve(self, name: str):
+        overrides = self._overrides.get()
+        if name in overrides:
+            return overrides[name]
+        try:
+            return self._instances[name]
+        except KeyError:
+            pass
+        # RLock : un provider résout ses dépendances sous le même verrou
+        with self._lock:
+            if name not in self._instances:
+                try:
+                    provider = self._providers[name]
+                except KeyError:
+                    raise LookupError(f"Service inconnu : {name}") from None
+                self._instances[name] = provider(self)
+            return self._instances[name]
+
+    @contextmanager
+    def override(self, name: str, instance):
+        token = self._overrides.set({**self._overrides.get(), name: instance})
+        try:
+            yield instance
+        finally:
+            self._overrides.reset(token)
+
+    def reset(self):
+        """Oublie les instances construites (elles seront reconstruites à la demande)."""
+        with self._lock:
+            self._instances.clear()
+
+
+# ---------------------------------------------------
+# Fournisseurs (imports différés : rien n'est chargé avant le premier appel)
+# ---------------------------------------------------
+def _user_repository(c):
+    from users.infrastructure.repositories.user_repository import UserRepository
+    return UserRepository()
+
+
+def _cached_user_repository(c):
+    from users.infrastructure.repositories.cached_user_repository import CachedUserRepository
+    return CachedUserRepository()
+
+
+def _project_repository(c):
+    from projects.infrastructure.repositories.cached_project_repository import CachedProjectRepository
+    return CachedProjectRepository()
+
+
+def _task_repository(c):
+    from projects.infrastructure.repositories.task_repository import TaskRepository
+    return TaskRepository()
+
+
+def _password_hasher(c):
+    from users.infrastructure.services.django_password_hasher import DjangoPasswordHasher
+    return DjangoPasswordHasher()
+
+
+def _pooled_password_hasher(c):
+    from users.infrastructure.services.hashing_pool import get_hashing_pool
+    from users.infrastructure.services.pooled_password_hasher import PooledPasswordHasher
+    return PooledPasswordHasher(c.resolve("password_hasher"), get_hashing_pool())
+
+
+def _token_generator(c):
+    from users.infrastructure.services.jwt_token_generator import StatelessJWTTokenGenerator
+    return StatelessJWTTokenGenerator()
+
+
+def _password_rehasher(c):
+    from users.infrastructure.services.password_rehasher import DeferredPasswordRehasher
+    return DeferredPasswordRehasher(c.resolve("password_hasher"), c.resolve("user_repository"))
+
+
+def _auth_service(c):
+    from users.application.services.auth_service import AuthService
+    return AuthService(
+        c.resolve("user_repository"), c.resolve("password_hasher"), c.resolve("token_generator"),
+        c.resolve("password_rehasher"),
+    )
+
+
+def _async_auth_service(c):
+    from users.application.services.auth_service import AuthService
+    return AuthService(
+        c.resolve("user_repository"), c.resolve("pooled_password_hasher"), c.resolve("token_generator"),
+        c.resolve("password_rehasher"),
+    )
+
+
+def _avatar_service(c):
+    from users.application.services.avatar_service import AvatarService
+    from users.infrastructure.services.avatar_pipeline import DjangoAvatarStorage
+    return AvatarService(c.resolve("user_repository"), DjangoAvatarStorage())
+
+
+def _project_service(c):
+    from projects.application.services.project_service import ProjectService
+    return ProjectService(c.resolve("project_repository"), c.resolve("cached_user_repository"))
+
+
+def _task_service(c):
+    from projects.application.services.task_service import TaskService
+    return TaskService(c.resolve("task_repository"), c.resolve("project_repository"))
+
+
+container = Container()
+container.register("user_repository", _user_repository)
+container.register("cached_user_repository", _cached_user_repository)
+container.register("project_repository", _project_repository)
+container.register("task_repository", _task_repository)
+container.register("password_hasher", _password_hasher)
+container.register("pooled_password_hasher", _pooled_password_hasher)
+container.register("token_generator", _token_generator)
+container.register("password_rehasher", _password_rehasher)
+container.register("auth_service", _auth_service)
+container.register("async_auth_service", _async_auth_service)
+container.register("avatar_service", _avatar_service)
+container.register("project_service", _project_service)
+container.register("task_service", _task_service)
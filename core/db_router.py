@@ -0,0 +1,294 @@
+import base64
+import json
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import SynchronousOnlyOperation
+from django.core.signals import setting_changed
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, InterfaceError, OperationalError, connections
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+from rest_framework_simplejwt.settings import api_settings
+from core import metrics
+
+_replica_failures = metrics.counter(
+    "db_replica_failures_total",
+    "Erreurs de connexion ou de requête sur un réplica (le réplica est alors écarté).",
+    labelnames=("database",),
+)
+_routed_requests = metrics.counter(
+    "db_routed_requests_total",
+    "Requêtes HTTP par base de lecture retenue (réplica ou primaire).",
+    labelnames=("database",),
+)
+
+
+_config = None
+
+
+def routing_config() -> dict:
+    """REPLICA_ROUTING complété des valeurs par défaut (relu si les settings changent)."""
+    global _config
+    if _config is None:
+        _config = _load_config()
+    return _config
+
+
+@receiver(setting_changed)
+def _reset_config(setting, **kwargs):
+    global _config
+    if setting in ("REPLICA_ROUTING", "DATABASES"):
+        _config = None
+
+
+def _load_config() -> dict:
+    config = {
+        "REPLICAS": None,
+        "STICKY_SECONDS": 5,
+        "DOWN_SECONDS": 30,
+        "COOKIE_NAME": "primary_db_until",
+        "STICKINESS": ("cookie", "token"),
+    }
+    config.update(getattr(settings, "REPLICA_ROUTING", {}))
+    if config["REPLICAS"] is None:
+        config["REPLICAS"] = [alias for alias in settings.DATABASES if alias != DEFAULT_DB_ALIAS]
+    return config
+
+
+# ---------------------------------------------------
+# Réplicas indisponibles (par processus)
+# ---------------------------------------------------
+_down_until = {}
+_down_lock = threading.Lock()
+
+
+def mark_replica_down(alias: str):
+    """Écarte le réplica pendant DOWN_SECONDS ; les lectures repartent sur les autres."""
+    with _down_lock:
+        _down_until[alias] = time.monotonic() + routing_config()["DOWN_SECONDS"]
+    _replica_failures.inc(database=alias)
+
+
+def is_replica_down(alias: str) -> bool:
+    return _down_until.get(alias, 0) > time.monotonic()
+
+
+def reset_replica_health():
+    with _down_lock:
+        _down_until.clear()
+
+
+class ReplicaFailureWrapper:
+    """
+    Wrapper d'exécution (connection.execute_wrapper) posé sur les connexions des
+    réplicas : une erreur de connexion pendant une requête écarte le réplica.
+    """
+
+    def __init__(self, alias: str):
+        self.alias = alias
+
+    def __call__(self, execute, sql, params, many, context):
+        try:
+            return execute(sql, params, many, context)
+        except (OperationalError, InterfaceError):
+            mark_replica_down(self.alias)
+            raise
+
+
+def install_failure_wrapper(sender, connection, **kwargs):
+    """Receveur de connection_created : un wrapper par connexion de réplica."""
+    if connection.alias not in routing_config()["REPLICAS"]:
+        return
+    if not any(isinstance(wrapper, ReplicaFailureWrapper) for wrapper in connection.execute_wrappers):
+        # En tête de liste : connection.execute_wrapper() retire le dernier wrapper ajouté
+        connection.execute_wrappers.insert(0, ReplicaFailureWrapper(connection.alias))
+
+
+connection_created.connect(install_failure_wrapper, dispatch_uid="core.db_router.install_failure_wrapper")
+
+
+# ---------------------------------------------------
+# État de routage de la requête
+# ---------------------------------------------------
+class RoutingState:
+    """
+    Routage d'une requête : `use_primary` force les lectures sur le primaire
+    (écriture récente de l'utilisateur, ou écriture pendant la requête) ; `replica`
+    est le réplica retenu, le même pour toutes les lectures de la requête.
+    """
+    __slots__ = ("use_primary", "wrote", "replica")
+
+    def __init__(self, use_primary=False):
+        self.use_primary = use_primary
+        self.wrote = False
+        self.replica = None
+
+
+_current_state = ContextVar("db_routing_state", default=None)
+
+
+@contextmanager
+def routing_scope(use_primary=False):
+    """
+    Active le routage vers les réplicas pour le bloc. Hors de ce bloc (commandes,
+    tâches de fond), toutes les lectures vont sur le primaire.
+    """
+    state = RoutingState(use_primary)
+    token = _current_state.set(state)
+    try:
+        yield state
+    finally:
+        _current_state.reset(token)
+
+
+class ReplicaRouter:
+    """
+    Lectures sur les réplicas, écritures sur le primaire (alias « default »).
+
+    Une lecture va sur le primaire hors d'une requête HTTP, dans une transaction,
+    après une écriture de la même requête, et pendant STICKY_SECONDS après une
+    écriture de l'utilisateur (lire ses propres écritures malgré le retard de
+    réplication). Un réplica qui ne répond pas est écarté pendant DOWN_SECONDS.
+    """
+
+    def db_for_read(self, model, **hints):
+        state = _current_state.get()
+        if state is None or state.use_primary or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        if state.replica is not None and not is_replica_down(state.replica):
+            return state.replica
+
+        candidates = [alias for alias in routing_config()["REPLICAS"] if not is_replica_down(alias)]
+        random.shuffle(candidates)
+        for alias in candidates:
+            if self._is_available(alias):
+                state.replica = alias
+                return alias
+        state.replica = None
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        state = _current_state.get()
+        if state is not None:
+            state.use_primary = True
+            state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Réplicas et primaire contiennent les mêmes données
+        return True
+
+    @staticmethod
+    def _is_available(alias: str) -> bool:
+        """Ouvre la connexion au réplica si besoin ; un échec l'écarte."""
+        connection = connections[alias]
+        if connection.connection is not None:
+            return True
+        try:
+            connection.ensure_connection()
+        except SynchronousOnlyOperation:
+            # Appel depuis la boucle d'événements : la connexion sera ouverte par l'ORM
+            return True
+        except DatabaseError:
+            mark_replica_down(alias)
+            return False
+        return True
+
+
+# ---------------------------------------------------
+# Middleware : « lire ses écritures » d'une requête à l'autre
+# ---------------------------------------------------
+def _token_user_id(request):
+    """
+    Identifiant utilisateur du JWT de la requête, lu SANS vérifier la signature :
+    il ne sert qu'à choisir la base de lecture (le primaire est toujours sûr).
+    """
+    header = request.META.get("HTTP_AUTHORIZATION", "")
+    parts = header.split()
+    if len(parts) != 2 or parts[0] != "Bearer":
+        return None
+    try:
+        payload = parts[1].split(".")[1]
+        claims = json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+    except (IndexError, ValueError):
+        return None
+    return claims.get(api_settings.USER_ID_CLAIM) if isinstance(claims, dict) else None
+
+
+def _pin_key(user_id) -> str:
+    return f"db-routing:primary:{user_id}"
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Ouvre un routing_scope par requête. Après une écriture, l'utilisateur est
+    maintenu sur le primaire pendant STICKY_SECONDS : par un cookie (navigateurs)
+    et par une entrée du cache partagé indexée par l'utilisateur du JWT (clients API).
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        config = routing_config()
+        user_id = _token_user_id(request) if "token" in config["STICKINESS"] else None
+        pinned = self._cookie_pinned(request, config) or (
+            user_id is not None and cache.get(_pin_key(user_id)) is not None
+        )
+        with routing_scope(use_primary=pinned) as state:
+            response = self.get_response(request)
+        if state.wrote:
+            self._pin(response, config)
+            if user_id is not None:
+                cache.set(_pin_key(user_id), 1, timeout=config["STICKY_SECONDS"])
+        self._count(state)
+        return response
+
+    async def __acall__(self, request):
+        config = routing_config()
+        user_id = _token_user_id(request) if "token" in config["STICKINESS"] else None
+        pinned = self._cookie_pinned(request, config) or (
+            user_id is not None and await cache.aget(_pin_key(user_id)) is not None
+        )
+        with routing_scope(use_primary=pinned) as state:
+            response = await self.get_response(request)
+        if state.wrote:
+            self._pin(response, config)
+            if user_id is not None:
+                await cache.aset(_pin_key(user_id), 1, timeout=config["STICKY_SECONDS"])
+        self._count(state)
+        return response
+
+    @staticmethod
+    def _cookie_pinned(request, config) -> bool:
+        if "cookie" not in config["STICKINESS"]:
+            return False
+        try:
+            return float(request.COOKIES.get(config["COOKIE_NAME"], 0)) > time.time()
+        except ValueError:
+            return False
+
+    @staticmethod
+    def _pin(response, config):
+        if "cookie" in config["STICKINESS"]:
+            until = time.time() + config["STICKY_SECONDS"]
+            response.set_cookie(
+                config["COOKIE_NAME"], f"{until:.0f}",
+                max_age=config["STICKY_SECONDS"], httponly=True, samesite="Lax",
+            )
+
+    @staticmethod
+    def _count(state):
+        _routed_requests.inc(database=state.replica or DEFAULT_DB_ALIAS)
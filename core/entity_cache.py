@@ -0,0 +1,152 @@
+import asyncio
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from core import metrics
+
+# À incrémenter quand le format des valeurs stockées change
+CACHE_FORMAT_VERSION = 1
+
+# Valeur stockée pour « absent en base » : évite de relire une clé inexistante
+_MISSING = "__missing__"
+
+_requests = metrics.counter(
+    "entity_cache_requests_total",
+    "Lectures du cache des repositories, par cache et par résultat (hit/miss).",
+    labelnames=("cache", "result"),
+)
+_lock_waits = metrics.counter(
+    "entity_cache_lock_waits_total",
+    "Lectures qui ont attendu le rechargement d'une clé par un autre worker.",
+    labelnames=("cache",),
+)
+
+
+class EntityCache:
+    """
+    Cache de lignes d'entités dans le cache Django (locmem, fichier, Redis, ...).
+
+    Les valeurs sont des tuples de types simples (les colonnes BULK_FIELDS des
+    mappers, CACHE_FIELDS pour les utilisateurs : sans secret), jamais des modèles
+    ni des entités. Une clé absente est rechargée par
+    un seul worker à la fois : le premier pose un verrou avec cache.add(), les
+    autres attendent sa valeur au lieu d'interroger tous la base (stampede).
+    """
+
+    def __init__(self, name: str, alias: str = "default"):
+        config = getattr(settings, "REPOSITORY_CACHE", {})
+        self.name = name
+        self.alias = alias
+        self.ttl = config.get("TTL", 300)
+        self.missing_ttl = config.get("MISSING_TTL", 30)
+        self.lock_timeout = config.get("LOCK_TIMEOUT", 5)
+        self.lock_wait = config.get("LOCK_WAIT", 1.0)
+        self.poll_interval = 0.02
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def key(self, *parts) -> str:
+        return ":".join(["entity", self.name, f"v{CACHE_FORMAT_VERSION}", *(str(part) for part in parts)])
+
+    def get_or_load(self, key: str, loader):
+        """
+        Retourne la valeur en cache, ou celle de `loader()` (None si absente en base)
+        qui est alors mise en cache.
+        """
+        value = self.cache.get(key)
+        if value is not None:
+            _requests.inc(cache=self.name, result="hit")
+            return None if value == _MISSING else value
+
+        _requests.inc(cache=self.name, result="miss")
+        lock_key = f"{key}:lock"
+        if not self.cache.add(lock_key, 1, timeout=self.lock_timeout):
+            value = self._wait_for(key)
+            if value is not None:
+                return None if value == _MISSING else value
+            # Le worker qui recharge est trop lent (ou a échoué) : lecture directe
+            return loader()
+
+        try:
+            value = loader()
+            self.set(key, value)
+            return value
+        finally:
+            self.cache.delete(lock_key)
+
+    async def aget_or_load(self, key: str, aloader):
+        """Version asynchrone de get_or_load : `aloader` est une coroutine."""
+        value = await self.cache.aget(key)
+        if value is not None:
+            _requests.inc(cache=self.name, result="hit")
+            return None if value == _MISSING else value
+
+        _requests.inc(cache=self.name, result="miss")
+        lock_key = f"{key}:lock"
+        if not await self.cache.aadd(lock_key, 1, timeout=self.lock_timeout):
+            value = await self._await_for(key)
+            if value is not None:
+                return None if value == _MISSING else value
+            return await aloader()
+
+        try:
+            value = await aloader()
+            await self.aset(key, value)
+            return value
+        finally:
+            await self.cache.adelete(lock_key)
+
+    def _wait_for(self, key: str):
+        _lock_waits.inc(cache=self.name)
+        deadline = time.monotonic() + self.lock_wait
+        while time.monotonic() < deadline:
+            time.sleep(self.poll_interval)
+            value = self.cache.get(key)
+            if value is not None:
+                return value
+        return None
+
+    async def _await_for(self, key: str):
+        _lock_waits.inc(cache=self.name)
+        deadline = time.monotonic() + self.lock_wait
+        while time.monotonic() < deadline:
+            await asyncio.sleep(self.poll_interval)
+            value = await self.cache.aget(key)
+            if value is not None:
+                return value
+        return None
+
+    def set(self, key: str, value):
+        if value is None:
+            self.cache.set(key, _MISSING, timeout=self.missing_ttl)
+        else:
+            self.cache.set(key, value, timeout=self.ttl)
+
+    async def aset(self, key: str, value):
+        if value is None:
+            await self.cache.aset(key, _MISSING, timeout=self.missing_ttl)
+        else:
+            await self.cache.aset(key, value, timeout=self.ttl)
+
+    def set_many(self, values: dict):
+        if values:
+            self.cache.set_many(values, timeout=self.ttl)
+
+    def set_on_commit(self, key: str, value):
+        """Écriture différée au commit : une transaction annulée ne laisse rien en cache."""
+        transaction.on_commit(lambda: self.set(key, value))
+
+    def set_many_on_commit(self, values: dict):
+        transaction.on_commit(lambda: self.set_many(values))
+
+    def invalidate(self, *keys: str):
+        """
+        Supprime les clés tout de suite, puis de nouveau au commit : une lecture
+        concurrente ne peut pas remettre en cache l'ancienne valeur encore en base.
+        """
+        self.cache.delete_many(keys)
+        transaction.on_commit(lambda: self.cache.delete_many(keys))
@@ -0,0 +1,78 @@
+from contextvars import ContextVar
+
+
+class IdentityMap:
+    """
+    Carte d'identité (identity map) limitée à une requête.
+    Chaque objet chargé est indexé par (type, clé) : une même ligne n'est lue
+    qu'une seule fois par requête et les repositories partagent la même instance.
+    """
+
+    def __init__(self):
+        self._objects = {}
+
+    def get(self, kind, key):
+        return self._objects.get((kind, key))
+
+    def add(self, kind, key, obj):
+        self._objects[(kind, key)] = obj
+        return obj
+
+    def remove(self, kind, key):
+        self._objects.pop((kind, key), None)
+
+    def clear(self):
+        self._objects.clear()
+
+    def __contains__(self, item):
+        return item in self._objects
+
+    def __len__(self):
+        return len(self._objects)
+
+
+_current_identity_map = ContextVar("identity_map", default=None)
+
+
+def get_identity_map() -> IdentityMap | None:
+    """Retourne la carte de la requête en cours, ou None hors requête."""
+    return _current_identity_map.get()
+
+
+def identity_map_get(kind, key):
+    identity_map = _current_identity_map.get()
+    if identity_map is None or key is None:
+        return None
+    return identity_map.get(kind, key)
+
+
+def identity_map_add(kind, key, obj):
+    identity_map = _current_identity_map.get()
+    if identity_map is not None and key is not None:
+        identity_map.add(kind, key, obj)
+    return obj
+
+
+def identity_map_remove(kind, key):
+    identity_map = _current_identity_map.get()
+    if identity_map is not None:
+        identity_map.remove(kind, key)
+
+
+class identity_map_scope:
+    """
+    Ouvre une nouvelle carte pour la durée du bloc :
+
+        with identity_map_scope():
+            ...
+    """
+
+    def __enter__(self):
+        self.identity_map = IdentityMap()
+        self._token = _current_identity_map.set(self.identity_map)
+        return self.identity_map
+
+    def __exit__(self, exc_type, exc, tb):
+        _current_identity_map.reset(self._token)
+        self.identity_map.clear()
+        return False
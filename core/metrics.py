@@ -0,0 +1,326 @@
+import atexit
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+
+
+class Metric:
+    """
+    Métrique en mémoire du processus, indexée par ses labels.
+    """
+    type = "untyped"
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"Labels attendus pour {self.name} : {self.labelnames}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def samples(self):
+        """Retourne la liste (suffixe, labels, valeur) à exposer."""
+        with self._lock:
+            if not self.labelnames and not self._values:
+                return [("", {}, 0)]
+            return [
+                ("", dict(zip(self.labelnames, key)), value)
+                for key, value in self._values.items()
+            ]
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
+
+    def export(self):
+        """Valeurs sérialisables en JSON : [[labels, valeur], ...] (voir write_snapshot)."""
+        with self._lock:
+            return [[list(key), value] for key, value in self._values.items()]
+
+    def merge(self, key, value):
+        """Ajoute une valeur exportée par un autre processus."""
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + value
+
+
+class Counter(Metric):
+    type = "counter"
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        return self._values.get(self._key(labels), 0)
+
+
+class Gauge(Metric):
+    type = "gauge"
+
+    def __init__(self, name, documentation, labelnames=()):
+        super().__init__(name, documentation, labelnames)
+        self._function = None
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def set_function(self, function):
+        """La valeur est lue à chaque collecte (ex : taille d'une file)."""
+        self._function = function
+
+    def value(self, **labels):
+        if self._function is not None:
+            return self._function()
+        return self._values.get(self._key(labels), 0)
+
+    def samples(self):
+        if self._function is not None:
+            return [("", {}, self._function())]
+        return super().samples()
+
+    def export(self):
+        if self._function is not None:
+            return [[[], self._function()]]
+        return super().export()
+
+
+class Histogram(Metric):
+    """
+    Histogramme à seaux fixes. Chaque série conserve le nombre d'observations par
+    seau (non cumulé, le dernier pour +Inf) et leur somme ; l'exposition cumule.
+    """
+    type = "histogram"
+    DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            series = self._values.get(key)
+            if series is None:
+                series = self._values[key] = {"counts": [0] * (len(self.buckets) + 1), "sum": 0}
+            series["counts"][bisect_left(self.buckets, value)] += 1
+            series["sum"] += value
+
+    def count(self, **labels):
+        series = self._values.get(self._key(labels))
+        return sum(series["counts"]) if series else 0
+
+    def sum(self, **labels):
+        series = self._values.get(self._key(labels))
+        return series["sum"] if series else 0
+
+    def samples(self):
+        with self._lock:
+            series_list = [(dict(zip(self.labelnames, key)), series) for key, series in self._values.items()]
+        samples = []
+        for labels, series in series_list:
+            cumulative = 0
+            for bound, count in zip(self.buckets, series["counts"]):
+                cumulative += count
+                samples.append(("_bucket", {**labels, "le": _format_bound(bound)}, cumulative))
+            total = cumulative + series["counts"][-1]
+            samples.append(("_bucket", {**labels, "le": "+Inf"}, total))
+            samples.append(("_sum", labels, series["sum"]))
+            samples.append(("_count", labels, total))
+        return samples
+
+    def export(self):
+        with self._lock:
+            return [[list(key), {"counts": list(series["counts"]), "sum": series["sum"]}] for key, series in self._values.items()]
+
+    def merge(self, key, value):
+        with self._lock:
+            series = self._values.get(key)
+            if series is None:
+                series = self._values[key] = {"counts": [0] * (len(self.buckets) + 1), "sum": 0}
+            series["counts"] = [a + b for a, b in zip(series["counts"], value["counts"])]
+            series["sum"] += value["sum"]
+
+
+def _format_bound(bound):
+    return repr(float(bound))
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric):
+        """Enregistre la métrique ; retourne l'existante si le nom est déjà pris."""
+        with self._lock:
+            return self._metrics.setdefault(metric.name, metric)
+
+    def get(self, name):
+        return self._metrics.get(name)
+
+    def collect(self):
+        with self._lock:
+            return list(self._metrics.values())
+
+
+REGISTRY = Registry()
+
+
+def counter(name, documentation, labelnames=()):
+    return REGISTRY.register(Counter(name, documentation, labelnames))
+
+
+def gauge(name, documentation, labelnames=()):
+    return REGISTRY.register(Gauge(name, documentation, labelnames))
+
+
+def histogram(name, documentation, labelnames=(), buckets=Histogram.DEFAULT_BUCKETS):
+    return REGISTRY.register(Histogram(name, documentation, labelnames, buckets))
+
+
+# ---------------------------------------------------
+# Agrégation entre processus (workers gunicorn)
+# ---------------------------------------------------
+# Chaque processus écrit périodiquement l'état de ses métriques dans
+# <répertoire>/metrics-<pid>.json ; /metrics additionne les fichiers de tous
+# les processus. Les compteurs et histogrammes des processus terminés restent
+# comptés (un compteur ne décroît pas) ; leurs jauges sont ignorées.
+_METRIC_TYPES = {"counter": Counter, "gauge": Gauge, "histogram": Histogram}
+_last_flush = 0.0
+_flush_lock = threading.Lock()
+_atexit_registered = False
+
+
+def multiprocess_dir():
+    from django.conf import settings
+    return getattr(settings, "METRICS", {}).get("MULTIPROCESS_DIR")
+
+
+def snapshot(registry=REGISTRY) -> dict:
+    metrics = []
+    for metric in registry.collect():
+        data = {
+            "name": metric.name,
+            "type": metric.type,
+            "documentation": metric.documentation,
+            "labelnames": list(metric.labelnames),
+            "values": metric.export(),
+        }
+        if isinstance(metric, Histogram):
+            data["buckets"] = list(metric.buckets)
+        metrics.append(data)
+    return {"pid": os.getpid(), "metrics": metrics}
+
+
+def write_snapshot(directory, registry=REGISTRY):
+    """Écrit l'état du processus (écriture atomique : jamais de fichier tronqué)."""
+    path = os.path.join(directory, f"metrics-{os.getpid()}.json")
+    temporary = f"{path}.tmp"
+    with open(temporary, "w") as file:
+        json.dump(snapshot(registry), file)
+    os.replace(temporary, path)
+
+
+def flush_if_due(registry=REGISTRY):
+    """
+    Écrit l'état du processus si le répertoire multiprocessus est configuré et
+    que le dernier export date de plus de FLUSH_INTERVAL secondes.
+    """
+    global _last_flush, _atexit_registered
+    directory = multiprocess_dir()
+    if not directory:
+        return
+    from django.conf import settings
+    interval = getattr(settings, "METRICS", {}).get("FLUSH_INTERVAL", 1.0)
+    now = time.monotonic()
+    if now - _last_flush < interval or not _flush_lock.acquire(blocking=False):
+        return
+    try:
+        _last_flush = now
+        write_snapshot(directory, registry)
+        if not _atexit_registered:
+            atexit.register(_flush_at_exit, registry)
+            _atexit_registered = True
+    finally:
+        _flush_lock.release()
+
+
+def _flush_at_exit(registry):
+    directory = multiprocess_dir()
+    if directory:
+        try:
+            write_snapshot(directory, registry)
+        except OSError:
+            pass
+
+
+def _is_alive(pid) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def merged_registry(directory, registry=REGISTRY) -> Registry:
+    """
+    Registre temporaire : l'état courant du processus (lu en mémoire, pas depuis
+    son fichier) additionné à celui des autres processus du répertoire.
+    """
+    snapshots = [snapshot(registry)]
+    own_file = f"metrics-{os.getpid()}.json"
+    for name in sorted(os.listdir(directory)):
+        if not name.startswith("metrics-") or not name.endswith(".json") or name == own_file:
+            continue
+        try:
+            with open(os.path.join(directory, name)) as file:
+                snapshots.append(json.load(file))
+        except (OSError, ValueError):
+            continue
+
+    merged = Registry()
+    for data in snapshots:
+        alive = data["pid"] == os.getpid() or _is_alive(data["pid"])
+        for item in data["metrics"]:
+            if item["type"] == "gauge" and not alive:
+                continue
+            metric_class = _METRIC_TYPES.get(item["type"])
+            if metric_class is None:
+                continue
+            options = {"buckets": item["buckets"]} if metric_class is Histogram else {}
+            metric = merged.register(metric_class(item["name"], item["documentation"], item["labelnames"], **options))
+            for key, value in item["values"]:
+                metric.merge(tuple(key), value)
+    return merged
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+
+def render_prometheus(registry=REGISTRY):
+    """Exporte les métriques au format texte de Prometheus."""
+    lines = []
+    for metric in registry.collect():
+        lines.append(f"# HELP {metric.name} {metric.documentation}")
+        lines.append(f"# TYPE {metric.name} {metric.type}")
+        for suffix, labels, value in metric.samples():
+            lines.append(f"{metric.name}{suffix}{_format_labels(labels)} {value}")
+    return "\n".join(lines) + "\n"
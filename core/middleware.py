@@ -0,0 +1,112 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+
+from core import metrics
+from core.identity_map import identity_map_scope
+from core.request_timing import install_query_recorders, request_timings
+
+
+class IdentityMapMiddleware:
+    """
+    Ouvre une carte d'identité propre à chaque requête.
+    Les entités chargées par les repositories sont ainsi partagées pendant la
+    requête, puis oubliées à la fin pour ne jamais servir de données périmées.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with identity_map_scope():
+            return self.get_response(request)
+
+    async def __acall__(self, request):
+        with identity_map_scope():
+            return await self.get_response(request)
+
+
+_request_duration = metrics.histogram(
+    "http_request_duration_seconds",
+    "Durée des requêtes HTTP, par vue, méthode et statut.",
+    labelnames=("view", "method", "status"),
+)
+_request_queries = metrics.histogram(
+    "http_request_db_queries",
+    "Nombre de requêtes SQL par requête HTTP, par vue.",
+    labelnames=("view",),
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100),
+)
+_request_sql = metrics.histogram(
+    "http_request_db_seconds",
+    "Temps passé en SQL par requête HTTP, par vue.",
+    labelnames=("view",),
+)
+_request_hash = metrics.histogram(
+    "http_request_password_hash_seconds",
+    "Temps de hachage/vérification des mots de passe par requête HTTP, par vue (requêtes qui hachent).",
+    labelnames=("view",),
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+
+
+def view_name(request) -> str:
+    """Nom de la vue résolue (classe pour les vues à base de classe), « unresolved » sinon."""
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return "unresolved"
+    view_class = getattr(match.func, "view_class", None) or getattr(match.func, "cls", None)
+    return view_class.__name__ if view_class is not None else match.func.__name__
+
+
+class RequestMetricsMiddleware:
+    """
+    Mesure chaque requête : durée, nombre et durée des requêtes SQL, temps de
+    hachage des mots de passe. Alimente les histogrammes exposés par /metrics
+    et renvoie le détail dans l'en-tête Server-Timing.
+    À placer en tête de MIDDLEWARE pour couvrir les autres middlewares.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        install_query_recorders()
+        with request_timings() as timings:
+            response = self.get_response(request)
+        return self._record(request, response, timings)
+
+    async def __acall__(self, request):
+        with request_timings() as timings:
+            response = await self.get_response(request)
+        return self._record(request, response, timings)
+
+    @staticmethod
+    def _record(request, response, timings):
+        elapsed = timings.elapsed
+        view = view_name(request)
+        _request_duration.observe(elapsed, view=view, method=request.method, status=response.status_code)
+        _request_queries.observe(timings.queries, view=view)
+        _request_sql.observe(timings.sql_seconds, view=view)
+        hash_seconds = timings.spans.get("hash")
+        if hash_seconds is not None:
+            _request_hash.observe(hash_seconds, view=view)
+
+        server_timing = [
+            f"app;dur={elapsed * 1000:.1f}",
+            f'db;dur={timings.sql_seconds * 1000:.1f};desc="{timings.queries} queries"',
+        ]
+        server_timing += [f"{name};dur={seconds * 1000:.1f}" for name, seconds in timings.spans.items()]
+        response["Server-Timing"] = ", ".join(server_timing)
+        metrics.flush_if_due()
+        return response
@@ -0,0 +1,223 @@
+import cProfile
+import logging
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from pathlib import Path
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core import signing
+from django.urls import Resolver404, resolve
+from rest_framework.exceptions import APIException
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+from core import metrics
+
+logger = logging.getLogger(__name__)
+
+TOKEN_SALT = "core.profiling"
+MODES = ("cprofile", "sampling")
+
+_profiled = metrics.counter(
+    "http_requests_profiled_total",
+    "Requêtes profilées, par déclencheur (header, query, sample) et par mode.",
+    labelnames=("trigger", "mode"),
+)
+
+
+def profiling_config() -> dict:
+    config = {
+        "DIRECTORY": Path(settings.BASE_DIR) / "profiles",
+        "HEADER": "X-Profile-Request",
+        "QUERY_PARAM": "profile",
+        "TOKEN_MAX_AGE": 3600,
+        "SAMPLE_RATE": 0.0,
+        "SAMPLE_VIEWS": (),
+        "SAMPLE_MODE": "sampling",
+        "SAMPLE_INTERVAL": 0.001,
+        "MAX_FILES": 200,
+    }
+    config.update(getattr(settings, "PROFILING", {}))
+    return config
+
+
+def make_profiling_token(mode: str = "cprofile") -> str:
+    """
+    Valeur signée de l'en-tête de profilage, valable TOKEN_MAX_AGE secondes :
+
+        python manage.py shell -c "from core.profiling import make_profiling_token; print(make_profiling_token())"
+    """
+    if mode not in MODES:
+        raise ValueError(f"Mode de profilage inconnu : {mode} ({', '.join(MODES)}).")
+    return signing.dumps({"mode": mode}, salt=TOKEN_SALT)
+
+
+class StackSampler:
+    """
+    Profileur par échantillonnage : un thread relève la pile du thread observé
+    toutes les `interval` secondes et compte les piles identiques. Le résultat est
+    au format « collapsed » (une pile par ligne, fonctions séparées par « ; »),
+    lu par flamegraph.pl ou speedscope.
+    """
+
+    def __init__(self, thread_id: int, interval: float):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        if self._thread.ident is not None:
+            # Thread démarré : attendre le dernier relevé ; sinon rien à attendre
+            self._thread.join()
+
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                self.stacks[self._collapse(frame)] += 1
+
+    @staticmethod
+    def _collapse(frame) -> str:
+        names = []
+        while frame is not None:
+            code = frame.f_code
+            names.append(f"{code.co_qualname} ({_short_path(code.co_filename)}:{code.co_firstlineno})".replace(";", ":"))
+            frame = frame.f_back
+        return ";".join(reversed(names))
+
+    def collapsed(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+def _short_path(filename: str) -> str:
+    for prefix in sorted((str(settings.BASE_DIR), *sys.path), key=len, reverse=True):
+        if prefix and filename.startswith(prefix + os.sep):
+            return filename[len(prefix) + 1:]
+    return filename
+
+
+class ProfilingMiddleware:
+    """
+    Profile une requête à la demande, sans coût pour les autres :
+
+    - en-tête signé (HEADER, voir make_profiling_token), ou paramètre `?profile=1`
+      (`?profile=sampling` pour l'échantillonnage) réservé au personnel ;
+    - échantillon de trafic réel : une requête sur 1/SAMPLE_RATE, limité aux vues
+      de SAMPLE_VIEWS si la liste est renseignée.
+
+    Le mode « cprofile » (déterministe) écrit un fichier .prof (pstats, snakeviz) ;
+    les deux modes écrivent un fichier .collapsed pour les flame graphs. Les
+    fichiers vont dans DIRECTORY ; au-delà de MAX_FILES, les plus anciens sont
+    supprimés. Sous ASGI, les requêtes traversent le middleware sans profilage.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.get_response(request)
+        config = profiling_config()
+        trigger, mode = self._requested(request, config)
+        if trigger is None:
+            return self.get_response(request)
+        return self._profile(request, config, trigger, mode)
+
+    def _requested(self, request, config):
+        """(déclencheur, mode), ou (None, None) si la requête n'est pas profilée."""
+        header = request.headers.get(config["HEADER"])
+        if header:
+            try:
+                token = signing.loads(header, salt=TOKEN_SALT, max_age=config["TOKEN_MAX_AGE"])
+                return "header", token.get("mode", "cprofile")
+            except signing.BadSignature:
+                logger.warning("En-tête de profilage invalide ou expiré sur %s", request.path)
+
+        flag = request.GET.get(config["QUERY_PARAM"])
+        if flag and self._is_staff(request):
+            return "query", "sampling" if flag == "sampling" else "cprofile"
+
+        if config["SAMPLE_RATE"] and random.random() < config["SAMPLE_RATE"]:
+            if not config["SAMPLE_VIEWS"] or self._view_name(request) in config["SAMPLE_VIEWS"]:
+                return "sample", config["SAMPLE_MODE"]
+        return None, None
+
+    @staticmethod
+    def _is_staff(request) -> bool:
+        user = getattr(request, "user", None)
+        if user is not None and user.is_authenticated and user.is_staff:
+            return True
+        # Authentification de l'API (JWT) : request.user n'est connu que dans la vue
+        drf_request = Request(request, authenticators=[cls() for cls in api_settings.DEFAULT_AUTHENTICATION_CLASSES])
+        try:
+            return bool(drf_request.user and drf_request.user.is_staff)
+        except APIException:
+            return False
+
+    @staticmethod
+    def _view_name(request) -> str | None:
+        try:
+            match = resolve(request.path_info)
+        except Resolver404:
+            return None
+        view_class = getattr(match.func, "view_class", None) or getattr(match.func, "cls", None)
+        return view_class.__name__ if view_class is not None else match.func.__name__
+
+    def _profile(self, request, config, trigger, mode):
+        sampler = StackSampler(threading.get_ident(), config["SAMPLE_INTERVAL"])
+        profiler = cProfile.Profile() if mode == "cprofile" else None
+        started = time.perf_counter()
+        try:
+            # Dans le try : si le démarrage échoue à mi-chemin, ce qui a démarré est arrêté
+            sampler.start()
+            if profiler is not None:
+                profiler.enable()
+            response = self.get_response(request)
+        finally:
+            if profiler is not None:
+                profiler.disable()
+            sampler.stop()
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        try:
+            name = self._store(request, config, elapsed_ms, sampler, profiler)
+        except OSError:
+            logger.exception("Impossible d'enregistrer le profil de %s", request.path)
+            return response
+        _profiled.inc(trigger=trigger, mode=mode)
+        if trigger != "sample":
+            response["X-Profile-Id"] = name
+        return response
+
+    def _store(self, request, config, elapsed_ms, sampler, profiler) -> str:
+        directory = Path(config["DIRECTORY"])
+        directory.mkdir(parents=True, exist_ok=True)
+        view = self._view_name(request) or "unresolved"
+        name = f"{time.strftime('%Y%m%d-%H%M%S')}-{request.method}-{view}-{elapsed_ms:.0f}ms-{uuid.uuid4().hex[:8]}"
+        (directory / f"{name}.collapsed").write_text(sampler.collapsed())
+        if profiler is not None:
+            profiler.dump_stats(directory / f"{name}.prof")
+        self._prune(directory, config["MAX_FILES"])
+        return name
+
+    @staticmethod
+    def _prune(directory: Path, max_files: int):
+        profiles = sorted(directory.glob("*.collapsed"), key=lambda path: path.stat().st_mtime)
+        for collapsed in profiles[:max(0, len(profiles) - max_files)]:
+            collapsed.unlink(missing_ok=True)
+            collapsed.with_suffix(".prof").unlink(missing_ok=True)
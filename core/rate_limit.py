@@ -0,0 +1,111 @@
+import time
+
+from django.core.cache import cache as default_cache
+
+PERIODS = {"s": 1, "sec": 1, "m": 60, "min": 60, "h": 3600, "hour": 3600, "d": 86400, "day": 86400}
+
+
+def parse_rate(rate: str) -> tuple[int, int]:
+    """« 10/min » -> (10, 60), au format des taux de DRF."""
+    count, _, period = rate.partition("/")
+    try:
+        return int(count), PERIODS[period]
+    except (KeyError, ValueError):
+        raise ValueError(f"Taux invalide : {rate!r} (ex : 10/min).") from None
+
+
+class SlidingWindowLimiter:
+    """
+    Limiteur à fenêtre glissante sur le cache Django : deux compteurs par clé
+    (fenêtre fixe courante et précédente), la précédente pondérée par la part
+    encore couverte par la fenêtre glissante. Les compteurs avancent par
+    incr() atomique et sont partagés entre workers si le cache l'est (Redis,
+    Memcached) ; avec LocMemCache, la limite s'applique par processus.
+
+    Un essai refusé n'est pas compté : le client retrouve ses droits au rythme
+    de la limite, sans que l'insistance ne prolonge son blocage.
+    """
+
+    def __init__(self, scope: str, limit: int, window: int, cache=None):
+        self.scope = scope
+        self.limit = limit
+        self.window = window
+        self.cache = cache or default_cache
+
+    @classmethod
+    def from_rate(cls, scope: str, rate: str, cache=None):
+        return cls(scope, *parse_rate(rate), cache=cache)
+
+    def _keys(self, ident: str, now: float):
+        index = int(now // self.window)
+        prefix = f"rate-limit:{self.scope}:{ident}"
+        return f"{prefix}:{index}", f"{prefix}:{index - 1}", now - index * self.window
+
+    def _decide(self, current: int, previous: int, elapsed: float) -> float:
+        """0 si l'essai est permis, sinon le délai (s) avant qu'il le soit."""
+        weight = 1 - elapsed / self.window
+        if previous * weight + current < self.limit:
+            return 0.0
+        if current < self.limit and previous:
+            # La part de la fenêtre précédente décroît : attendre qu'elle laisse une place
+            return max(1.0, self.window * (1 - (self.limit - current) / previous) - elapsed)
+        return max(1.0, self.window - elapsed)
+
+    def hit(self, ident: str) -> tuple[float, str | None]:
+        """
+        Compte un essai pour `ident`. Retourne (0, clé du compteur incrémenté) s'il
+        est permis, sinon (délai d'attente en secondes, None) : l'essai refusé
+        n'est pas compté. La clé permet de rendre l'essai avec release().
+        """
+        current_key, previous_key, elapsed = self._keys(ident, time.time())
+        # Incrément d'abord : deux essais simultanés ne voient pas le même compte
+        self.cache.add(current_key, 0, timeout=2 * self.window)
+        try:
+            current = self.cache.incr(current_key)
+        except ValueError:
+            # Clé expirée entre add() et incr()
+            current = 1
+            self.cache.set(current_key, current, timeout=2 * self.window)
+        wait = self._decide(current - 1, self.cache.get(previous_key, 0), elapsed)
+        if wait:
+            self.cache.decr(current_key)
+            return wait, None
+        return 0.0, current_key
+
+    async def ahit(self, ident: str) -> tuple[float, str | None]:
+        """Version asynchrone de hit."""
+        current_key, previous_key, elapsed = self._keys(ident, time.time())
+        await self.cache.aadd(current_key, 0, timeout=2 * self.window)
+        try:
+            current = await self.cache.aincr(current_key)
+        except ValueError:
+            current = 1
+            await self.cache.aset(current_key, current, timeout=2 * self.window)
+        wait = self._decide(current - 1, await self.cache.aget(previous_key, 0), elapsed)
+        if wait:
+            await self.cache.adecr(current_key)
+            return wait, None
+        return 0.0, current_key
+
+    def release(self, key: str):
+        """
+        Rend un essai compté par hit(), dans le compteur dont hit() a retourné la
+        clé (la fenêtre a pu changer depuis) : quand une autre limite refuse la
+        même tentative, celle-ci ne doit pas consommer de place ici non plus.
+        """
+        try:
+            self.cache.decr(key)
+        except ValueError:
+            # Clé expirée : plus rien à rendre
+            pass
+
+    async def arelease(self, key: str):
+        """Version asynchrone de release."""
+        try:
+            await self.cache.adecr(key)
+        except ValueError:
+            pass
+
+    def reset(self, ident: str):
+        current_key, previous_key, _ = self._keys(ident, time.time())
+        self.cache.delete_many([current_key, previous_key])
@@ -0,0 +1,99 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+
+class RequestTimings:
+    """
+    Mesures d'une requête HTTP : nombre et durée des requêtes SQL, et durée
+    des étapes nommées (ex : « hash » pour le hachage des mots de passe).
+    """
+    __slots__ = ("started", "queries", "sql_seconds", "spans")
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.sql_seconds = 0.0
+        self.spans = {}
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def add_span(self, name: str, seconds: float):
+        self.spans[name] = self.spans.get(name, 0.0) + seconds
+
+
+_current_timings = ContextVar("request_timings", default=None)
+
+
+def current_timings() -> RequestTimings | None:
+    return _current_timings.get()
+
+
+@contextmanager
+def request_timings():
+    """Mesure le bloc ; la variable de contexte suit la requête dans les threads de sync_to_async."""
+    timings = RequestTimings()
+    token = _current_timings.set(timings)
+    try:
+        yield timings
+    finally:
+        _current_timings.reset(token)
+
+
+@contextmanager
+def timed(name: str):
+    """Ajoute la durée du bloc à l'étape `name` de la requête en cours (sans effet hors requête)."""
+    timings = _current_timings.get()
+    if timings is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.add_span(name, time.perf_counter() - started)
+
+
+class QueryRecorder:
+    """
+    Wrapper d'exécution (connection.execute_wrapper) posé une fois pour toutes
+    sur chaque connexion : compte les requêtes SQL de la requête HTTP en cours.
+    """
+
+    def __call__(self, execute, sql, params, many, context):
+        timings = _current_timings.get()
+        if timings is None:
+            return execute(sql, params, many, context)
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            timings.queries += 1
+            timings.sql_seconds += time.perf_counter() - started
+
+
+_recorder = QueryRecorder()
+
+
+def install_query_recorder(connection):
+    # En tête de liste : connection.execute_wrapper() retire le dernier wrapper ajouté
+    if _recorder not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, _recorder)
+
+
+def install_query_recorders():
+    """Pose le wrapper sur les connexions déjà ouvertes du thread (les nouvelles passent par le signal)."""
+    for connection in connections.all(initialized_only=True):
+        install_query_recorder(connection)
+
+
+def _on_connection_created(sender, connection, **kwargs):
+    install_query_recorder(connection)
+
+
+connection_created.connect(_on_connection_created, dispatch_uid="core.request_timing.install_query_recorder")
@@ -39,13 +39,17 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "core.middleware.RequestMetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
+    "core.db_router.ReplicaRoutingMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "core.profiling.ProfilingMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "core.middleware.IdentityMapMiddleware",
 ]
 
 ROOT_URLCONF = "core.urls"
@@ -88,6 +92,102 @@ DATABASES = {
     }
 }
 
+
+def replica_databases(primary: dict) -> dict:
+    """
+    Un alias replica_<n> par hôte de DB_REPLICA_HOSTS (« hôte[:port],... »),
+    avec les identifiants et options du primaire.
+    """
+    replicas = {}
+    for index, host in enumerate(filter(None, os.getenv("DB_REPLICA_HOSTS", "").split(",")), start=1):
+        host, _, port = host.strip().partition(":")
+        replicas[f"replica_{index}"] = {**primary, "HOST": host, "PORT": port or primary.get("PORT", "")}
+    return replicas
+
+
+DATABASES.update(replica_databases(DATABASES["default"]))
+
+# Lectures sur les réplicas, écritures sur le primaire (voir core/db_router.py).
+# REPLICAS : alias utilisés en lecture (None : tous sauf « default ») ;
+# STICKY_SECONDS : durée pendant laquelle un utilisateur qui vient d'écrire lit le primaire
+# (cookie COOKIE_NAME et/ou entrée de cache indexée par l'utilisateur du JWT) ;
+# DOWN_SECONDS : durée d'éviction d'un réplica en erreur.
+DATABASE_ROUTERS = ["core.db_router.ReplicaRouter"]
+REPLICA_ROUTING = {
+    "REPLICAS": None,
+    "STICKY_SECONDS": int(os.getenv("DB_STICKY_SECONDS", "5")),
+    "DOWN_SECONDS": 30,
+    "COOKIE_NAME": "primary_db_until",
+    "STICKINESS": ("cookie", "token"),
+}
+
+# ---------------------------------------------------
+# Cache
+# ---------------------------------------------------
+# Mémoire du processus par défaut. En local, le backend fichier partage le cache
+# entre plusieurs workers :
+#   CACHE_BACKEND=django.core.cache.backends.filebased.FileBasedCache CACHE_LOCATION=/tmp/smart-task-cache
+CACHES = {
+    "default": {
+        "BACKEND": os.getenv("CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"),
+        "LOCATION": os.getenv("CACHE_LOCATION", "smart-task"),
+    }
+}
+
+# Cache des lectures par clé des repositories (projets, adhésions, utilisateurs), en secondes.
+# MISSING_TTL : durée de mémorisation d'une clé absente en base ; LOCK_* : protection
+# contre le rechargement simultané d'une même clé par plusieurs workers.
+REPOSITORY_CACHE = {
+    "TTL": int(os.getenv("REPOSITORY_CACHE_TTL", "300")),
+    "MISSING_TTL": 30,
+    "LOCK_TIMEOUT": 5,
+    "LOCK_WAIT": 1.0,
+}
+
+# ---------------------------------------------------
+# Métriques (/metrics)
+# ---------------------------------------------------
+# Avec plusieurs workers (gunicorn), chaque processus exporte ses métriques dans
+# MULTIPROCESS_DIR au plus toutes les FLUSH_INTERVAL secondes, et /metrics en fait
+# la somme. Le répertoire doit être vidé au démarrage du serveur.
+# /metrics ne répond qu'aux adresses de ALLOWED_IPS (boucle locale par défaut) et
+# aux requêtes portant `Authorization: Bearer <TOKEN>` ; sinon 403.
+METRICS = {
+    "MULTIPROCESS_DIR": os.getenv("PROMETHEUS_MULTIPROC_DIR") or None,
+    "FLUSH_INTERVAL": 1.0,
+    "TOKEN": os.getenv("METRICS_TOKEN") or None,
+    "ALLOWED_IPS": tuple(filter(None, os.getenv("METRICS_ALLOWED_IPS", "127.0.0.1,::1").split(","))),
+}
+
+# Profilage à la demande (core/profiling.py) : en-tête signé, `?profile=1` pour le
+# personnel, ou échantillon du trafic (SAMPLE_RATE, 0 = désactivé)
+PROFILING = {
+    "DIRECTORY": BASE_DIR / "profiles",
+    "SAMPLE_RATE": float(os.getenv("PROFILING_SAMPLE_RATE", "0")),
+    "SAMPLE_VIEWS": tuple(filter(None, os.getenv("PROFILING_SAMPLE_VIEWS", "").split(","))),
+    "MAX_FILES": 200,
+}
+
+# ---------------------------------------------------
+# Password Hashing
+# ---------------------------------------------------
+# Le premier hasher calcule les nouveaux hashes, avec un coût calibré sur la machine
+# pour durer environ TARGET_MS (`python manage.py calibrate_password_hasher --write`).
+# Les hashes plus faibles sont recalculés à la connexion suivante.
+PASSWORD_HASHERS = [
+    "users.infrastructure.services.calibrated_hashers.CalibratedPBKDF2PasswordHasher",
+    "users.infrastructure.services.calibrated_hashers.CalibratedScryptPasswordHasher",
+    "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+    "django.contrib.auth.hashers.Argon2PasswordHasher",
+    "django.contrib.auth.hashers.BCryptSHA256PasswordHasher",
+]
+
+PASSWORD_HASH_CALIBRATION = {
+    "TARGET_MS": int(os.getenv("PASSWORD_HASH_TARGET_MS", "250")),
+    "FILE": BASE_DIR / "password_hash_calibration.json",
+    "MIN_ITERATIONS": 1_000_000,
+}
+
 # ---------------------------------------------------
 # Password Validation
 # ---------------------------------------------------
@@ -116,6 +216,22 @@ STATICFILES_DIRS = [BASE_DIR / "static"]
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media"
 
+# Cache des URL d'avatars (TTL en secondes ; réduit automatiquement pour les URL signées)
+AVATAR_URL_CACHE = {
+    "MAX_SIZE": int(os.getenv("AVATAR_URL_CACHE_MAX_SIZE", "10000")),
+    "TTL": int(os.getenv("AVATAR_URL_CACHE_TTL", "300")),
+}
+
+# Pipeline des avatars : limites de l'upload et miniatures générées en arrière-plan
+AVATAR_PIPELINE = {
+    "MAX_UPLOAD_SIZE": int(os.getenv("AVATAR_MAX_UPLOAD_SIZE", str(5 * 1024 * 1024))),
+    "MAX_DIMENSION": 4096,
+    "MIN_DIMENSION": 32,
+    "THUMBNAIL_SIZES": (40, 80, 160),
+    "THUMBNAIL_FORMATS": ("webp", "jpeg"),
+    "WORKERS": int(os.getenv("AVATAR_PIPELINE_WORKERS", "2")),
+}
+
 # ---------------------------------------------------
 # Default Primary Key Field
 # ---------------------------------------------------
@@ -126,14 +242,38 @@ from datetime import timedelta
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "users.infrastructure.services.jwt_authentication.CachedJWTAuthentication",
     ),
 }
 
+# Tentatives de connexion par adresse IP et par email (fenêtre glissante sur le cache
+# par défaut, partagée entre workers avec un cache Redis ou Memcached) ; None désactive
+LOGIN_THROTTLE = {
+    "IP_RATE": os.getenv("LOGIN_THROTTLE_IP_RATE", "20/min"),
+    "EMAIL_RATE": os.getenv("LOGIN_THROTTLE_EMAIL_RATE", "5/min"),
+}
+
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(hours=1),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=7),
     "AUTH_HEADER_TYPES": ("Bearer",),
 }
 
+# Cache des utilisateurs authentifiés par JWT (LRU + TTL en secondes, par processus).
+# Actif seulement si CACHE_BACKEND est partagé entre processus (Redis, Memcached...) :
+# les invalidations passent par ce cache. ENABLED=True/False force le choix.
+JWT_USER_CACHE = {
+    "MAX_SIZE": int(os.getenv("JWT_USER_CACHE_MAX_SIZE", "10000")),
+    "TTL": int(os.getenv("JWT_USER_CACHE_TTL", "60")),
+    "ENABLED": None,
+}
 
+# ---------------------------------------------------
+# Password Hashing Pool (vues asynchrones)
+# ---------------------------------------------------
+# Threads dédiés au hachage des mots de passe et taille de la file d'attente.
+# Au-delà, les connexions/inscriptions reçoivent immédiatement une 503.
+PASSWORD_HASHING_POOL = {
+    "MAX_WORKERS": int(os.getenv("PASSWORD_HASHING_WORKERS", "4")),
+    "MAX_QUEUE": int(os.getenv("PASSWORD_HASHING_QUEUE", "16")),
+}
@@ -0,0 +1,15 @@
+from .test import *
+
+# ---------------------------------------------------
+# Benchmark Settings (SQLite en mémoire)
+# ---------------------------------------------------
+# Utilisation : python -m benchmarks.suite (voir benchmarks/suite.py)
+# Base entièrement en mémoire et mono-connexion : les mesures ne dépendent
+# pas du disque. Les benchmarks multi-threads (asgi_load) gardent core.settings.test.
+DATABASES = {
+    "default": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": ":memory:",
+    }
+}
+REPLICA_ROUTING = {**REPLICA_ROUTING, "REPLICAS": []}
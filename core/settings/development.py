@@ -18,3 +18,4 @@ DATABASES = {
         },
     }
 }
+DATABASES.update(replica_databases(DATABASES["default"]))
@@ -41,6 +41,7 @@ DATABASES = {
         },
     }
 }
+DATABASES.update(replica_databases(DATABASES["default"]))
 
 # ---------------------------------------------------
 # Static & Media files (Production)
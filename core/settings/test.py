@@ -0,0 +1,54 @@
+import tempfile
+from pathlib import Path
+
+from .base import *
+
+# ---------------------------------------------------
+# Test Settings (SQLite)
+# ---------------------------------------------------
+# Utilisation : python manage.py test --settings=core.settings.test
+
+DEBUG = False
+
+SECRET_KEY = "test-secret-key-suffisamment-longue-pour-hs256"
+
+ALLOWED_HOSTS = ["testserver", "localhost", "127.0.0.1"]
+
+DATABASES = {
+    "default": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": ":memory:",
+        # Base de test dans un fichier : les tests concurrents (TransactionTestCase + threads)
+        # attendent le verrou d'écriture au lieu d'échouer comme en mémoire partagée
+        "TEST": {"NAME": str(Path(tempfile.gettempdir()) / "smart-task-test.sqlite3")},
+    },
+    # Bases SQLite distinctes tenant lieu de réplicas pour les tests du routage
+    # (core/db_router.py) ; seuls ces tests les activent
+    "replica_1": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": ":memory:",
+        "TEST": {"NAME": str(Path(tempfile.gettempdir()) / "smart-task-test-replica-1.sqlite3")},
+    },
+    "replica_2": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": ":memory:",
+        "TEST": {"NAME": str(Path(tempfile.gettempdir()) / "smart-task-test-replica-2.sqlite3")},
+    },
+}
+REPLICA_ROUTING = {**REPLICA_ROUTING, "REPLICAS": []}
+
+# Les tests de connexion partagent l'IP 127.0.0.1 : seuls les tests du limiteur l'activent
+LOGIN_THROTTLE = {"IP_RATE": None, "EMAIL_RATE": None}
+
+# La suite tourne dans un seul processus : LocMemCache y est partagé par tous les threads
+JWT_USER_CACHE = {**JWT_USER_CACHE, "ENABLED": True}
+
+# Un hasher rapide pour ne pas ralentir la suite de tests
+PASSWORD_HASHERS = [
+    "django.contrib.auth.hashers.MD5PasswordHasher",
+]
+
+STATICFILES_DIRS = []
+
+# Les fichiers (avatars, miniatures) sont écrits dans un dossier temporaire
+MEDIA_ROOT = Path(tempfile.mkdtemp(prefix="smart-task-media-"))
@@ -0,0 +1,38 @@
+import hmac
+import ipaddress
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+from core.metrics import merged_registry, multiprocess_dir, render_prometheus
+
+
+def _metrics_allowed(request) -> bool:
+    """
+    Accès à /metrics : adresse du client dans METRICS["ALLOWED_IPS"] (adresses ou
+    réseaux), ou en-tête `Authorization: Bearer <METRICS["TOKEN"]>`. REMOTE_ADDR
+    seul fait foi : derrière un proxy, c'est l'adresse du proxy, utiliser le jeton.
+    """
+    config = getattr(settings, "METRICS", {})
+    token = config.get("TOKEN")
+    if token:
+        scheme, _, credentials = request.headers.get("Authorization", "").partition(" ")
+        if scheme.lower() == "bearer" and hmac.compare_digest(credentials.encode(), token.encode()):
+            return True
+    try:
+        address = ipaddress.ip_address(request.META.get("REMOTE_ADDR", ""))
+    except ValueError:
+        return False
+    return any(address in ipaddress.ip_network(network, strict=False) for network in config.get("ALLOWED_IPS", ()))
+
+
+def metrics(request):
+    """
+    Expose les métriques au format texte de Prometheus : celles du processus, ou
+    la somme de tous les workers si METRICS["MULTIPROCESS_DIR"] est configuré.
+    Réservé aux adresses autorisées et aux porteurs du jeton (_metrics_allowed).
+    """
+    if not _metrics_allowed(request):
+        return HttpResponseForbidden()
+    directory = multiprocess_dir()
+    content = render_prometheus(merged_registry(directory)) if directory else render_prometheus()
+    return HttpResponse(content, content_type="text/plain; version=0.0.4; charset=utf-8")
@@ -1,3 +1,48 @@
 from django.contrib import admin
+from core.paginator import EstimatedCountPaginator
+from .models import ProjectModel, ProjectMemberModel, TaskModel
 
-# Register your models here.
+
+@admin.register(ProjectModel)
+class ProjectAdmin(admin.ModelAdmin):
+    list_display = ["name", "owner", "created_at", "updated_at"]
+    list_select_related = ["owner"]
+    autocomplete_fields = ["owner"]
+    search_fields = ["name"]
+    ordering = ["-created_at"]
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        if change and "owner" in form.changed_data:
+            # Nouveau propriétaire : membre ADMIN, comme à la création (projects/signals.py)
+            ProjectMemberModel.objects.update_or_create(
+                project=obj, user_id=obj.owner_id, defaults={"role": ProjectMemberModel.Role.ADMIN}
+            )
+
+
+@admin.register(ProjectMemberModel)
+class ProjectMemberAdmin(admin.ModelAdmin):
+    # __str__ du modèle lit user.email et project.name : on les charge dans la même requête
+    list_display = ["__str__", "role", "joined_at"]
+    list_select_related = ["user", "project"]
+    list_filter = ["role"]
+    autocomplete_fields = ["user", "project"]
+    search_fields = ["user__email", "project__name"]
+    ordering = ["-joined_at"]
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+
+@admin.register(TaskModel)
+class TaskAdmin(admin.ModelAdmin):
+    list_display = ["title", "project", "status", "priority", "assignee", "position", "updated_at"]
+    # ProjectMemberModel.__str__ lit user.email et project.name
+    list_select_related = ["project", "assignee__user", "assignee__project"]
+    list_filter = ["status", "priority"]
+    autocomplete_fields = ["project", "assignee"]
+    search_fields = ["title", "project__name"]
+    ordering = ["-updated_at"]
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
@@ -2,6 +2,26 @@ from projects.domain.entities import Project, ProjectMember
 from projects.infrastructure.repositories.project_repository import ProjectRepository
 from users.infrastructure.repositories.user_repository import UserRepository
 
+
+class BulkProjectValidationError(ValueError):
+    """
+    Levée lorsqu'un ou plusieurs projets d'un lot sont invalides.
+    `errors` contient une entrée par projet invalide : {"index": ..., "error": ...}.
+    """
+    def __init__(self, errors):
+        super().__init__("Un ou plusieurs projets sont invalides.")
+        self.errors = errors
+
+
+class ProjectNotFoundError(ValueError):
+    """
+    Levée lorsque le projet n'existe pas ou que l'utilisateur n'en est pas membre :
+    les deux cas ne sont pas distingués, pour ne pas révéler l'existence du projet.
+    """
+    def __init__(self):
+        super().__init__("Projet introuvable.")
+
+
 class ProjectService:
     def __init__(self, project_repository: ProjectRepository, user_repository: UserRepository):
         self.project_repository = project_repository
@@ -21,16 +41,107 @@ class ProjectService:
             owner_id=owner_id
         )
 
-        # Sauvegarder le projet
+        # Sauvegarder le projet : le propriétaire en devient membre admin à
+        # l'enregistrement (projects/signals.py), y compris hors de ce service
         created_project = self.project_repository.create_project(project)
 
-        # Ajouter le propriétaire comme premier membre avec le rôle d'admin
-        member = ProjectMember(
+        return created_project
+
+    async def acreate_project(self, name: str, description: str, owner_id: str) -> Project:
+        """Version asynchrone de create_project."""
+        owner = await self.user_repository.aget_by_id(owner_id)
+        if not owner:
+            raise ValueError("Le propriétaire du projet n'existe pas.")
+
+        project = Project(
             id=None,
-            project_id=created_project.id,
-            user_id=owner_id,
-            role=ProjectMember.Role.ADMIN
+            name=name,
+            description=description,
+            owner_id=owner_id
         )
-        self.project_repository.add_member(member)
+        # Le propriétaire devient membre admin à l'enregistrement (projects/signals.py)
+        created_project = await self.project_repository.acreate_project(project)
 
         return created_project
+
+    def create_projects_bulk(self, projects_data: list[dict], owner_id: str) -> list[Project]:
+        """
+        Crée un lot de projets pour un même propriétaire.
+        Toutes les entités sont validées avant toute écriture : si un seul projet
+        est invalide, rien n'est créé et les erreurs sont rapportées par élément.
+        """
+        owner = self.user_repository.get_by_id(owner_id)
+        if not owner:
+            raise ValueError("Le propriétaire du projet n'existe pas.")
+
+        projects = []
+        errors = []
+        for index, data in enumerate(projects_data):
+            try:
+                projects.append(Project(
+                    id=None,
+                    name=data.get("name"),
+                    description=data.get("description", ""),
+                    owner_id=owner_id
+                ))
+            except ValueError as e:
+                errors.append({"index": index, "error": str(e)})
+
+        if errors:
+            raise BulkProjectValidationError(errors)
+
+        # Le propriétaire devient admin de chacun des projets (bulk_create
+        # n'envoie pas le signal qui l'ajoute à la création d'un projet)
+        members = [
+            ProjectMember(
+                id=None,
+                project_id=project.id,
+                user_id=owner_id,
+                role=ProjectMember.Role.ADMIN
+            )
+            for project in projects
+        ]
+        return self.project_repository.create_projects_bulk(projects, members)
+
+    def list_user_projects(self, user_id: str, limit: int, after: tuple | None = None) -> list[Project]:
+        """
+        Liste paginée des projets de l'utilisateur (propriétaire ou membre).
+        `after` : (created_at, id) du dernier projet déjà renvoyé.
+        """
+        return self.project_repository.list_for_user(user_id, limit, after)
+
+    async def alist_user_projects(self, user_id: str, limit: int, after: tuple | None = None) -> list[Project]:
+        """Version asynchrone de list_user_projects."""
+        return await self.project_repository.alist_for_user(user_id, limit, after)
+
+    def get_project(self, project_id, user_id) -> Project:
+        """Projet visible par l'utilisateur (membre ou propriétaire)."""
+        project = self.project_repository.find_for_member(project_id, user_id)
+        if project is None:
+            raise ProjectNotFoundError()
+        return project
+
+    def get_project_version(self, project_id, user_id):
+        """
+        Date de dernière modification du projet, sans charger l'entité :
+        suffit à répondre aux requêtes conditionnelles (ETag / Last-Modified).
+        """
+        updated_at = self.project_repository.get_version_for_member(project_id, user_id)
+        if updated_at is None:
+            raise ProjectNotFoundError()
+        return updated_at
+
+    def get_user_projects_version(self, user_id) -> tuple[int, object]:
+        """(nombre de projets, date de dernière modification) de la liste de l'utilisateur."""
+        return self.project_repository.list_version_for_user(user_id)
+
+    async def aget_user_projects_version(self, user_id) -> tuple[int, object]:
+        """Version asynchrone de get_user_projects_version."""
+        return await self.project_repository.alist_version_for_user(user_id)
+
+    def iter_export_rows(self, user_id, include_all: bool = False):
+        """
+        Lignes (projet, membre) à exporter : tous les projets pour le personnel
+        (`include_all`), sinon ceux dont l'utilisateur est propriétaire ou membre.
+        """
+        return self.project_repository.iter_export_rows(None if include_all else user_id)
@@ -0,0 +1,54 @@
+from projects.domain.entities import Task
+from projects.infrastructure.repositories.project_repository import ProjectRepository
+from projects.infrastructure.repositories.task_repository import TaskRepository
+from projects.application.services.project_service import ProjectNotFoundError
+
+
+class TaskService:
+    def __init__(self, task_repository: TaskRepository, project_repository: ProjectRepository):
+        self.task_repository = task_repository
+        self.project_repository = project_repository
+
+    def create_task(
+        self,
+        project_id,
+        user_id,
+        title: str,
+        description: str = "",
+        status: str = Task.Status.TODO,
+        priority: str = Task.Priority.MEDIUM,
+        assignee_id=None,
+    ) -> Task:
+        """
+        Crée une tâche en fin de colonne. L'assigné doit être membre du projet.
+        """
+        self._check_access(project_id, user_id)
+        if assignee_id is not None and not self.project_repository.is_member(project_id, assignee_id):
+            raise ValueError("L'assigné doit être membre du projet.")
+
+        task = Task(
+            id=None,
+            project_id=project_id,
+            title=title,
+            description=description,
+            status=status,
+            priority=priority,
+            assignee_id=assignee_id,
+        )
+        task.position = self.task_repository.next_position(project_id, task.status)
+        return self.task_repository.create_task(task)
+
+    def get_board(self, project_id, user_id) -> dict[str, list[Task]]:
+        """
+        Tableau Kanban du projet : {statut: [tâches triées par position]}.
+        Toutes les colonnes sont présentes, dans l'ordre de Task.Status.COLUMNS.
+        """
+        self._check_access(project_id, user_id)
+        board = {status: [] for status in Task.Status.COLUMNS}
+        for task in self.task_repository.list_for_board(project_id):
+            board[task.status].append(task)
+        return board
+
+    def _check_access(self, project_id, user_id):
+        if self.project_repository.find_member(project_id, user_id) is None:
+            raise ProjectNotFoundError()
@@ -1,4 +1,5 @@
 from .project import Project
 from .project_member import ProjectMember
+from .task import Task, TaskAssignee
 
-__all__ = ["Project", "ProjectMember"]
+__all__ = ["Project", "ProjectMember", "Task", "TaskAssignee"]
@@ -5,6 +5,9 @@ class Project:
     """
     Entité représentant un projet dans le domaine.
     """
+    # Pas de __dict__ par instance : les listes de projets restent compactes en mémoire
+    __slots__ = ("id", "name", "description", "owner_id", "created_at", "updated_at")
+
     def __init__(
         self,
         id,
@@ -18,8 +21,28 @@ class Project:
         self.name = self._validate_name(name)
         self.description = description
         self.owner_id = owner_id
-        self.created_at = created_at or datetime.utcnow()
-        self.updated_at = updated_at or datetime.utcnow()
+        # Un seul horodatage partagé par les deux dates par défaut
+        if created_at is None or updated_at is None:
+            now = datetime.utcnow()
+            created_at = created_at or now
+            updated_at = updated_at or now
+        self.created_at = created_at
+        self.updated_at = updated_at
+
+    @classmethod
+    def from_trusted(cls, id, name, description, owner_id, created_at, updated_at):
+        """
+        Construit l'entité sans validation, à partir de données déjà valides
+        (lignes lues en base). Réservé aux chemins de lecture en masse.
+        """
+        project = cls.__new__(cls)
+        project.id = id
+        project.name = name
+        project.description = description
+        project.owner_id = owner_id
+        project.created_at = created_at
+        project.updated_at = updated_at
+        return project
 
     def _validate_name(self, name):
         if not name or len(name.strip()) < 3:
@@ -5,6 +5,9 @@ class ProjectMember:
     """
     Entité représentant un membre d'un projet dans le domaine.
     """
+    # Pas de __dict__ par instance : les exports manipulent des centaines de milliers de membres
+    __slots__ = ("id", "project_id", "user_id", "role", "joined_at")
+
     class Role:
         ADMIN = "ADMIN"
         MEMBER = "MEMBER"
@@ -23,6 +26,20 @@ class ProjectMember:
         self.role = self._validate_role(role)
         self.joined_at = joined_at or datetime.utcnow()
 
+    @classmethod
+    def from_trusted(cls, id, project_id, user_id, role, joined_at):
+        """
+        Construit l'entité sans validation, à partir de données déjà valides
+        (lignes lues en base). Réservé aux chemins de lecture en masse.
+        """
+        member = cls.__new__(cls)
+        member.id = id
+        member.project_id = project_id
+        member.user_id = user_id
+        member.role = role
+        member.joined_at = joined_at
+        return member
+
     def _validate_role(self, role):
         if role not in [self.Role.ADMIN, self.Role.MEMBER]:
             raise ValueError(f"Le rôle '{role}' est invalide.")
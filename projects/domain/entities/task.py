@@ -0,0 +1,117 @@
+import uuid
+from datetime import datetime
+
+class TaskAssignee:
+    """
+    Membre du projet auquel une tâche est assignée, avec les informations
+    d'affichage de l'utilisateur (lues en même temps que la tâche).
+    """
+    __slots__ = ("member_id", "user_id", "full_name", "email")
+
+    def __init__(self, member_id, user_id, full_name, email):
+        self.member_id = member_id
+        self.user_id = user_id
+        self.full_name = full_name
+        self.email = email
+
+
+class Task:
+    """
+    Entité représentant une tâche d'un projet dans le domaine.
+    """
+    # Pas de __dict__ par instance : un tableau peut contenir des milliers de tâches
+    __slots__ = (
+        "id", "project_id", "title", "description", "status", "priority",
+        "assignee_id", "position", "created_at", "updated_at", "assignee",
+    )
+
+    class Status:
+        TODO = "TODO"
+        IN_PROGRESS = "IN_PROGRESS"
+        IN_REVIEW = "IN_REVIEW"
+        DONE = "DONE"
+
+        # Ordre des colonnes du tableau Kanban
+        COLUMNS = (TODO, IN_PROGRESS, IN_REVIEW, DONE)
+
+    class Priority:
+        LOW = "LOW"
+        MEDIUM = "MEDIUM"
+        HIGH = "HIGH"
+        URGENT = "URGENT"
+
+        ALL = (LOW, MEDIUM, HIGH, URGENT)
+
+    def __init__(
+        self,
+        id,
+        project_id,
+        title,
+        description="",
+        status=Status.TODO,
+        priority=Priority.MEDIUM,
+        assignee_id=None,
+        position=0,
+        created_at=None,
+        updated_at=None,
+        assignee=None,
+    ):
+        self.id = id or uuid.uuid4()
+        self.project_id = project_id
+        self.title = self._validate_title(title)
+        self.description = description
+        self.status = self._validate_status(status)
+        self.priority = self._validate_priority(priority)
+        self.assignee_id = assignee_id
+        self.position = position
+        if created_at is None or updated_at is None:
+            now = datetime.utcnow()
+            created_at = created_at or now
+            updated_at = updated_at or now
+        self.created_at = created_at
+        self.updated_at = updated_at
+        self.assignee = assignee
+
+    @classmethod
+    def from_trusted(
+        cls, id, project_id, title, description, status, priority,
+        assignee_id, position, created_at, updated_at, assignee=None,
+    ):
+        """
+        Construit l'entité sans validation, à partir de données déjà valides
+        (lignes lues en base). Réservé aux chemins de lecture en masse.
+        """
+        task = cls.__new__(cls)
+        task.id = id
+        task.project_id = project_id
+        task.title = title
+        task.description = description
+        task.status = status
+        task.priority = priority
+        task.assignee_id = assignee_id
+        task.position = position
+        task.created_at = created_at
+        task.updated_at = updated_at
+        task.assignee = assignee
+        return task
+
+    def _validate_title(self, title):
+        if not title or not title.strip():
+            raise ValueError("Le titre de la tâche est obligatoire.")
+        return title.strip()
+
+    def _validate_status(self, status):
+        if status not in self.Status.COLUMNS:
+            raise ValueError(f"Le statut '{status}' est invalide.")
+        return status
+
+    def _validate_priority(self, priority):
+        if priority not in self.Priority.ALL:
+            raise ValueError(f"La priorité '{priority}' est invalide.")
+        return priority
+
+    def __eq__(self, other):
+        return isinstance(other, Task) and self.id == other.id
+
+    def __hash__(self):
+        return hash(self.id)
@@ -1,4 +1,5 @@
 from .project_mapper import ProjectMapper
 from .project_member_mapper import ProjectMemberMapper
+from .task_mapper import TaskMapper
 
-__all__ = ["ProjectMapper", "ProjectMemberMapper"]
+__all__ = ["ProjectMapper", "ProjectMemberMapper", "TaskMapper"]
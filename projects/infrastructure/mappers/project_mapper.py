@@ -1,7 +1,12 @@
+from collections.abc import Iterator
+from django.db.models import QuerySet
 from projects.domain.entities.project import Project
 from projects.infrastructure.models.project_model import ProjectModel
 
 class ProjectMapper:
+    # Colonnes lues par le chemin de lecture en masse, dans l'ordre de Project.from_trusted
+    BULK_FIELDS = ("id", "name", "description", "owner_id", "created_at", "updated_at")
+
     @staticmethod
     def to_entity(project_model: ProjectModel) -> Project:
         return Project(
@@ -21,3 +26,22 @@ class ProjectMapper:
             description=project_entity.description,
             owner_id=project_entity.owner_id,
         )
+
+    @staticmethod
+    def to_row(project: ProjectModel | Project) -> tuple:
+        """Colonnes BULK_FIELDS d'un modèle ou d'une entité (valeurs stockées par le cache des repositories)."""
+        return tuple(getattr(project, field) for field in ProjectMapper.BULK_FIELDS)
+
+    @staticmethod
+    def from_row(row: tuple) -> Project:
+        return Project.from_trusted(*row)
+
+    @staticmethod
+    def to_entities(queryset: QuerySet, chunk_size: int = 2000) -> Iterator[Project]:
+        """
+        Convertit un QuerySet en entités sans instancier de ProjectModel ni revalider
+        les données : lecture par tuples (values_list) et par lots (iterator).
+        """
+        rows = queryset.values_list(*ProjectMapper.BULK_FIELDS).iterator(chunk_size=chunk_size)
+        for row in rows:
+            yield Project.from_trusted(*row)
@@ -1,7 +1,12 @@
+from collections.abc import Iterator
+from django.db.models import QuerySet
 from projects.domain.entities.project_member import ProjectMember
 from projects.infrastructure.models.project_member_model import ProjectMemberModel
 
 class ProjectMemberMapper:
+    # Colonnes lues par le chemin de lecture en masse, dans l'ordre de ProjectMember.from_trusted
+    BULK_FIELDS = ("id", "project_id", "user_id", "role", "joined_at")
+
     @staticmethod
     def to_entity(member_model: ProjectMemberModel) -> ProjectMember:
         return ProjectMember(
@@ -20,3 +25,22 @@ class ProjectMemberMapper:
             user_id=member_entity.user_id,
             role=member_entity.role,
         )
+
+    @staticmethod
+    def to_row(member: ProjectMemberModel | ProjectMember) -> tuple:
+        """Colonnes BULK_FIELDS d'un modèle ou d'une entité (valeurs stockées par le cache des repositories)."""
+        return tuple(getattr(member, field) for field in ProjectMemberMapper.BULK_FIELDS)
+
+    @staticmethod
+    def from_row(row: tuple) -> ProjectMember:
+        return ProjectMember.from_trusted(*row)
+
+    @staticmethod
+    def to_entities(queryset: QuerySet, chunk_size: int = 2000) -> Iterator[ProjectMember]:
+        """
+        Convertit un QuerySet en entités sans instancier de ProjectMemberModel ni
+        revalider les données : lecture par tuples (values_list) et par lots (iterator).
+        """
+        rows = queryset.values_list(*ProjectMemberMapper.BULK_FIELDS).iterator(chunk_size=chunk_size)
+        for row in rows:
+            yield ProjectMember.from_trusted(*row)
@@ -0,0 +1,56 @@
+from collections.abc import Iterator
+from django.db.models import QuerySet
+from projects.domain.entities.task import Task, TaskAssignee
+from projects.infrastructure.models.task_model import TaskModel
+
+class TaskMapper:
+    # Colonnes lues par le chemin de lecture en masse, dans l'ordre de Task.from_trusted
+    BULK_FIELDS = (
+        "id", "project_id", "title", "description", "status", "priority",
+        "assignee_id", "position", "created_at", "updated_at",
+    )
+    # Colonnes de l'assigné, jointes dans la même requête (assignee -> user)
+    ASSIGNEE_FIELDS = ("assignee__user_id", "assignee__user__full_name", "assignee__user__email")
+
+    @staticmethod
+    def to_entity(task_model: TaskModel) -> Task:
+        return Task(
+            id=task_model.id,
+            project_id=task_model.project_id,
+            title=task_model.title,
+            description=task_model.description,
+            status=task_model.status,
+            priority=task_model.priority,
+            assignee_id=task_model.assignee_id,
+            position=task_model.position,
+            created_at=task_model.created_at,
+            updated_at=task_model.updated_at,
+        )
+
+    @staticmethod
+    def to_model(task_entity: Task) -> TaskModel:
+        return TaskModel(
+            id=task_entity.id,
+            project_id=task_entity.project_id,
+            title=task_entity.title,
+            description=task_entity.description,
+            status=task_entity.status,
+            priority=task_entity.priority,
+            assignee_id=task_entity.assignee_id,
+            position=task_entity.position,
+        )
+
+    @staticmethod
+    def to_entities(queryset: QuerySet, chunk_size: int = 2000) -> Iterator[Task]:
+        """
+        Convertit un QuerySet en entités avec leur assigné, sans instancier de
+        TaskModel : les colonnes de la tâche et de l'assigné sont lues par tuples,
+        en une seule requête (jointure sur le membre et l'utilisateur).
+        """
+        fields = TaskMapper.BULK_FIELDS + TaskMapper.ASSIGNEE_FIELDS
+        rows = queryset.values_list(*fields).iterator(chunk_size=chunk_size)
+        width = len(TaskMapper.BULK_FIELDS)
+        for row in rows:
+            assignee_id = row[6]
+            assignee = TaskAssignee(assignee_id, *row[width:]) if assignee_id is not None else None
+            yield Task.from_trusted(*row[:width], assignee)
@@ -1,4 +1,5 @@
 from .project_model import ProjectModel
 from .project_member_model import ProjectMemberModel
+from .task_model import TaskModel
 
-__all__ = ["ProjectModel", "ProjectMemberModel"]
+__all__ = ["ProjectModel", "ProjectMemberModel", "TaskModel"]
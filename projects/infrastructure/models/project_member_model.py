@@ -3,6 +3,23 @@ from django.db import models
 from users.infrastructure.models.user_model import UserModel
 from .project_model import ProjectModel
 
+class ProjectMemberManager(models.Manager):
+    def bulk_create(self, objs, *args, **kwargs):
+        """bulk_create n'appelle pas save() : project_created_at est renseigné ici."""
+        objs = list(objs)
+        missing = {
+            obj.project_id for obj in objs
+            if obj.project_created_at is None and not ProjectMemberModel.project.is_cached(obj)
+        }
+        created_at = dict(ProjectModel.objects.filter(id__in=missing).values_list("id", "created_at")) if missing else {}
+        for obj in objs:
+            if obj.project_created_at is None:
+                obj.project_created_at = (
+                    obj.project.created_at if ProjectMemberModel.project.is_cached(obj) else created_at.get(obj.project_id)
+                )
+        return super().bulk_create(objs, *args, **kwargs)
+
+
 class ProjectMemberModel(models.Model):
     class Role(models.TextChoices):
         ADMIN = "ADMIN", "Admin"
@@ -13,12 +30,27 @@ class ProjectMemberModel(models.Model):
     user = models.ForeignKey(UserModel, on_delete=models.CASCADE, related_name="project_memberships")
     role = models.CharField(max_length=10, choices=Role.choices, default=Role.MEMBER)
     joined_at = models.DateTimeField(auto_now_add=True)
+    # Copie de project.created_at : la liste des projets d'un utilisateur se lit
+    # dans l'index member_user_project_idx, dans l'ordre de la pagination
+    project_created_at = models.DateTimeField(editable=False)
+
+    objects = ProjectMemberManager()
 
     class Meta:
         verbose_name = "Project Member"
         verbose_name_plural = "Project Members"
         unique_together = ("project", "user")
         ordering = ["-joined_at"]
+        indexes = [
+            # Projets d'un utilisateur (le propriétaire est membre ADMIN), dans l'ordre
+            # du curseur (created_at, id) : filtre, tri et pagination servis par l'index
+            models.Index(fields=["user", "-project_created_at", "-project"], name="member_user_project_idx"),
+        ]
+
+    def save(self, *args, **kwargs):
+        if self.project_created_at is None:
+            self.project_created_at = self.project.created_at
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return f"{self.user.email} in {self.project.name}"
@@ -0,0 +1,42 @@
+import uuid
+from django.db import models
+from .project_model import ProjectModel
+from .project_member_model import ProjectMemberModel
+
+class TaskModel(models.Model):
+    class Status(models.TextChoices):
+        TODO = "TODO", "To do"
+        IN_PROGRESS = "IN_PROGRESS", "In progress"
+        IN_REVIEW = "IN_REVIEW", "In review"
+        DONE = "DONE", "Done"
+
+    class Priority(models.TextChoices):
+        LOW = "LOW", "Low"
+        MEDIUM = "MEDIUM", "Medium"
+        HIGH = "HIGH", "High"
+        URGENT = "URGENT", "Urgent"
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    project = models.ForeignKey(ProjectModel, on_delete=models.CASCADE, related_name="tasks")
+    title = models.CharField(max_length=191)
+    description = models.TextField(blank=True)
+    status = models.CharField(max_length=12, choices=Status.choices, default=Status.TODO)
+    priority = models.CharField(max_length=10, choices=Priority.choices, default=Priority.MEDIUM)
+    assignee = models.ForeignKey(
+        ProjectMemberModel, on_delete=models.SET_NULL, null=True, blank=True, related_name="assigned_tasks"
+    )
+    position = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Task"
+        verbose_name_plural = "Tasks"
+        ordering = ["project", "status", "position"]
+        indexes = [
+            # Tableau Kanban : toutes les tâches d'un projet, par colonne puis par position
+            models.Index(fields=["project", "status", "position"], name="task_board_idx"),
+        ]
+
+    def __str__(self):
+        return self.title
@@ -0,0 +1,88 @@
+from core.entity_cache import EntityCache
+from core.identity_map import identity_map_get, identity_map_add
+from projects.domain.entities import Project, ProjectMember
+from projects.infrastructure.models import ProjectModel, ProjectMemberModel
+from projects.infrastructure.mappers import ProjectMapper, ProjectMemberMapper
+from projects.infrastructure.repositories.project_repository import ProjectRepository
+
+project_cache = EntityCache("project")
+member_cache = EntityCache("project_member")
+
+
+def invalidate_project(project_id):
+    project_cache.invalidate(project_cache.key(project_id))
+
+
+def invalidate_member(project_id, user_id):
+    member_cache.invalidate(member_cache.key(project_id, user_id))
+
+
+def remember_member(member: ProjectMember):
+    """Écrit l'adhésion dans le cache au commit (lue juste après sa création)."""
+    member_cache.set_on_commit(member_cache.key(member.project_id, member.user_id), ProjectMemberMapper.to_row(member))
+
+
+class CachedProjectRepository(ProjectRepository):
+    """
+    ProjectRepository dont les lectures par clé (projet par id, adhésion d'un
+    utilisateur) passent par le cache Django. Les écritures du repository mettent
+    le cache à jour au commit ; les sauvegardes faites ailleurs l'invalident via
+    les signaux (projects/signals.py). Un queryset.update() doit appeler
+    invalidate_project / invalidate_member.
+    """
+
+    def create_project(self, project_entity: Project) -> Project:
+        project = super().create_project(project_entity)
+        project_cache.set_on_commit(project_cache.key(project.id), ProjectMapper.to_row(project))
+        return project
+
+    async def acreate_project(self, project_entity: Project) -> Project:
+        # Pas de transaction en mode asynchrone : la ligne est déjà validée
+        project = await super().acreate_project(project_entity)
+        await project_cache.aset(project_cache.key(project.id), ProjectMapper.to_row(project))
+        return project
+
+    def create_projects_bulk(self, project_entities, member_entities):
+        # bulk_create n'envoie pas de signaux : écriture explicite au commit
+        projects = super().create_projects_bulk(project_entities, member_entities)
+        project_cache.set_many_on_commit({
+            project_cache.key(project.id): ProjectMapper.to_row(project) for project in projects
+        })
+        return projects
+
+    def add_member(self, member_entity: ProjectMember) -> ProjectMember:
+        member = super().add_member(member_entity)
+        remember_member(member)
+        return member
+
+    async def aadd_member(self, member_entity: ProjectMember) -> ProjectMember:
+        member = await super().aadd_member(member_entity)
+        await member_cache.aset(member_cache.key(member.project_id, member.user_id), ProjectMemberMapper.to_row(member))
+        return member
+
+    def find_by_id(self, project_id) -> Project | None:
+        project = identity_map_get(Project, project_id)
+        if project is not None:
+            return project
+        row = project_cache.get_or_load(
+            project_cache.key(project_id),
+            lambda: ProjectModel.objects.filter(id=project_id).values_list(*ProjectMapper.BULK_FIELDS).first(),
+        )
+        if row is None:
+            return None
+        return identity_map_add(Project, project_id, ProjectMapper.from_row(row))
+
+    def find_member(self, project_id, user_id) -> ProjectMember | None:
+        row = member_cache.get_or_load(
+            member_cache.key(project_id, user_id),
+            lambda: ProjectMemberModel.objects.filter(project_id=project_id, user_id=user_id)
+            .values_list(*ProjectMemberMapper.BULK_FIELDS)
+            .first(),
+        )
+        return ProjectMemberMapper.from_row(row) if row is not None else None
+
+    def find_for_member(self, project_id, user_id) -> Project | None:
+        if self.find_member(project_id, user_id) is None:
+            return None
+        return self.find_by_id(project_id)
+
@@ -1,22 +1,196 @@
+from django.db import transaction
+from django.db.models import Count, Max, Q
+from core.identity_map import identity_map_get, identity_map_add
 from projects.domain.entities import Project, ProjectMember
 from projects.infrastructure.models import ProjectModel, ProjectMemberModel
 from projects.infrastructure.mappers import ProjectMapper, ProjectMemberMapper
 from users.infrastructure.models.user_model import UserModel
 
+# Taille des lots pour les insertions groupées (bulk_create)
+BULK_BATCH_SIZE = 500
+
+# Colonnes du projet lues à partir de ses adhésions (liste des projets d'un utilisateur)
+MEMBER_PROJECT_FIELDS = tuple(f"project__{field}" for field in ProjectMapper.BULK_FIELDS)
+
+# Colonnes de l'export : une ligne par (projet, membre), jointures comprises
+EXPORT_FIELDS = (
+    "id", "name", "description", "owner_id", "owner__email", "created_at", "updated_at",
+    "members__id", "members__user_id", "members__user__email", "members__role", "members__joined_at",
+)
+
+
 class ProjectRepository:
     def create_project(self, project_entity: Project) -> Project:
         project_model = ProjectMapper.to_model(project_entity)
         project_model.save()
-        return ProjectMapper.to_entity(project_model)
+        return self._register(project_model)
+
+    async def acreate_project(self, project_entity: Project) -> Project:
+        """Version asynchrone de create_project."""
+        project_model = ProjectMapper.to_model(project_entity)
+        await project_model.asave()
+        return self._register(project_model)
+
+    def create_projects_bulk(
+        self,
+        project_entities: list[Project],
+        member_entities: list[ProjectMember],
+    ) -> list[Project]:
+        """
+        Crée plusieurs projets et leurs membres dans une seule transaction.
+        Le nombre de requêtes ne dépend pas du nombre de projets.
+        """
+        project_models = [ProjectMapper.to_model(project) for project in project_entities]
+        member_models = [ProjectMemberMapper.to_model(member) for member in member_entities]
+
+        with transaction.atomic():
+            ProjectModel.objects.bulk_create(project_models, batch_size=BULK_BATCH_SIZE)
+            # created_at est renseigné par bulk_create (auto_now_add) : aucune relecture
+            created_at = {project_model.id: project_model.created_at for project_model in project_models}
+            for member_model in member_models:
+                member_model.project_created_at = created_at.get(member_model.project_id)
+            ProjectMemberModel.objects.bulk_create(member_models, batch_size=BULK_BATCH_SIZE)
+
+        return [self._register(project_model) for project_model in project_models]
 
     def add_member(self, member_entity: ProjectMember) -> ProjectMember:
-        member_model = ProjectMemberMapper.to_model(member_entity)
+        member_model = self._member_model(member_entity)
         member_model.save()
         return ProjectMemberMapper.to_entity(member_model)
 
+    async def aadd_member(self, member_entity: ProjectMember) -> ProjectMember:
+        """Version asynchrone de add_member."""
+        member_model = self._member_model(member_entity)
+        await member_model.asave()
+        return ProjectMemberMapper.to_entity(member_model)
+
+    def _member_model(self, member_entity: ProjectMember) -> ProjectMemberModel:
+        member_model = ProjectMemberMapper.to_model(member_entity)
+        # Projet déjà chargé dans la requête (création) : sa date évite une lecture dans save()
+        project = identity_map_get(Project, member_entity.project_id)
+        if project is not None:
+            member_model.project_created_at = project.created_at
+        return member_model
+
     def find_by_id(self, project_id: str) -> Project | None:
+        project = identity_map_get(Project, project_id)
+        if project is not None:
+            return project
         try:
             project_model = ProjectModel.objects.get(id=project_id)
-            return ProjectMapper.to_entity(project_model)
+            return self._register(project_model)
         except ProjectModel.DoesNotExist:
             return None
+
+    def find_member(self, project_id, user_id) -> ProjectMember | None:
+        """Adhésion de l'utilisateur au projet (le propriétaire est membre ADMIN)."""
+        member_model = ProjectMemberModel.objects.filter(project_id=project_id, user_id=user_id).first()
+        return ProjectMemberMapper.to_entity(member_model) if member_model else None
+
+    def is_member(self, project_id, member_id) -> bool:
+        """Vérifie que le membre `member_id` appartient bien au projet."""
+        return ProjectMemberModel.objects.filter(project_id=project_id, id=member_id).exists()
+
+    def find_for_member(self, project_id, user_id) -> Project | None:
+        """Le projet, s'il existe et que l'utilisateur en est membre."""
+        project = identity_map_get(Project, project_id)
+        if project is not None and self.find_member(project_id, user_id) is not None:
+            return project
+        project_model = ProjectModel.objects.filter(id=project_id, members__user_id=user_id).first()
+        return self._register(project_model) if project_model else None
+
+    def get_version_for_member(self, project_id, user_id):
+        """
+        updated_at du projet si l'utilisateur en est membre, sinon None.
+        Une requête sur une colonne : le projet n'est ni chargé ni converti.
+        """
+        return (
+            ProjectModel.objects.filter(id=project_id, members__user_id=user_id)
+            .values_list("updated_at", flat=True)
+            .first()
+        )
+
+    def list_for_user(self, user_id, limit: int, after: tuple | None = None) -> list[Project]:
+        """
+        Projets dont l'utilisateur est membre (le propriétaire l'est en ADMIN), du
+        plus récent au plus ancien. Pagination par curseur (keyset) sur (created_at,
+        id) : `after` est le couple du dernier projet de la page précédente, jamais
+        un OFFSET. La page est lue dans l'index member_user_project_idx.
+        """
+        rows = self._user_projects_page(user_id, limit, after).iterator()
+        return [identity_map_add(Project, row[0], ProjectMapper.from_row(row)) for row in rows]
+
+    async def alist_for_user(self, user_id, limit: int, after: tuple | None = None) -> list[Project]:
+        """Version asynchrone de list_for_user."""
+        rows = self._user_projects_page(user_id, limit, after)
+        return [identity_map_add(Project, row[0], ProjectMapper.from_row(row)) async for row in rows]
+
+    def list_version_for_user(self, user_id) -> tuple[int, object]:
+        """
+        (nombre, max(updated_at)) des projets de l'utilisateur, en une requête
+        d'agrégat : change dès qu'un projet est ajouté, retiré ou modifié.
+        """
+        version = self._user_memberships(user_id).aggregate(
+            count=Count("project_id"), last_modified=Max("project__updated_at")
+        )
+        return version["count"], version["last_modified"]
+
+    async def alist_version_for_user(self, user_id) -> tuple[int, object]:
+        """Version asynchrone de list_version_for_user."""
+        version = await self._user_memberships(user_id).aaggregate(
+            count=Count("project_id"), last_modified=Max("project__updated_at")
+        )
+        return version["count"], version["last_modified"]
+
+    def iter_export_rows(self, user_id=None, chunk_size: int = 2000):
+        """
+        Lignes (projet, membre) de tous les projets, ou de ceux de `user_id`, dans
+        l'ordre de EXPORT_FIELDS. Parcours par lots de `chunk_size` projets (keyset sur
+        l'id) : chaque requête est bornée, y compris avec MySQL où iterator() ne
+        diffuse pas les résultats (mysqlclient charge tout le résultat en mémoire).
+        La mémoire utilisée ne dépend donc pas du nombre de lignes.
+        """
+        projects = self._user_projects(user_id) if user_id is not None else ProjectModel.objects.all()
+        last_id = None
+        while True:
+            batch = projects.order_by("id")
+            if last_id is not None:
+                batch = batch.filter(id__gt=last_id)
+            project_ids = list(batch.values_list("id", flat=True)[:chunk_size])
+            if not project_ids:
+                return
+            rows = (
+                ProjectModel.objects.filter(id__in=project_ids)
+                .order_by("id", "members__joined_at")
+                .values_list(*EXPORT_FIELDS)
+                .iterator(chunk_size=chunk_size)
+            )
+            yield from rows
+            last_id = project_ids[-1]
+
+    def _user_memberships(self, user_id):
+        return ProjectMemberModel.objects.filter(user_id=user_id)
+
+    def _user_projects(self, user_id):
+        # Une adhésion par (projet, utilisateur) : la jointure ne duplique aucun projet
+        return ProjectModel.objects.filter(members__user_id=user_id)
+
+    def _user_projects_page(self, user_id, limit: int, after: tuple | None):
+        """
+        Lignes ProjectMapper.BULK_FIELDS d'une page, lues depuis les adhésions :
+        filtre sur user_id et tri sur (project_created_at, project_id) suivent
+        l'index member_user_project_idx, le projet est joint par sa clé primaire.
+        """
+        queryset = self._user_memberships(user_id)
+        if after is not None:
+            created_at, project_id = after
+            queryset = queryset.filter(
+                Q(project_created_at__lt=created_at) | Q(project_created_at=created_at, project_id__lt=project_id)
+            )
+        return queryset.order_by("-project_created_at", "-project_id").values_list(*MEMBER_PROJECT_FIELDS)[:limit]
+
+    def _register(self, project_model: ProjectModel) -> Project:
+        """
+        Enregistre l'entité dans la carte d'identité de la requête.
+        """
+        return identity_map_add(Project, project_model.pk, ProjectMapper.to_entity(project_model))
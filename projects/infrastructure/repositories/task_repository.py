@@ -0,0 +1,25 @@
+from django.db.models import Max
+from projects.domain.entities import Task
+from projects.infrastructure.models import TaskModel
+from projects.infrastructure.mappers import TaskMapper
+
+
+class TaskRepository:
+    def create_task(self, task_entity: Task) -> Task:
+        task_model = TaskMapper.to_model(task_entity)
+        task_model.save(force_insert=True)
+        return TaskMapper.to_entity(task_model)
+
+    def next_position(self, project_id, status: str) -> int:
+        """Position en fin de colonne ; lue sur l'index (project, status, position)."""
+        last = TaskModel.objects.filter(project_id=project_id, status=status).aggregate(last=Max("position"))["last"]
+        return 0 if last is None else last + 1
+
+    def list_for_board(self, project_id) -> list[Task]:
+        """
+        Toutes les tâches du projet, triées par colonne puis par position, avec leur
+        assigné. Une seule requête, servie par l'index task_board_idx, quel que soit
+        le nombre de colonnes ou de tâches.
+        """
+        queryset = TaskModel.objects.filter(project_id=project_id).order_by("status", "position", "id")
+        return list(TaskMapper.to_entities(queryset))
@@ -0,0 +1,83 @@
+import csv
+import io
+import json
+import zlib
+
+# En-têtes de l'export, dans l'ordre de project_repository.EXPORT_FIELDS
+EXPORT_COLUMNS = (
+    "project_id", "project_name", "description", "owner_id", "owner_email", "created_at", "updated_at",
+    "member_id", "member_user_id", "member_email", "role", "joined_at",
+)
+
+CONTENT_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+# Taille visée des morceaux envoyés au client (un write() par morceau, pas par ligne)
+CHUNK_SIZE = 64 * 1024
+
+
+def _value(value):
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return str(value)
+
+
+def _ndjson_lines(rows):
+    for row in rows:
+        yield json.dumps(dict(zip(EXPORT_COLUMNS, map(_value, row))), ensure_ascii=False) + "\n"
+
+
+def _csv_lines(rows):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_COLUMNS)
+    for row in rows:
+        writer.writerow(["" if value is None else _value(value) for value in row])
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    # En-tête seul si l'export est vide
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def _chunks(lines):
+    """Regroupe les lignes en morceaux d'environ CHUNK_SIZE octets."""
+    pending = []
+    size = 0
+    for line in lines:
+        data = line.encode()
+        pending.append(data)
+        size += len(data)
+        if size >= CHUNK_SIZE:
+            yield b"".join(pending)
+            pending = []
+            size = 0
+    if pending:
+        yield b"".join(pending)
+
+
+def gzip_stream(chunks):
+    """Compresse un flux d'octets au format gzip, morceau par morceau."""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def stream_export(rows, export_format: str, compress: bool = False):
+    """
+    Sérialise les lignes (projet, membre) en NDJSON ou CSV, sous forme d'un
+    générateur d'octets : rien n'est accumulé en mémoire au-delà d'un morceau.
+    """
+    if export_format not in CONTENT_TYPES:
+        raise ValueError(f"Format d'export inconnu : {export_format} (ndjson ou csv).")
+    lines = _ndjson_lines(rows) if export_format == "ndjson" else _csv_lines(rows)
+    chunks = _chunks(lines)
+    return gzip_stream(chunks) if compress else chunks
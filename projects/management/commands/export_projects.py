@@ -0,0 +1,32 @@
+import sys
+
+from django.core.management.base import BaseCommand
+from projects.infrastructure.repositories.project_repository import ProjectRepository
+from projects.infrastructure.services.project_export import stream_export
+
+
+class Command(BaseCommand):
+    help = "Exporte les projets et leurs membres (une ligne par projet et par membre) en NDJSON ou CSV."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--format", choices=["ndjson", "csv"], default="ndjson")
+        parser.add_argument("--output", default="-", help="Fichier de sortie ('-' pour la sortie standard).")
+        parser.add_argument("--gzip", action="store_true", help="Compresse la sortie (gzip).")
+        parser.add_argument("--user", help="Limite l'export aux projets de cet utilisateur (id).")
+        parser.add_argument("--chunk-size", type=int, default=2000, help="Projets lus par requête.")
+
+    def handle(self, *args, **options):
+        rows = ProjectRepository().iter_export_rows(options["user"], chunk_size=options["chunk_size"])
+        chunks = stream_export(rows, options["format"], options["gzip"])
+
+        if options["output"] == "-":
+            output = sys.stdout.buffer
+            for chunk in chunks:
+                output.write(chunk)
+            output.flush()
+            return
+
+        with open(options["output"], "wb") as output:
+            for chunk in chunks:
+                output.write(chunk)
+        self.stderr.write(self.style.SUCCESS(f"Export écrit dans {options['output']}."))
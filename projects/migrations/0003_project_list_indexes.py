@@ -0,0 +1,23 @@
+# Generated by Django 5.2.7 on 2026-10-18 07:57
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0002_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='projectmembermodel',
+            index=models.Index(fields=['user', '-joined_at'], name='member_user_joined_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='projectmodel',
+            index=models.Index(fields=['owner', '-created_at'], name='project_owner_created_idx'),
+        ),
+    ]
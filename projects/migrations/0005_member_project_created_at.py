@@ -0,0 +1,65 @@
+# Generated by Django 5.2.7 on 2026-10-18 16:02
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def backfill_memberships(apps, schema_editor):
+    """
+    Le propriétaire devient membre ADMIN des projets où il ne l'est pas encore
+    (la liste ne passe plus que par les adhésions), puis chaque adhésion reçoit
+    la date de création de son projet.
+    """
+    ProjectModel = apps.get_model("projects", "ProjectModel")
+    ProjectMemberModel = apps.get_model("projects", "ProjectMemberModel")
+    db_alias = schema_editor.connection.alias
+
+    orphans = (
+        ProjectModel.objects.using(db_alias)
+        .exclude(members__user_id=models.F("owner_id"))
+        .values_list("id", "owner_id", "created_at")
+    )
+    ProjectMemberModel.objects.using(db_alias).bulk_create(
+        [
+            ProjectMemberModel(project_id=project_id, user_id=owner_id, role="ADMIN", project_created_at=created_at)
+            for project_id, owner_id, created_at in orphans.iterator()
+        ],
+        batch_size=500,
+    )
+    created_at = ProjectModel.objects.using(db_alias).filter(id=OuterRef("project_id")).values("created_at")
+    ProjectMemberModel.objects.using(db_alias).filter(project_created_at__isnull=True).update(
+        project_created_at=Subquery(created_at)
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0004_task'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='projectmembermodel',
+            name='member_user_joined_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='projectmodel',
+            name='project_owner_created_idx',
+        ),
+        migrations.AddField(
+            model_name='projectmembermodel',
+            name='project_created_at',
+            field=models.DateTimeField(editable=False, null=True),
+        ),
+        migrations.RunPython(backfill_memberships, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='projectmembermodel',
+            name='project_created_at',
+            field=models.DateTimeField(editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='projectmembermodel',
+            index=models.Index(fields=['user', '-project_created_at', '-project'], name='member_user_project_idx'),
+        ),
+    ]
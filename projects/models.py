@@ -1,3 +1,3 @@
-from projects.infrastructure.models import ProjectModel, ProjectMemberModel
+from projects.infrastructure.models import ProjectModel, ProjectMemberModel, TaskModel
 
-__all__ = ["ProjectModel", "ProjectMemberModel"]
+__all__ = ["ProjectModel", "ProjectMemberModel", "TaskModel"]
@@ -0,0 +1,20 @@
+import base64
+import json
+import uuid
+from datetime import datetime
+
+
+def encode_cursor(created_at: datetime, project_id) -> str:
+    """Curseur opaque représentant la position (created_at, id) d'un projet."""
+    payload = json.dumps({"created_at": created_at.isoformat(), "id": str(project_id)})
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, uuid.UUID]:
+    """Inverse de encode_cursor ; lève ValueError si le curseur est invalide."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(payload["created_at"]), uuid.UUID(payload["id"])
+    except (TypeError, KeyError, ValueError, UnicodeDecodeError) as e:
+        raise ValueError("Curseur de pagination invalide.") from e
@@ -1,5 +1,29 @@
 from rest_framework import serializers
+from projects.presentation.pagination import decode_cursor
+
+# Nombre maximal de projets acceptés par requête de création groupée
+MAX_BULK_PROJECTS = 1000
+
+# Taille de page par défaut et maximale pour la liste des projets
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
 
 class ProjectCreateSerializer(serializers.Serializer):
     name = serializers.CharField(max_length=191)
     description = serializers.CharField(allow_blank=True, required=False)
+
+
+class ProjectBulkCreateSerializer(serializers.Serializer):
+    projects = ProjectCreateSerializer(many=True, allow_empty=False, max_length=MAX_BULK_PROJECTS)
+
+
+class ProjectListQuerySerializer(serializers.Serializer):
+    cursor = serializers.CharField(required=False)
+    limit = serializers.IntegerField(required=False, min_value=1, max_value=MAX_PAGE_SIZE, default=DEFAULT_PAGE_SIZE)
+
+    def validate_cursor(self, value):
+        try:
+            return decode_cursor(value)
+        except ValueError as e:
+            raise serializers.ValidationError(str(e))
@@ -0,0 +1,11 @@
+from rest_framework import serializers
+from projects.domain.entities import Task
+
+
+class TaskCreateSerializer(serializers.Serializer):
+    title = serializers.CharField(max_length=191)
+    description = serializers.CharField(allow_blank=True, required=False, default="")
+    status = serializers.ChoiceField(choices=Task.Status.COLUMNS, required=False, default=Task.Status.TODO)
+    priority = serializers.ChoiceField(choices=Task.Priority.ALL, required=False, default=Task.Priority.MEDIUM)
+    # Identifiant du membre du projet (ProjectMember), pas de l'utilisateur
+    assignee_id = serializers.UUIDField(required=False, allow_null=True, default=None)
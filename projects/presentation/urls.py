@@ -1,6 +1,14 @@
 from django.urls import path
-from .views.project_views import ProjectCreateView
+from .views.project_views import ProjectListCreateView, ProjectBulkCreateView, ProjectDetailView, ProjectExportView
+from .views.async_project_views import AsyncProjectListCreateView
+from .views.task_views import ProjectBoardView, TaskCreateView
 
 urlpatterns = [
-    path("", ProjectCreateView.as_view(), name="project-create"),
+    path("", ProjectListCreateView.as_view(), name="project-list-create"),
+    path("bulk/", ProjectBulkCreateView.as_view(), name="project-bulk-create"),
+    path("async/", AsyncProjectListCreateView.as_view(), name="async-project-list-create"),
+    path("export/", ProjectExportView.as_view(), name="project-export"),
+    path("<uuid:project_id>/", ProjectDetailView.as_view(), name="project-detail"),
+    path("<uuid:project_id>/board/", ProjectBoardView.as_view(), name="project-board"),
+    path("<uuid:project_id>/tasks/", TaskCreateView.as_view(), name="task-create"),
 ]
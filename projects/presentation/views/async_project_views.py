@@ -0,0 +1,80 @@
+from django.http import JsonResponse
+from rest_framework import status
+from rest_framework.utils.urls import replace_query_param
+from core.async_views import AsyncAPIView, parse_json
+from core.conditional import conditional_response, make_etag, set_validators
+from projects.presentation.pagination import encode_cursor
+from projects.presentation.serializers.project_serializers import (
+    ProjectCreateSerializer,
+    ProjectListQuerySerializer,
+)
+from projects.presentation.views.project_views import get_project_service, serialize_project
+from users.infrastructure.services.jwt_authentication import CachedJWTAuthentication
+
+
+class AsyncProjectListCreateView(AsyncAPIView):
+    """
+    Variante asynchrone de ProjectListCreateView, à servir via core/asgi.py :
+    authentification, cache et base de données passent par les API asynchrones.
+    GET : projets de l'utilisateur, paginés par curseur. POST : création d'un projet.
+    """
+    authentication_class = CachedJWTAuthentication
+
+    async def get(self, request):
+        query = ProjectListQuerySerializer(data=request.GET)
+        if not query.is_valid():
+            return JsonResponse(query.errors, status=status.HTTP_400_BAD_REQUEST)
+        limit = query.validated_data["limit"]
+
+        project_service = get_project_service()
+        count, last_modified = await project_service.aget_user_projects_version(request.user.id)
+        etag = make_etag("projects", request.user.id, count, last_modified, limit, request.GET.get("cursor"))
+        not_modified = conditional_response(request, etag, last_modified)
+        if not_modified is not None:
+            return not_modified
+
+        projects = await project_service.alist_user_projects(
+            user_id=request.user.id,
+            limit=limit + 1,
+            after=query.validated_data.get("cursor"),
+        )
+
+        next_url = None
+        if len(projects) > limit:
+            projects = projects[:limit]
+            last = projects[-1]
+            next_url = replace_query_param(
+                request.build_absolute_uri(), "cursor", encode_cursor(last.created_at, last.id)
+            )
+
+        response = JsonResponse({
+            "next": next_url,
+            "results": [serialize_project(project) for project in projects],
+        }, status=status.HTTP_200_OK)
+        return set_validators(response, etag, last_modified)
+
+    async def post(self, request):
+        data = parse_json(request)
+        if data is None:
+            return JsonResponse({"error": "JSON invalide."}, status=status.HTTP_400_BAD_REQUEST)
+
+        serializer = ProjectCreateSerializer(data=data)
+        if not serializer.is_valid():
+            return JsonResponse(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            project_service = get_project_service()
+            project = await project_service.acreate_project(
+                name=serializer.validated_data["name"],
+                description=serializer.validated_data.get("description", ""),
+                owner_id=request.user.id
+            )
+            return JsonResponse({
+                "id": project.id,
+                "name": project.name,
+                "description": project.description,
+                "owner_id": project.owner_id,
+                "created_at": project.created_at,
+            }, status=status.HTTP_201_CREATED)
+        except ValueError as e:
+            return JsonResponse({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
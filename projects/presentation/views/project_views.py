@@ -1,21 +1,81 @@
+from django.http import StreamingHttpResponse
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated
-from projects.presentation.serializers.project_serializers import ProjectCreateSerializer
-from projects.application.services.project_service import ProjectService
-from projects.infrastructure.repositories.project_repository import ProjectRepository
-from users.infrastructure.repositories.user_repository import UserRepository
+from rest_framework.utils.urls import replace_query_param
+from core.conditional import conditional_response, make_etag, set_validators
+from projects.presentation.pagination import encode_cursor
+from projects.presentation.renderers import CSVRenderer, NDJSONRenderer
+from projects.infrastructure.services.project_export import CONTENT_TYPES, stream_export
+from projects.presentation.serializers.project_serializers import (
+    ProjectCreateSerializer,
+    ProjectBulkCreateSerializer,
+    ProjectListQuerySerializer,
+)
+from projects.application.services.project_service import (
+    BulkProjectValidationError,
+    ProjectNotFoundError,
+)
+from core.container import container
 
-# Injection de dépendances
+# Injection de dépendances : service construit une fois par processus (core/container.py)
 def get_project_service():
-    project_repository = ProjectRepository()
-    user_repository = UserRepository()
-    return ProjectService(project_repository, user_repository)
+    return container.resolve("project_service")
 
-class ProjectCreateView(APIView):
+def serialize_project(project):
+    return {
+        "id": project.id,
+        "name": project.name,
+        "description": project.description,
+        "owner_id": project.owner_id,
+        "created_at": project.created_at,
+        "updated_at": project.updated_at,
+    }
+
+
+class ProjectListCreateView(APIView):
+    """
+    GET : projets de l'utilisateur (propriétaire ou membre), paginés par curseur.
+    POST : création d'un projet.
+    """
     permission_classes = [IsAuthenticated]
 
+    def get(self, request):
+        query = ProjectListQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        limit = query.validated_data["limit"]
+
+        project_service = get_project_service()
+        # Requête conditionnelle : un agrégat (nombre, max(updated_at)) suffit à
+        # savoir si la page a changé, avant toute lecture des projets
+        count, last_modified = project_service.get_user_projects_version(request.user.id)
+        etag = make_etag("projects", request.user.id, count, last_modified, limit, request.query_params.get("cursor"))
+        not_modified = conditional_response(request, etag, last_modified)
+        if not_modified is not None:
+            return not_modified
+
+        # Un élément de plus pour savoir s'il existe une page suivante
+        projects = project_service.list_user_projects(
+            user_id=request.user.id,
+            limit=limit + 1,
+            after=query.validated_data.get("cursor"),
+        )
+
+        next_url = None
+        if len(projects) > limit:
+            projects = projects[:limit]
+            last = projects[-1]
+            next_url = replace_query_param(
+                request.build_absolute_uri(), "cursor", encode_cursor(last.created_at, last.id)
+            )
+
+        response = Response({
+            "next": next_url,
+            "results": [serialize_project(project) for project in projects],
+        }, status=status.HTTP_200_OK)
+        return set_validators(response, etag, last_modified)
+
     def post(self, request):
         serializer = ProjectCreateSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
@@ -39,3 +99,84 @@ class ProjectCreateView(APIView):
             return Response(response_data, status=status.HTTP_201_CREATED)
         except ValueError as e:
             return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+
+class ProjectDetailView(APIView):
+    """
+    GET : un projet dont l'utilisateur est membre, avec ETag / Last-Modified.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, project_id):
+        project_service = get_project_service()
+        try:
+            # Seule la date de modification est lue pour répondre 304
+            last_modified = project_service.get_project_version(project_id, request.user.id)
+            etag = make_etag("project", project_id, last_modified.isoformat())
+            not_modified = conditional_response(request, etag, last_modified)
+            if not_modified is not None:
+                return not_modified
+
+            project = project_service.get_project(project_id, request.user.id)
+        except ProjectNotFoundError as e:
+            return Response({"error": str(e)}, status=status.HTTP_404_NOT_FOUND)
+
+        response = Response(serialize_project(project), status=status.HTTP_200_OK)
+        return set_validators(response, etag, last_modified)
+
+
+class ProjectExportView(APIView):
+    """
+    GET ?format=ndjson|csv[&gzip=1] : export des projets et de leurs membres, une
+    ligne par (projet, membre). Tous les projets pour le personnel, sinon ceux de
+    l'utilisateur. La réponse est diffusée au fil de la lecture en base.
+    """
+    permission_classes = [IsAuthenticated]
+    renderer_classes = [NDJSONRenderer, CSVRenderer]
+
+    def get(self, request):
+        export_format = request.accepted_renderer.format
+        compress = request.query_params.get("gzip") in ("1", "true")
+
+        project_service = get_project_service()
+        rows = project_service.iter_export_rows(request.user.id, include_all=request.user.is_staff)
+
+        response = StreamingHttpResponse(
+            stream_export(rows, export_format, compress), content_type=CONTENT_TYPES[export_format]
+        )
+        response["Content-Disposition"] = f'attachment; filename="projects.{export_format}"'
+        if compress:
+            response["Content-Encoding"] = "gzip"
+        return response
+
+
+class ProjectBulkCreateView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        serializer = ProjectBulkCreateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        try:
+            project_service = get_project_service()
+            projects = project_service.create_projects_bulk(
+                projects_data=serializer.validated_data["projects"],
+                owner_id=request.user.id
+            )
+            response_data = {
+                "projects": [
+                    {
+                        "id": project.id,
+                        "name": project.name,
+                        "description": project.description,
+                        "owner_id": project.owner_id,
+                        "created_at": project.created_at,
+                    }
+                    for project in projects
+                ]
+            }
+            return Response(response_data, status=status.HTTP_201_CREATED)
+        except BulkProjectValidationError as e:
+            return Response({"error": str(e), "errors": e.errors}, status=status.HTTP_400_BAD_REQUEST)
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,75 @@
+from rest_framework.response import Response
+from rest_framework import status
+from rest_framework.views import APIView
+from rest_framework.permissions import IsAuthenticated
+from projects.presentation.serializers.task_serializers import TaskCreateSerializer
+from projects.application.services.project_service import ProjectNotFoundError
+from core.container import container
+
+# Injection de dépendances : service construit une fois par processus (core/container.py)
+def get_task_service():
+    return container.resolve("task_service")
+
+
+def serialize_task(task):
+    assignee = task.assignee
+    return {
+        "id": task.id,
+        "title": task.title,
+        "description": task.description,
+        "status": task.status,
+        "priority": task.priority,
+        "position": task.position,
+        "assignee_id": task.assignee_id,
+        # Détails de l'assigné, présents quand ils ont été lus avec la tâche (tableau)
+        "assignee": {
+            "user_id": assignee.user_id,
+            "full_name": assignee.full_name,
+            "email": assignee.email,
+        } if assignee else None,
+        "created_at": task.created_at,
+        "updated_at": task.updated_at,
+    }
+
+
+class ProjectBoardView(APIView):
+    """
+    GET : tableau Kanban du projet, les tâches regroupées par colonne de statut.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, project_id):
+        try:
+            task_service = get_task_service()
+            board = task_service.get_board(project_id=project_id, user_id=request.user.id)
+        except ProjectNotFoundError as e:
+            return Response({"error": str(e)}, status=status.HTTP_404_NOT_FOUND)
+
+        return Response({
+            "project_id": project_id,
+            "columns": [
+                {"status": column, "tasks": [serialize_task(task) for task in tasks]}
+                for column, tasks in board.items()
+            ],
+        }, status=status.HTTP_200_OK)
+
+
+class TaskCreateView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, project_id):
+        serializer = TaskCreateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        try:
+            task_service = get_task_service()
+            task = task_service.create_task(
+                project_id=project_id,
+                user_id=request.user.id,
+                **serializer.validated_data,
+            )
+            return Response(serialize_task(task), status=status.HTTP_201_CREATED)
+        except ProjectNotFoundError as e:
+            return Response({"error": str(e)}, status=status.HTTP_404_NOT_FOUND)
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,36 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from projects.infrastructure.models import ProjectModel, ProjectMemberModel
+from projects.infrastructure.mappers import ProjectMemberMapper
+from projects.infrastructure.repositories.cached_project_repository import (
+    invalidate_member,
+    invalidate_project,
+    remember_member,
+)
+
+
+@receiver(post_save, sender=ProjectModel)
+def add_owner_membership(sender, instance, created, raw=False, **kwargs):
+    """
+    Le propriétaire d'un nouveau projet en devient membre ADMIN, quel que soit le
+    chemin de création (service, admin, ORM) : la liste des projets d'un
+    utilisateur ne lit que ses adhésions. bulk_create n'envoie pas ce signal :
+    create_projects_bulk crée les adhésions lui-même.
+    """
+    if created and not raw:
+        member = ProjectMemberModel.objects.create(
+            project=instance, user_id=instance.owner_id, role=ProjectMemberModel.Role.ADMIN
+        )
+        remember_member(ProjectMemberMapper.to_entity(member))
+
+
+@receiver(post_save, sender=ProjectModel)
+@receiver(post_delete, sender=ProjectModel)
+def invalidate_project_cache(sender, instance, **kwargs):
+    invalidate_project(instance.pk)
+
+
+@receiver(post_save, sender=ProjectMemberModel)
+@receiver(post_delete, sender=ProjectMemberModel)
+def invalidate_member_cache(sender, instance, **kwargs):
+    invalidate_member(instance.project_id, instance.user_id)
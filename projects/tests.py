@@ -1,3 +1,974 @@
-from django.test import TestCase
+import csv
+import gzip
+import io
+import json
+import os
+import pstats
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+import tracemalloc
+import uuid
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from core import metrics
+from core.entity_cache import EntityCache
+from core.identity_map import identity_map_scope
+from core.profiling import make_profiling_token
+from projects.domain.entities import Project, ProjectMember, Task, TaskAssignee
+from projects.infrastructure.mappers import ProjectMapper, ProjectMemberMapper
+from projects.infrastructure.models import ProjectModel, ProjectMemberModel, TaskModel
+from projects.infrastructure.repositories.cached_project_repository import CachedProjectRepository
+from projects.infrastructure.repositories.project_repository import ProjectRepository
+from projects.infrastructure.services.project_export import EXPORT_COLUMNS, stream_export
+from projects.presentation.serializers.project_serializers import MAX_BULK_PROJECTS
+from users.infrastructure.models.user_model import UserModel
+from users.infrastructure.services.jwt_authentication import clear_user_cache
+
+
+class ProjectQueryBudgetTests(TestCase):
+    def setUp(self):
+        clear_user_cache()
+        self.user = UserModel.objects.create_user(
+            email="owner@example.com", password="motdepasse123", full_name="Owner"
+        )
+        self.client = APIClient()
+        access = RefreshToken.for_user(self.user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+
+    def test_create_project_query_budget(self):
+        # Authentification JWT + insertion du projet + insertion du membre admin.
+        # Le propriétaire est servi par la carte d'identité (request.user).
+        with self.assertNumQueries(3):
+            response = self.client.post("/api/projects/", {"name": "Projet Alpha"}, format="json")
+        self.assertEqual(response.status_code, 201)
+        self.assertTrue(
+            ProjectMemberModel.objects.filter(
+                project_id=response.data["id"], user=self.user, role=ProjectMemberModel.Role.ADMIN
+            ).exists()
+        )
+
+    def test_create_project_skips_auth_query_when_user_is_cached(self):
+        self.client.post("/api/projects/", {"name": "Projet Alpha"}, format="json")
+        # Utilisateur servi par le cache d'authentification : insertions seulement
+        with self.assertNumQueries(2):
+            response = self.client.post("/api/projects/", {"name": "Projet Beta"}, format="json")
+        self.assertEqual(response.status_code, 201)
+
+
+class ProjectBulkCreateTests(TestCase):
+    def setUp(self):
+        clear_user_cache()
+        self.user = UserModel.objects.create_user(
+            email="owner@example.com", password="motdepasse123", full_name="Owner"
+        )
+        self.client = APIClient()
+        access = RefreshToken.for_user(self.user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+
+    def payload(self, count):
+        return {"projects": [{"name": f"Projet {i}", "description": f"Lot {i}"} for i in range(count)]}
+
+    def test_bulk_create_query_budget_is_constant(self):
+        # Authentification + SAVEPOINT + 2 insertions groupées + RELEASE SAVEPOINT
+        with self.assertNumQueries(5):
+            response = self.client.post("/api/projects/bulk/", self.payload(50), format="json")
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(ProjectModel.objects.filter(owner=self.user).count(), 50)
+        self.assertEqual(ProjectMemberModel.objects.filter(user=self.user).count(), 50)
+
+    def test_query_count_does_not_grow_with_the_batch(self):
+        counts = []
+        for size in (2, 100):
+            clear_user_cache()
+            with CaptureQueriesContext(connection) as captured:
+                response = self.client.post("/api/projects/bulk/", self.payload(size), format="json")
+            self.assertEqual(response.status_code, 201)
+            counts.append(len(captured))
+        self.assertEqual(counts[0], counts[1])
+
+    def test_owner_becomes_admin_of_every_project(self):
+        response = self.client.post("/api/projects/bulk/", self.payload(3), format="json")
+
+        ids = [project["id"] for project in response.data["projects"]]
+        self.assertEqual([project["name"] for project in response.data["projects"]], ["Projet 0", "Projet 1", "Projet 2"])
+        roles = ProjectMemberModel.objects.filter(project_id__in=ids, user=self.user).values_list("role", flat=True)
+        self.assertEqual(list(roles), [ProjectMemberModel.Role.ADMIN] * 3)
+
+    def test_bulk_create_reports_errors_per_item_and_writes_nothing(self):
+        payload = {"projects": [{"name": "Projet valide"}, {"name": "ab"}, {"name": "Autre projet"}, {"name": "x"}]}
+        response = self.client.post("/api/projects/bulk/", payload, format="json")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual([error["index"] for error in response.data["errors"]], [1, 3])
+        self.assertTrue(all(error["error"] for error in response.data["errors"]))
+        self.assertFalse(ProjectModel.objects.exists())
+        self.assertFalse(ProjectMemberModel.objects.exists())
+
+    def test_empty_or_oversized_batch_is_rejected(self):
+        self.assertEqual(self.client.post("/api/projects/bulk/", {"projects": []}, format="json").status_code, 400)
+        response = self.client.post("/api/projects/bulk/", self.payload(MAX_BULK_PROJECTS + 1), format="json")
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(ProjectModel.objects.exists())
+
+
+class ProjectListTests(TestCase):
+    def setUp(self):
+        clear_user_cache()
+        self.user = UserModel.objects.create_user(
+            email="owner@example.com", password="motdepasse123", full_name="Owner"
+        )
+        other = UserModel.objects.create_user(
+            email="other@example.com", password="motdepasse123", full_name="Other"
+        )
+        self.client = APIClient()
+        access = RefreshToken.for_user(self.user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+
+        owned = [ProjectModel.objects.create(name=f"Projet {i}", owner=self.user) for i in range(12)]
+        shared = [ProjectModel.objects.create(name=f"Partagé {i}", owner=other) for i in range(3)]
+        ProjectModel.objects.create(name="Projet étranger", owner=other)
+        for project in shared:
+            ProjectMemberModel.objects.create(project=project, user=self.user)
+        self.expected_ids = [
+            str(project.id)
+            for project in sorted(owned + shared, key=lambda p: (p.created_at, p.id), reverse=True)
+        ]
+
+    def test_keyset_pagination_walks_all_projects_once(self):
+        seen = []
+        url = "/api/projects/?limit=4"
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            seen.extend(str(project["id"]) for project in response.data["results"])
+            url = response.data["next"]
+        self.assertEqual(seen, self.expected_ids)
+
+    def test_project_created_outside_the_service_is_listed_for_its_owner(self):
+        project = ProjectModel.objects.create(name="Projet ORM", owner=self.user)
+
+        member = ProjectMemberModel.objects.get(project=project, user=self.user)
+        self.assertEqual(member.role, ProjectMemberModel.Role.ADMIN)
+        response = self.client.get("/api/projects/?limit=1")
+        self.assertEqual(str(response.data["results"][0]["id"]), str(project.id))
+
+    def test_each_page_costs_a_version_check_and_a_single_read(self):
+        first = self.client.get("/api/projects/?limit=4")
+        # Agrégat de version (ETag) + lecture de la page
+        with self.assertNumQueries(2):
+            self.client.get(first.data["next"])
+
+    def test_unchanged_list_answers_304_after_the_version_check_only(self):
+        first = self.client.get("/api/projects/?limit=4")
+        etag = first["ETag"]
+        self.assertIn("private", first["Cache-Control"])
+
+        with self.assertNumQueries(1):
+            response = self.client.get("/api/projects/?limit=4", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+
+        # Autre page, autre représentation
+        response = self.client.get("/api/projects/?limit=5", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+        ProjectModel.objects.create(name="Nouveau projet", owner=self.user)
+        response = self.client.get("/api/projects/?limit=4", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_invalid_cursor_is_rejected(self):
+        response = self.client.get("/api/projects/?cursor=n'importe-quoi")
+        self.assertEqual(response.status_code, 400)
+
+    def test_page_query_is_served_by_the_membership_index(self):
+        last = ProjectModel.objects.get(id=self.expected_ids[3])
+        page = ProjectRepository()._user_projects_page(self.user.id, 5, (last.created_at, last.id))
+        plan = page.explain()
+        self.assertIn("member_user_project_idx", plan)
+        # Ni tri en mémoire ni parcours de la table des projets
+        self.assertNotIn("TEMP B-TREE", plan)
+        self.assertNotIn("SCAN", plan)
+
+    def test_page_cost_does_not_depend_on_the_number_of_projects(self):
+        other = UserModel.objects.get(email="other@example.com")
+        projects = ProjectModel.objects.bulk_create(
+            ProjectModel(name=f"Volume {i}", owner=self.user) for i in range(1500)
+        )
+        ProjectMemberModel.objects.bulk_create(
+            [ProjectMemberModel(project=project, user=self.user, role="ADMIN") for project in projects]
+            + [ProjectMemberModel(project=project, user=other) for project in projects[:500]]
+        )
+        first = self.client.get("/api/projects/?limit=20")
+        self.assertEqual(len(first.data["results"]), 20)
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.get(first.data["next"])
+        self.assertEqual(len(captured), 2)
+        self.assertEqual(len(response.data["results"]), 20)
+
+
+class BulkMapperTests(TestCase):
+    def setUp(self):
+        self.owner = UserModel.objects.create_user(
+            email="owner@example.com", password="motdepasse123", full_name="Owner"
+        )
+        member = UserModel.objects.create_user(
+            email="member@example.com", password="motdepasse123", full_name="Member"
+        )
+        projects = ProjectModel.objects.bulk_create(
+            ProjectModel(name=f"Projet {i}", description="" if i % 2 else f"Description {i}", owner=self.owner)
+            for i in range(20)
+        )
+        ProjectMemberModel.objects.bulk_create(
+            [ProjectMemberModel(project=project, user=self.owner, role="ADMIN") for project in projects]
+            + [ProjectMemberModel(project=project, user=member) for project in projects[:5]]
+        )
+
+    @staticmethod
+    def fields(entity):
+        return {field: getattr(entity, field) for field in type(entity).__slots__}
+
+    def assertSameEntities(self, mapper, queryset):
+        with self.assertNumQueries(1):
+            bulk = list(mapper.to_entities(queryset, chunk_size=7))
+        with self.assertNumQueries(1):
+            single = [mapper.to_entity(model) for model in queryset]
+        self.assertEqual(len(bulk), queryset.count())
+        self.assertEqual([self.fields(entity) for entity in bulk], [self.fields(entity) for entity in single])
+        self.assertEqual([type(entity) for entity in bulk], [type(entity) for entity in single])
+
+    def test_project_to_entities_matches_to_entity(self):
+        self.assertSameEntities(ProjectMapper, ProjectModel.objects.order_by("id"))
+
+    def test_member_to_entities_matches_to_entity(self):
+        self.assertSameEntities(ProjectMemberMapper, ProjectMemberModel.objects.order_by("id"))
+
+    def test_from_row_matches_to_entity(self):
+        project_model = ProjectModel.objects.first()
+        self.assertEqual(
+            self.fields(ProjectMapper.from_row(ProjectMapper.to_row(project_model))),
+            self.fields(ProjectMapper.to_entity(project_model)),
+        )
+
+
+def all_subclasses(cls):
+    for subclass in cls.__subclasses__():
+        yield subclass
+        yield from all_subclasses(subclass)
+
+
+class SlottedEntityTests(TestCase):
+    ENTITIES = (Project, ProjectMember, Task, TaskAssignee)
+
+    def instances(self):
+        project = Project(id=None, name="Projet Alpha", description="", owner_id=uuid.uuid4())
+        return (
+            project,
+            ProjectMember(id=None, project_id=project.id, user_id=uuid.uuid4(), role=ProjectMember.Role.ADMIN),
+            Task(id=None, project_id=project.id, title="Tâche"),
+            TaskAssignee(uuid.uuid4(), uuid.uuid4(), "Alice Martin", "alice@example.com"),
+        )
+
+    def test_entities_and_their_subclasses_have_no_instance_dict(self):
+        for entity in self.ENTITIES:
+            for cls in (entity, *all_subclasses(entity)):
+                with self.subTest(cls=cls.__qualname__):
+                    # Chaque classe de la hiérarchie doit déclarer __slots__, sinon __dict__ revient
+                    for base in cls.__mro__[:-1]:
+                        self.assertIn("__slots__", vars(base), base.__qualname__)
+        for instance in self.instances():
+            with self.subTest(entity=type(instance).__name__):
+                self.assertFalse(hasattr(instance, "__dict__"))
+                with self.assertRaises(AttributeError):
+                    instance.attribut_inconnu = 1
+
+    def test_validation_is_unchanged(self):
+        with self.assertRaises(ValueError):
+            Project(id=None, name="ab", description="", owner_id=uuid.uuid4())
+        with self.assertRaises(ValueError):
+            ProjectMember(id=None, project_id=uuid.uuid4(), user_id=uuid.uuid4(), role="OWNER")
+        project = Project(id=None, name="  Projet Alpha  ", description="", owner_id=uuid.uuid4())
+        self.assertEqual(project.name, "Projet Alpha")
+        self.assertEqual(project.created_at, project.updated_at)
+
+    def test_equality_and_hash_follow_the_id(self):
+        project_id = uuid.uuid4()
+        first = Project(id=project_id, name="Projet Alpha", description="", owner_id=uuid.uuid4())
+        trusted = Project.from_trusted(project_id, "Autre nom", "", uuid.uuid4(), None, None)
+        self.assertEqual(first, trusted)
+        self.assertEqual(hash(first), hash(trusted))
+        self.assertEqual(len({first, trusted}), 1)
+        self.assertNotEqual(first, Project(id=None, name="Projet Alpha", description="", owner_id=first.owner_id))
+
+        member_id = uuid.uuid4()
+        member = ProjectMember(id=member_id, project_id=project_id, user_id=uuid.uuid4(), role="MEMBER")
+        self.assertEqual(member, ProjectMember.from_trusted(member_id, project_id, member.user_id, "ADMIN", None))
+        self.assertEqual(len({member, ProjectMember.from_trusted(member_id, None, None, "MEMBER", None)}), 1)
+        self.assertNotEqual(member, first)
+
+
+class ProjectDetailTests(TestCase):
+    def setUp(self):
+        clear_user_cache()
+        self.user = UserModel.objects.create_user(
+            email="owner@example.com", password="motdepasse123", full_name="Owner"
+        )
+        self.client = APIClient()
+        access = RefreshToken.for_user(self.user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+        self.project = ProjectModel.objects.create(name="Projet Alpha", owner=self.user)
+        self.url = f"/api/projects/{self.project.id}/"
+
+    def test_detail_emits_validators(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["name"], "Projet Alpha")
+        self.assertTrue(response["ETag"].startswith('"'))
+        self.assertIn("Last-Modified", response)
+
+    def test_if_none_match_answers_304_from_updated_at_only(self):
+        etag = self.client.get(self.url)["ETag"]
+
+        # Utilisateur servi par le cache d'authentification : seule updated_at est lue
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b"")
+
+        self.project.name = "Projet Alpha renommé"
+        self.project.save()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["name"], "Projet Alpha renommé")
+
+    def test_if_modified_since(self):
+        last_modified = self.client.get(self.url)["Last-Modified"]
+        response = self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, 304)
+
+    def test_non_members_get_404(self):
+        stranger = UserModel.objects.create_user(email="stranger@example.com", password=None, full_name="Stranger")
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {RefreshToken.for_user(stranger).access_token}")
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+
+
+class ProjectBoardTests(TestCase):
+    def setUp(self):
+        clear_user_cache()
+        self.user = UserModel.objects.create_user(
+            email="owner@example.com", password="motdepasse123", full_name="Owner"
+        )
+        self.client = APIClient()
+        access = RefreshToken.for_user(self.user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+
+        self.project = ProjectModel.objects.create(name="Projet Kanban", owner=self.user)
+        self.owner_member = ProjectMemberModel.objects.get(project=self.project, user=self.user)
+        self.board_url = f"/api/projects/{self.project.id}/board/"
+        self.tasks_url = f"/api/projects/{self.project.id}/tasks/"
+
+    def _add_tasks(self, count):
+        for i in range(count):
+            user = UserModel.objects.create_user(
+                email=f"assignee{UserModel.objects.count()}@example.com", password=None, full_name=f"Assigné {i}"
+            )
+            member = ProjectMemberModel.objects.create(project=self.project, user=user)
+            TaskModel.objects.create(
+                project=self.project,
+                title=f"Tâche {i}",
+                status=TaskModel.Status.choices[i % 4][0],
+                position=i,
+                assignee=member,
+            )
+
+    def test_tasks_are_appended_to_their_column(self):
+        for title, task_status in [("A", "TODO"), ("B", "DONE"), ("C", "TODO")]:
+            response = self.client.post(self.tasks_url, {"title": title, "status": task_status}, format="json")
+            self.assertEqual(response.status_code, 201)
+
+        response = self.client.get(self.board_url)
+
+        self.assertEqual(response.status_code, 200)
+        columns = {column["status"]: column["tasks"] for column in response.data["columns"]}
+        self.assertEqual(list(columns), ["TODO", "IN_PROGRESS", "IN_REVIEW", "DONE"])
+        self.assertEqual([(task["title"], task["position"]) for task in columns["TODO"]], [("A", 0), ("C", 1)])
+        self.assertEqual([task["title"] for task in columns["DONE"]], ["B"])
+
+    def test_board_costs_the_same_queries_whatever_its_size(self):
+        self._add_tasks(4)
+        self.client.get(self.board_url)
+        # Utilisateur et adhésion servis par les caches :
+        # toutes les tâches et leurs assignés en une requête
+        with self.assertNumQueries(1):
+            response = self.client.get(self.board_url)
+        self.assertEqual(sum(len(column["tasks"]) for column in response.data["columns"]), 4)
+
+        self._add_tasks(40)
+        with self.assertNumQueries(1):
+            response = self.client.get(self.board_url)
+        task = response.data["columns"][0]["tasks"][0]
+        self.assertEqual(task["assignee"]["full_name"], "Assigné 0")
+
+    def test_assignee_must_be_a_project_member(self):
+        other_project = ProjectModel.objects.create(name="Autre projet", owner=self.user)
+        outsider = ProjectMemberModel.objects.get(project=other_project, user=self.user)
+
+        response = self.client.post(self.tasks_url, {"title": "A", "assignee_id": str(outsider.id)}, format="json")
+        self.assertEqual(response.status_code, 400)
+
+        response = self.client.post(
+            self.tasks_url, {"title": "A", "assignee_id": str(self.owner_member.id)}, format="json"
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data["assignee_id"], self.owner_member.id)
+
+    def test_board_is_hidden_from_non_members(self):
+        stranger = UserModel.objects.create_user(email="stranger@example.com", password=None, full_name="Stranger")
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {RefreshToken.for_user(stranger).access_token}")
+
+        self.assertEqual(self.client.get(self.board_url).status_code, 404)
+        self.assertEqual(self.client.post(self.tasks_url, {"title": "A"}, format="json").status_code, 404)
+
+
+class AdminChangelistQueryTests(TestCase):
+    """Le nombre de requêtes des listes de l'admin ne dépend pas du nombre de lignes."""
+
+    def setUp(self):
+        self.admin = UserModel.objects.create_superuser(
+            email="admin@example.com", password="motdepasse123", full_name="Admin"
+        )
+        self.client.force_login(self.admin)
+
+    def _add_memberships(self, count):
+        for _ in range(count):
+            user = UserModel.objects.create_user(
+                email=f"member{UserModel.objects.count()}@example.com", password=None, full_name="Membre"
+            )
+            project = ProjectModel.objects.create(name="Projet admin", owner=user)
+            member = ProjectMemberModel.objects.get(project=project, user=user)
+            TaskModel.objects.create(project=project, title="Tâche admin", assignee=member)
+
+    def _count_queries(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def assertConstantQueries(self, url):
+        self._add_memberships(2)
+        few = self._count_queries(url)
+        self._add_memberships(20)
+        self.assertEqual(self._count_queries(url), few)
+
+    def test_project_member_changelist(self):
+        self.assertConstantQueries("/admin/projects/projectmembermodel/")
+
+    def test_project_changelist(self):
+        self.assertConstantQueries("/admin/projects/projectmodel/")
+
+    def test_user_changelist(self):
+        self.assertConstantQueries("/admin/users/usermodel/")
+
+    def test_task_changelist(self):
+        self.assertConstantQueries("/admin/projects/taskmodel/")
+
+
+class ProjectAdminOwnerTests(TestCase):
+    """Les projets créés ou réattribués dans l'admin apparaissent dans la liste de leur propriétaire."""
+
+    def setUp(self):
+        admin = UserModel.objects.create_superuser(
+            email="admin@example.com", password="motdepasse123", full_name="Admin"
+        )
+        self.client.force_login(admin)
+        self.owner = UserModel.objects.create_user(email="owner@example.com", password=None, full_name="Owner")
+        self.successor = UserModel.objects.create_user(email="next@example.com", password=None, full_name="Next")
+
+    def listed_ids(self, user):
+        client = APIClient()
+        client.force_authenticate(user)
+        return [str(project["id"]) for project in client.get("/api/projects/").data["results"]]
+
+    def test_project_added_in_admin_is_listed_for_its_owner(self):
+        response = self.client.post(
+            "/admin/projects/projectmodel/add/", {"name": "Projet admin", "description": "", "owner": self.owner.pk}
+        )
+        self.assertEqual(response.status_code, 302)
+
+        project = ProjectModel.objects.get(name="Projet admin")
+        self.assertEqual(self.listed_ids(self.owner), [str(project.id)])
+
+    def test_new_owner_becomes_admin_member(self):
+        project = ProjectModel.objects.create(name="Projet cédé", owner=self.owner)
+        ProjectMemberModel.objects.create(project=project, user=self.successor)
+
+        response = self.client.post(
+            f"/admin/projects/projectmodel/{project.pk}/change/",
+            {"name": "Projet cédé", "description": "", "owner": self.successor.pk},
+        )
+        self.assertEqual(response.status_code, 302)
+
+        member = ProjectMemberModel.objects.get(project=project, user=self.successor)
+        self.assertEqual(member.role, ProjectMemberModel.Role.ADMIN)
+        self.assertEqual(self.listed_ids(self.successor), [str(project.id)])
+
+
+class CachedProjectRepositoryTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = UserModel.objects.create_user(email="owner@example.com", password=None, full_name="Owner")
+        self.project = ProjectModel.objects.create(name="Projet Alpha", owner=self.user)
+        self.repository = CachedProjectRepository()
+
+    def find(self, project_id):
+        # Une requête HTTP = une carte d'identité : on en ouvre une par lecture
+        with identity_map_scope():
+            return self.repository.find_by_id(project_id)
+
+    def test_reads_are_served_from_the_cache_until_the_project_is_saved(self):
+        with self.assertNumQueries(1):
+            self.find(self.project.id)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.find(self.project.id).name, "Projet Alpha")
+
+        self.project.name = "Projet Alpha renommé"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.project.save()
+
+        with self.assertNumQueries(1):
+            self.assertEqual(self.find(self.project.id).name, "Projet Alpha renommé")
+
+    def test_membership_is_cached_and_invalidated_by_new_members(self):
+        other = UserModel.objects.create_user(email="other@example.com", password=None, full_name="Other")
+        self.assertIsNone(self.repository.find_member(self.project.id, other.id))
+        with self.assertNumQueries(0):
+            self.assertIsNone(self.repository.find_member(self.project.id, other.id))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            ProjectMemberModel.objects.create(project=self.project, user=other)
+
+        self.assertIsNotNone(self.repository.find_member(self.project.id, other.id))
+
+    def test_created_projects_are_written_through_on_commit(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = client.post("/api/projects/", {"name": "Projet Beta"}, format="json")
+
+        with self.assertNumQueries(0):
+            self.assertEqual(self.find(response.data["id"]).name, "Projet Beta")
+            self.assertIsNotNone(self.repository.find_member(response.data["id"], self.user.id))
+
+    def test_hits_and_misses_are_counted(self):
+        requests = metrics.REGISTRY.get("entity_cache_requests_total")
+        hits = requests.value(cache="project", result="hit")
+        misses = requests.value(cache="project", result="miss")
+
+        self.find(self.project.id)
+        self.find(self.project.id)
+
+        self.assertEqual(requests.value(cache="project", result="miss"), misses + 1)
+        self.assertEqual(requests.value(cache="project", result="hit"), hits + 1)
+
+
+class EntityCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_concurrent_misses_load_the_key_once(self):
+        entity_cache = EntityCache("stampede")
+        calls = []
+
+        def loader():
+            calls.append(1)
+            time.sleep(0.1)
+            return ("valeur",)
+
+        barrier = threading.Barrier(8)
+        results = []
+
+        def read():
+            barrier.wait()
+            results.append(entity_cache.get_or_load(entity_cache.key("chaude"), loader))
+
+        threads = [threading.Thread(target=read) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, [("valeur",)] * 8)
+
+    def test_missing_rows_are_remembered(self):
+        entity_cache = EntityCache("absent")
+        calls = []
+        loader = lambda: calls.append(1)
+        self.assertIsNone(entity_cache.get_or_load(entity_cache.key(1), loader))
+        self.assertIsNone(entity_cache.get_or_load(entity_cache.key(1), loader))
+        self.assertEqual(len(calls), 1)
+
+    def test_file_based_backend(self):
+        with tempfile.TemporaryDirectory() as directory:
+            backend = {"BACKEND": "django.core.cache.backends.filebased.FileBasedCache", "LOCATION": directory}
+            with override_settings(CACHES={"default": backend}):
+                user = UserModel.objects.create_user(email="file@example.com", password=None, full_name="File")
+                project = ProjectModel.objects.create(name="Projet fichier", owner=user)
+                repository = CachedProjectRepository()
+                with identity_map_scope():
+                    repository.find_by_id(project.id)
+                with identity_map_scope(), self.assertNumQueries(0):
+                    self.assertEqual(repository.find_by_id(project.id).created_at, project.created_at)
+
+
+class ProjectExportTests(TestCase):
+    def setUp(self):
+        self.user = UserModel.objects.create_user(email="owner@example.com", password=None, full_name="Owner")
+        self.other = UserModel.objects.create_user(email="other@example.com", password=None, full_name="Other")
+        for i in range(3):
+            project = ProjectModel.objects.create(name=f"Projet {i}", owner=self.user)
+            ProjectMemberModel.objects.create(project=project, user=self.other)
+        ProjectModel.objects.create(name="Projet étranger", owner=self.other)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def export(self, query):
+        response = self.client.get(f"/api/projects/export/?{query}")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return response, b"".join(response.streaming_content)
+
+    def test_ndjson_export_is_limited_to_the_user_projects(self):
+        response, content = self.export("format=ndjson")
+
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        rows = [json.loads(line) for line in content.decode().splitlines()]
+        self.assertEqual(len(rows), 6)
+        self.assertEqual(set(rows[0]), set(EXPORT_COLUMNS))
+        self.assertNotIn("Projet étranger", {row["project_name"] for row in rows})
+        self.assertEqual({row["member_email"] for row in rows}, {"owner@example.com", "other@example.com"})
+
+    def test_staff_export_everything(self):
+        self.user.is_staff = True
+        self.user.save()
+        _, content = self.export("format=ndjson")
+        self.assertEqual(len(content.decode().splitlines()), 7)
+
+    def test_csv_and_gzip(self):
+        response, content = self.export("format=csv")
+        self.assertTrue(response["Content-Type"].startswith("text/csv"))
+        rows = list(csv.reader(io.StringIO(content.decode())))
+        self.assertEqual(tuple(rows[0]), EXPORT_COLUMNS)
+        self.assertEqual(len(rows), 7)
+
+        response, compressed = self.export("format=csv&gzip=1")
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(gzip.decompress(compressed), content)
+
+    def test_management_command(self):
+        with tempfile.NamedTemporaryFile(suffix=".ndjson.gz") as output:
+            call_command("export_projects", "--gzip", "--output", output.name, stderr=io.StringIO())
+            lines = gzip.decompress(output.read()).decode().splitlines()
+        self.assertEqual(len(lines), 7)
+
+    def test_memory_does_not_grow_with_the_number_of_rows(self):
+        def peak_for(project_count):
+            ProjectModel.objects.bulk_create(
+                ProjectModel(name=f"Projet {i}", description="x" * 200, owner=self.other) for i in range(project_count)
+            )
+            rows = ProjectRepository().iter_export_rows(chunk_size=200)
+            tracemalloc.start()
+            for _ in stream_export(rows, "ndjson"):
+                pass
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            return peak
+
+        small = peak_for(1000)
+        large = peak_for(7000)  # 8 000 projets au total
+        # Mémoire bornée par un lot, pas par le nombre de lignes (le RSS sur un
+        # million de lignes est mesuré par benchmarks/export_memory.py)
+        self.assertLess(large, small * 1.5)
+
+
+class AsyncProjectViewTests(TestCase):
+    def setUp(self):
+        clear_user_cache()
+        cache.clear()
+        self.user = UserModel.objects.create_user(
+            email="async@example.com", password="motdepasse123", full_name="Async"
+        )
+        access = RefreshToken.for_user(self.user).access_token
+        self.headers = {"Authorization": f"Bearer {access}"}
+        for i in range(3):
+            ProjectModel.objects.create(name=f"Projet {i}", owner=self.user)
+
+    async def test_create_project_adds_owner_as_admin(self):
+        response = await self.async_client.post(
+            "/api/projects/async/", {"name": "Asynchrone", "description": "ASGI"},
+            content_type="application/json", headers=self.headers,
+        )
+        self.assertEqual(response.status_code, 201)
+        member = await ProjectMemberModel.objects.aget(project_id=response.json()["id"])
+        self.assertEqual(member.user_id, self.user.id)
+        self.assertEqual(member.role, ProjectMemberModel.Role.ADMIN)
+
+    async def test_list_matches_sync_view(self):
+        response = await self.async_client.get("/api/projects/async/?limit=2", headers=self.headers)
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertEqual(len(body["results"]), 2)
+        self.assertIsNotNone(body["next"])
+
+        sync_body = await sync_to_async(self._sync_list)()
+        self.assertEqual(
+            [project["id"] for project in body["results"]],
+            [str(project["id"]) for project in sync_body["results"]],
+        )
+
+        response = await self.async_client.get(
+            "/api/projects/async/?limit=2", headers={**self.headers, "If-None-Match": response["ETag"]}
+        )
+        self.assertEqual(response.status_code, 304)
+
+    def _sync_list(self):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=self.headers["Authorization"])
+        return client.get("/api/projects/?limit=2").data
+
+    async def test_requires_valid_token(self):
+        response = await self.async_client.get("/api/projects/async/")
+        self.assertEqual(response.status_code, 401)
+        self.assertIn("WWW-Authenticate", response)
+
+        response = await self.async_client.get("/api/projects/async/", headers={"Authorization": "Bearer invalide"})
+        self.assertEqual(response.status_code, 401)
+
+    async def test_async_ping(self):
+        response = await self.async_client.get("/api/async/ping/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {"message": "pong 🏓 test"})
+
+
+class RequestMetricsTests(TestCase):
+    def setUp(self):
+        clear_user_cache()
+        self.user = UserModel.objects.create_user(
+            email="metrics@example.com", password="motdepasse123", full_name="Metrics"
+        )
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {RefreshToken.for_user(self.user).access_token}")
+        ProjectModel.objects.create(name="Projet mesuré", owner=self.user)
+
+    def test_records_view_histograms_and_server_timing(self):
+        durations = metrics.REGISTRY.get("http_request_duration_seconds")
+        queries = metrics.REGISTRY.get("http_request_db_queries")
+        labels = {"view": "ProjectListCreateView", "method": "GET", "status": "200"}
+        requests_before = durations.count(**labels)
+        queries_before = queries.sum(view="ProjectListCreateView")
+
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.get("/api/projects/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertRegex(response["Server-Timing"], rf'^app;dur=[\d.]+, db;dur=[\d.]+;desc="{len(captured)} queries"$')
+        self.assertEqual(durations.count(**labels), requests_before + 1)
+        self.assertEqual(queries.sum(view="ProjectListCreateView"), queries_before + len(captured))
+
+    def test_unresolved_requests_share_one_label(self):
+        durations = metrics.REGISTRY.get("http_request_duration_seconds")
+        labels = {"view": "unresolved", "method": "GET", "status": "404"}
+        before = durations.count(**labels)
+        self.client.get("/api/inexistant/")
+        self.assertEqual(durations.count(**labels), before + 1)
+
+    def test_metrics_endpoint_exposes_histograms(self):
+        self.client.get("/api/projects/")
+        body = self.client.get("/metrics").content.decode()
+        self.assertIn("# TYPE http_request_duration_seconds histogram", body)
+        self.assertIn(
+            'http_request_duration_seconds_bucket{view="ProjectListCreateView",method="GET",status="200",le="+Inf"}', body
+        )
+        self.assertIn('http_request_db_queries_count{view="ProjectListCreateView"}', body)
+
+    def test_histogram_is_thread_safe(self):
+        histogram = metrics.Histogram("test_seconds", "Test.", labelnames=("view",))
+
+        def observe():
+            for i in range(1000):
+                histogram.observe(i / 1000, view="v")
+
+        threads = [threading.Thread(target=observe) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(histogram.count(view="v"), 8000)
+        self.assertAlmostEqual(histogram.sum(view="v"), 8 * sum(i / 1000 for i in range(1000)))
+
+    def test_merges_workers_from_shared_directory(self):
+        def worker_registry(requests, in_flight):
+            registry = metrics.Registry()
+            registry.register(metrics.Counter("jobs_total", "Jobs.")).inc(requests)
+            registry.register(metrics.Gauge("jobs_in_flight", "En cours.")).set(in_flight)
+            registry.register(metrics.Histogram("job_seconds", "Durée.")).observe(0.2)
+            return registry
+
+        def write_worker(directory, pid, registry):
+            data = metrics.snapshot(registry)
+            data["pid"] = pid
+            with open(f"{directory}/metrics-{pid}.json", "w") as file:
+                json.dump(data, file)
+
+        dead = subprocess.Popen(["true"])
+        dead.wait()
+        with tempfile.TemporaryDirectory() as directory:
+            write_worker(directory, os.getppid(), worker_registry(5, 2))
+            write_worker(directory, dead.pid, worker_registry(1, 7))
+
+            merged = metrics.merged_registry(directory, registry=worker_registry(3, 1))
+
+        self.assertEqual(merged.get("jobs_total").value(), 9)
+        # La jauge d'un worker terminé n'est plus comptée, ses compteurs si
+        self.assertEqual(merged.get("jobs_in_flight").value(), 3)
+        self.assertEqual(merged.get("job_seconds").count(), 3)
+
+    def test_metrics_endpoint_does_not_count_own_worker_twice(self):
+        with tempfile.TemporaryDirectory() as directory:
+            with override_settings(METRICS={**settings.METRICS, "MULTIPROCESS_DIR": directory, "FLUSH_INTERVAL": 0}):
+                self.client.get("/api/projects/")
+                self.assertTrue(os.path.exists(f"{directory}/metrics-{os.getpid()}.json"))
+                body = self.client.get("/metrics").content.decode()
+
+        expected = metrics.REGISTRY.get("http_request_duration_seconds").count(
+            view="ProjectListCreateView", method="GET", status="200"
+        )
+        self.assertIn(
+            f'http_request_duration_seconds_count{{view="ProjectListCreateView",method="GET",status="200"}} {expected}\n',
+            body,
+        )
+
+    def metrics_access(self, **config):
+        return override_settings(METRICS={**settings.METRICS, **config})
+
+    def test_metrics_endpoint_is_refused_outside_allowed_ips(self):
+        with self.metrics_access(ALLOWED_IPS=("127.0.0.1", "10.0.0.0/8"), TOKEN=None):
+            self.assertEqual(Client().get("/metrics", REMOTE_ADDR="10.1.2.3").status_code, 200)
+            response = Client().get("/metrics", REMOTE_ADDR="203.0.113.7")
+        self.assertEqual(response.status_code, 403)
+        self.assertNotIn(b"http_request_duration_seconds", response.content)
+
+    def test_metrics_endpoint_accepts_bearer_token_from_any_address(self):
+        with self.metrics_access(ALLOWED_IPS=(), TOKEN="jeton-metriques"):
+            allowed = Client().get(
+                "/metrics", REMOTE_ADDR="203.0.113.7", HTTP_AUTHORIZATION="Bearer jeton-metriques"
+            )
+            wrong = Client().get("/metrics", REMOTE_ADDR="203.0.113.7", HTTP_AUTHORIZATION="Bearer autre")
+            missing = Client().get("/metrics", REMOTE_ADDR="127.0.0.1")
+        self.assertEqual(allowed.status_code, 200)
+        self.assertEqual(wrong.status_code, 403)
+        self.assertEqual(missing.status_code, 403)
+
+
+class ProfilingMiddlewareTests(TestCase):
+    def setUp(self):
+        clear_user_cache()
+        self.user = UserModel.objects.create_user(
+            email="profil@example.com", password="motdepasse123", full_name="Profil"
+        )
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {RefreshToken.for_user(self.user).access_token}")
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory, ignore_errors=True)
+
+    def profiling(self, **config):
+        return override_settings(PROFILING={"DIRECTORY": self.directory, **config})
+
+    def profiles(self):
+        return sorted(os.listdir(self.directory))
+
+    def test_signed_header_writes_prof_and_collapsed_files(self):
+        with self.profiling():
+            response = self.client.post(
+                "/api/projects/", {"name": "Projet profilé"}, format="json",
+                HTTP_X_PROFILE_REQUEST=make_profiling_token(),
+            )
+
+        self.assertEqual(response.status_code, 201)
+        profile_id = response["X-Profile-Id"]
+        self.assertIn("-POST-ProjectListCreateView-", profile_id)
+        self.assertEqual(self.profiles(), [f"{profile_id}.collapsed", f"{profile_id}.prof"])
+        stats = pstats.Stats(os.path.join(self.directory, f"{profile_id}.prof"))
+        self.assertTrue(any(function == "create_project" for _, _, function in stats.stats))
+
+    def test_sampling_mode_writes_only_collapsed_stacks(self):
+        with self.profiling(SAMPLE_INTERVAL=0.0001):
+            response = self.client.get("/api/projects/", HTTP_X_PROFILE_REQUEST=make_profiling_token("sampling"))
+
+        self.assertEqual(self.profiles(), [f"{response['X-Profile-Id']}.collapsed"])
+        with open(os.path.join(self.directory, self.profiles()[0])) as file:
+            for line in file:
+                stack, count = line.rsplit(" ", 1)
+                self.assertIn(";", stack)
+                self.assertGreater(int(count), 0)
+
+    def test_invalid_header_is_ignored(self):
+        with self.profiling(), self.assertLogs("core.profiling", "WARNING"):
+            response = self.client.get("/api/projects/", HTTP_X_PROFILE_REQUEST=make_profiling_token() + "x")
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("X-Profile-Id", response)
+        self.assertEqual(self.profiles(), [])
+
+    def test_query_flag_is_reserved_to_staff(self):
+        with self.profiling():
+            response = self.client.get("/api/projects/?profile=1")
+            self.assertNotIn("X-Profile-Id", response)
+
+            UserModel.objects.filter(pk=self.user.pk).update(is_staff=True)
+            clear_user_cache()
+            response = self.client.get("/api/projects/?profile=1")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("X-Profile-Id", response)
+        self.assertEqual(len(self.profiles()), 2)
+
+    def test_background_sampling_is_limited_to_configured_views(self):
+        with self.profiling(SAMPLE_RATE=1.0, SAMPLE_VIEWS=("LoginView",)):
+            self.client.get("/api/projects/")
+            self.assertEqual(self.profiles(), [])
+            response = self.client.post(
+                "/api/login/", {"email": "profil@example.com", "password": "motdepasse123"}, format="json"
+            )
+
+        self.assertEqual(response.status_code, 200)
+        # Profil discret : pas d'en-tête sur le trafic échantillonné
+        self.assertNotIn("X-Profile-Id", response)
+        self.assertEqual(len(self.profiles()), 1)
+        self.assertIn("-POST-LoginView-", self.profiles()[0])
+
+    def test_keeps_only_most_recent_profiles(self):
+        with self.profiling(MAX_FILES=2):
+            for _ in range(3):
+                self.client.get("/api/projects/", HTTP_X_PROFILE_REQUEST=make_profiling_token())
+        self.assertEqual(len([name for name in self.profiles() if name.endswith(".collapsed")]), 2)
+        self.assertEqual(len([name for name in self.profiles() if name.endswith(".prof")]), 2)
+
+    def test_sampler_is_stopped_when_profiler_fails_to_start(self):
+        with self.profiling(), mock.patch("cProfile.Profile.enable", side_effect=ValueError("profileur déjà actif")):
+            with self.assertRaises(ValueError):
+                self.client.get("/api/projects/", HTTP_X_PROFILE_REQUEST=make_profiling_token())
+
+        self.assertFalse(any(thread.name == "stack-sampler" for thread in threading.enumerate()))
+        self.assertEqual(self.profiles(), [])
@@ -1,23 +1,26 @@
 from users.domain.entities.user import User
-from users.infrastructure.repositories.user_repository import UserRepository
+from users.infrastructure.repositories.user_repository import EmailAlreadyExists, UserRepository
 from users.application.services.password_hasher import PasswordHasher
+from users.application.services.password_rehasher import PasswordRehasher
 from users.application.services.token_generator import TokenGenerator
 
+DUPLICATE_EMAIL_ERROR = "Un utilisateur avec cet email existe déjà."
+
 class AuthService:
     def __init__(
         self,
         user_repository: UserRepository,
         password_hasher: PasswordHasher,
         token_generator: TokenGenerator,
+        password_rehasher: PasswordRehasher | None = None,
     ):
         self.user_repository = user_repository
         self.password_hasher = password_hasher
         self.token_generator = token_generator
+        self.password_rehasher = password_rehasher
 
     def register_user(self, email, password, full_name):
-        if self.user_repository.exists_by_email(email):
-            raise ValueError("Un utilisateur avec cet email existe déjà.")
-
+        # Pas de vérification préalable : l'index unique sur l'email tranche, sans course
         password_hash = self.password_hasher.hash(password)
         user = User(
             id=None,
@@ -25,13 +28,59 @@ class AuthService:
             full_name=full_name,
             password_hash=password_hash
         )
-        return self.user_repository.create_user(user)
+        try:
+            return self.user_repository.create_user(user)
+        except EmailAlreadyExists as e:
+            raise ValueError(DUPLICATE_EMAIL_ERROR) from e
+
+    async def aregister_user(self, email, password, full_name):
+        """Version asynchrone de register_user."""
+        password_hash = await self.password_hasher.ahash(password)
+        user = User(
+            id=None,
+            email=email,
+            full_name=full_name,
+            password_hash=password_hash
+        )
+        try:
+            return await self.user_repository.acreate_user(user)
+        except EmailAlreadyExists as e:
+            raise ValueError(DUPLICATE_EMAIL_ERROR) from e
 
     def login_user(self, email, password):
-        user = self.user_repository.get_by_email(email)
-        if not user or not self.password_hasher.verify(user.password_hash, password):
+        # Les emails sont enregistrés en minuscules (User._validate_email)
+        user = self.user_repository.get_by_email(email.lower())
+        if not user:
+            # Même coût qu'une vérification : la durée ne révèle pas si le compte existe
+            self.password_hasher.hash(password)
+            raise ValueError("Identifiants invalides.")
+        if not self.password_hasher.verify(user.password_hash, password):
+            raise ValueError("Identifiants invalides.")
+
+        self._rehash_if_outdated(user, password)
+        return self._build_login_response(user)
+
+    async def alogin_user(self, email, password):
+        """Version asynchrone de login_user."""
+        user = await self.user_repository.aget_by_email(email.lower())
+        if not user:
+            await self.password_hasher.ahash(password)
+            raise ValueError("Identifiants invalides.")
+        if not await self.password_hasher.averify(user.password_hash, password):
             raise ValueError("Identifiants invalides.")
 
+        self._rehash_if_outdated(user, password)
+        return self._build_login_response(user)
+
+    def _rehash_if_outdated(self, user, password):
+        """
+        Seul moment où le mot de passe en clair est connu : un hash calculé avec
+        d'anciens paramètres est recalculé, en différé, avec les paramètres actuels.
+        """
+        if self.password_rehasher is not None and self.password_hasher.needs_rehash(user.password_hash):
+            self.password_rehasher.schedule(user, password)
+
+    def _build_login_response(self, user):
         tokens = self.token_generator.generate_tokens(user)
         return {
             "access": tokens["access"],
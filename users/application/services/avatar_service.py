@@ -0,0 +1,21 @@
+from users.domain.entities.user import User
+from users.infrastructure.repositories.user_repository import UserRepository
+from users.application.services.avatar_storage import AvatarStorage
+
+class AvatarService:
+    def __init__(self, user_repository: UserRepository, avatar_storage: AvatarStorage):
+        self.user_repository = user_repository
+        self.avatar_storage = avatar_storage
+
+    def update_avatar(self, user_id, uploaded_file) -> User:
+        """
+        Enregistre le nouvel avatar ; les miniatures sont produites en arrière-plan
+        et exposées par User.avatar_variants une fois prêtes.
+        """
+        extension = self.avatar_storage.validate(uploaded_file)
+        name, sha = self.avatar_storage.store(uploaded_file, extension)
+        user = self.user_repository.set_avatar(user_id, name)
+        if user is None:
+            raise ValueError("Utilisateur introuvable.")
+        self.avatar_storage.schedule_thumbnails(user.id, name, sha)
+        return user
@@ -0,0 +1,17 @@
+import abc
+
+class AvatarStorage(abc.ABC):
+    @abc.abstractmethod
+    def validate(self, uploaded_file) -> str:
+        """Valide l'image et retourne son extension ; lève ValueError si elle est refusée."""
+        ...
+
+    @abc.abstractmethod
+    def store(self, uploaded_file, extension: str) -> tuple[str, str]:
+        """Enregistre l'original et retourne (nom du fichier, hash du contenu)."""
+        ...
+
+    @abc.abstractmethod
+    def schedule_thumbnails(self, user_id, name: str, sha: str):
+        """Planifie la génération des miniatures hors de la requête."""
+        ...
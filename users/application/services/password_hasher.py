@@ -8,3 +8,15 @@ class PasswordHasher(abc.ABC):
     @abc.abstractmethod
     def verify(self, password_hash: str, password: str) -> bool:
         ...
+
+    def needs_rehash(self, password_hash: str) -> bool:
+        """Vrai si le hash doit être recalculé (algorithme ou coût dépassé) ; par défaut, jamais."""
+        return False
+
+    async def ahash(self, password: str) -> str:
+        """Version asynchrone ; par défaut, exécute hash() directement."""
+        return self.hash(password)
+
+    async def averify(self, password_hash: str, password: str) -> bool:
+        """Version asynchrone ; par défaut, exécute verify() directement."""
+        return self.verify(password_hash, password)
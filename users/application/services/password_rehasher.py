@@ -0,0 +1,11 @@
+import abc
+from users.domain.entities.user import User
+
+class PasswordRehasher(abc.ABC):
+    @abc.abstractmethod
+    def schedule(self, user: User, password: str):
+        """
+        Planifie, hors de la requête, le recalcul du hash de l'utilisateur avec
+        les paramètres actuels et son enregistrement.
+        """
+        ...
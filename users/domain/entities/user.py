@@ -5,26 +5,79 @@ class User:
     Entité représentant un utilisateur dans le domaine.
     Indépendante de tout framework.
     """
+    # Pas de __dict__ par instance : empreinte mémoire réduite pour les listes d'utilisateurs
+    __slots__ = (
+        "id", "email", "full_name", "password_hash", "_avatar", "_avatar_variants",
+        "is_active", "is_staff", "date_joined",
+    )
+
     def __init__(
         self,
         id,
         email,
         full_name,
         password_hash=None,  # Ne pas stocker le mot de passe en clair
-        avatar=None,
+        avatar=None,  # URL, ou fonction sans argument qui la calcule à la demande
         is_active=True,
         is_staff=False,
         date_joined=None,
+        avatar_variants=None,  # {taille: {format: URL}}, ou fonction qui le calcule
     ):
         self.id = id or uuid.uuid4()
         self.email = self._validate_email(email)
         self.full_name = self._validate_full_name(full_name)
         self.password_hash = password_hash
         self.avatar = avatar
+        self.avatar_variants = avatar_variants
         self.is_active = is_active
         self.is_staff = is_staff
         self.date_joined = date_joined
 
+    @classmethod
+    def from_trusted(
+        cls, id, email, full_name, password_hash, avatar, is_active, is_staff, date_joined, avatar_variants=None,
+    ):
+        """
+        Construit l'entité sans validation, à partir de données déjà valides
+        (lignes lues en base). Réservé aux chemins de lecture en masse.
+        """
+        user = cls.__new__(cls)
+        user.id = id
+        user.email = email
+        user.full_name = full_name
+        user.password_hash = password_hash
+        user.avatar = avatar
+        user.avatar_variants = avatar_variants
+        user.is_active = is_active
+        user.is_staff = is_staff
+        user.date_joined = date_joined
+        return user
+
+    @property
+    def avatar(self):
+        """
+        URL de l'avatar. Si elle a été fournie sous forme de fonction, celle-ci n'est
+        appelée qu'au premier accès et son résultat est conservé.
+        """
+        if callable(self._avatar):
+            self._avatar = self._avatar()
+        return self._avatar
+
+    @avatar.setter
+    def avatar(self, value):
+        self._avatar = value
+
+    @property
+    def avatar_variants(self):
+        """Miniatures de l'avatar ({taille: {format: URL}}), calculées au premier accès."""
+        if callable(self._avatar_variants):
+            self._avatar_variants = self._avatar_variants()
+        return self._avatar_variants or {}
+
+    @avatar_variants.setter
+    def avatar_variants(self, value):
+        self._avatar_variants = value
+
     def _validate_email(self, email):
         if not email or "@" not in email:
             raise ValueError("L'adresse email est invalide.")
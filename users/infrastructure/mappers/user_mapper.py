@@ -1,7 +1,17 @@
+from collections.abc import Iterator
+from django.db.models import QuerySet
 from users.domain.entities.user import User
 from users.infrastructure.models.user_model import UserModel
+from users.infrastructure.services.avatar_urls import lazy_avatar_url, lazy_avatar_variants
 
 class UserMapper:
+    # Colonnes lues par le chemin de lecture en masse, dans l'ordre de User.from_trusted
+    BULK_FIELDS = (
+        "id", "email", "full_name", "password", "avatar", "is_active", "is_staff", "date_joined", "avatar_hash",
+    )
+    # Colonnes stockées dans le cache partagé : tout sauf le hash du mot de passe
+    CACHE_FIELDS = tuple(field for field in BULK_FIELDS if field != "password")
+
     @staticmethod
     def to_entity(user_model: UserModel) -> User:
         """Convertit un UserModel (Django) en une entité User (domaine)."""
@@ -10,21 +20,78 @@ class UserMapper:
             email=user_model.email,
             full_name=user_model.full_name,
             password_hash=user_model.password,
-            avatar=user_model.avatar.url if user_model.avatar else None,
+            # URL résolue seulement si elle est lue (stockage distant, URL signées)
+            avatar=lazy_avatar_url(user_model.avatar.storage, user_model.avatar.name),
             is_active=user_model.is_active,
             is_staff=user_model.is_staff,
             date_joined=user_model.date_joined,
+            avatar_variants=lazy_avatar_variants(user_model.avatar.storage, user_model.avatar_hash),
         )
 
     @staticmethod
     def to_model(user_entity: User) -> UserModel:
         """Convertit une entité User (domaine) en un UserModel (Django)."""
-        return UserModel(
+        user_model = UserModel(
             id=user_entity.id,
             email=user_entity.email,
             full_name=user_entity.full_name,
             password=user_entity.password_hash,
             is_active=user_entity.is_active,
             is_staff=user_entity.is_staff,
-            date_joined=user_entity.date_joined,
         )
+        # Sans date, la valeur par défaut du modèle (timezone.now) s'applique
+        if user_entity.date_joined is not None:
+            user_model.date_joined = user_entity.date_joined
+        return user_model
+
+    @staticmethod
+    def to_row(user_model: UserModel) -> tuple:
+        """Colonnes BULK_FIELDS du modèle (valeurs stockées par le cache des repositories)."""
+        row = [getattr(user_model, field) for field in UserMapper.BULK_FIELDS]
+        # Nom du fichier plutôt que le FieldFile, comme values_list()
+        row[UserMapper.BULK_FIELDS.index("avatar")] = user_model.avatar.name or None
+        return tuple(row)
+
+    @staticmethod
+    def from_row(row: tuple, storage=None) -> User:
+        """Entité à partir d'une ligne BULK_FIELDS (values_list ou cache)."""
+        storage = storage or UserModel._meta.get_field("avatar").storage
+        id, email, full_name, password, avatar, is_active, is_staff, date_joined, avatar_hash = row
+        return User.from_trusted(
+            id,
+            email.lower(),
+            full_name,
+            password,
+            lazy_avatar_url(storage, avatar),
+            is_active,
+            is_staff,
+            date_joined,
+            lazy_avatar_variants(storage, avatar_hash),
+        )
+
+    @staticmethod
+    def to_cache_row(user_model: UserModel) -> tuple:
+        """Colonnes CACHE_FIELDS du modèle (sans le hash du mot de passe)."""
+        row = UserMapper.to_row(user_model)
+        index = UserMapper.BULK_FIELDS.index("password")
+        return row[:index] + row[index + 1:]
+
+    @staticmethod
+    def from_cache_row(row: tuple, storage=None) -> User:
+        """
+        Entité à partir d'une ligne CACHE_FIELDS ; son password_hash vaut None :
+        la vérification d'un mot de passe relit toujours la base.
+        """
+        index = UserMapper.BULK_FIELDS.index("password")
+        return UserMapper.from_row((*row[:index], None, *row[index:]), storage)
+
+    @staticmethod
+    def to_entities(queryset: QuerySet, chunk_size: int = 2000) -> Iterator[User]:
+        """
+        Convertit un QuerySet en entités sans instancier de UserModel ni revalider
+        les données : lecture par tuples (values_list) et par lots (iterator).
+        """
+        storage = UserModel._meta.get_field("avatar").storage
+        rows = queryset.values_list(*UserMapper.BULK_FIELDS).iterator(chunk_size=chunk_size)
+        for row in rows:
+            yield UserMapper.from_row(row, storage)
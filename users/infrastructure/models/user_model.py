@@ -29,6 +29,8 @@ class UserModel(AbstractBaseUser, PermissionsMixin):
     email = models.EmailField(unique=True, max_length=191)
     full_name = models.CharField(max_length=191)
     avatar = models.ImageField(upload_to="avatars/", null=True, blank=True)
+    # SHA-256 de l'avatar, renseigné une fois les miniatures générées
+    avatar_hash = models.CharField(max_length=64, blank=True, default="")
     is_active = models.BooleanField(default=True)
     is_staff = models.BooleanField(default=False)
     date_joined = models.DateTimeField(default=timezone.now)
@@ -0,0 +1,56 @@
+from core.identity_map import identity_map_get, identity_map_add
+from users.domain.entities.user import User
+from users.infrastructure.models.user_model import UserModel
+from users.infrastructure.mappers.user_mapper import UserMapper
+from users.infrastructure.repositories.user_repository import UserRepository
+from users.infrastructure.services.user_cache import CACHED_USER, user_cache
+
+
+class CachedUserRepository(UserRepository):
+    """
+    UserRepository dont get_by_id passe par le cache Django après la carte
+    d'identité. Les sauvegardes de UserModel invalident l'entrée (users/signals.py) ;
+    un queryset.update() doit appeler invalidate_user (services/user_cache.py).
+
+    Le cache, partagé, ne contient pas le hash du mot de passe : les entités qui
+    en viennent ont password_hash=None. Elles sont rangées à part dans la carte
+    d'identité (CACHED_USER) pour que UserRepository ne les serve jamais à la
+    connexion ni au changement de mot de passe.
+    """
+
+    def create_user(self, user_entity: User) -> User:
+        user = super().create_user(user_entity)
+        user_model = identity_map_get(UserModel, user.id)
+        user_cache.set_on_commit(user_cache.key(user.id), UserMapper.to_cache_row(user_model))
+        return user
+
+    def get_by_id(self, user_id) -> User | None:
+        user = identity_map_get(User, user_id) or identity_map_get(CACHED_USER, user_id)
+        if user is not None:
+            return user
+        user_model = identity_map_get(UserModel, user_id)
+        if user_model is not None:
+            return self._register(user_model)
+        row = user_cache.get_or_load(
+            user_cache.key(user_id),
+            lambda: UserModel.objects.filter(id=user_id).values_list(*UserMapper.CACHE_FIELDS).first(),
+        )
+        if row is None:
+            return None
+        return identity_map_add(CACHED_USER, user_id, UserMapper.from_cache_row(row))
+
+    async def aget_by_id(self, user_id) -> User | None:
+        user = identity_map_get(User, user_id) or identity_map_get(CACHED_USER, user_id)
+        if user is not None:
+            return user
+        user_model = identity_map_get(UserModel, user_id)
+        if user_model is not None:
+            return self._register(user_model)
+
+        async def load():
+            return await UserModel.objects.filter(id=user_id).values_list(*UserMapper.CACHE_FIELDS).afirst()
+
+        row = await user_cache.aget_or_load(user_cache.key(user_id), load)
+        if row is None:
+            return None
+        return identity_map_add(CACHED_USER, user_id, UserMapper.from_cache_row(row))
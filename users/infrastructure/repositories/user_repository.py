@@ -1,30 +1,79 @@
+from asgiref.sync import sync_to_async
+from django.db import IntegrityError, transaction
+from core.identity_map import identity_map_get, identity_map_add, identity_map_remove
 from users.domain.entities.user import User
 from users.infrastructure.models.user_model import UserModel
 from users.infrastructure.mappers.user_mapper import UserMapper
+from users.infrastructure.services.jwt_authentication import invalidate_cached_user
+from users.infrastructure.services.user_cache import invalidate_user
+
+class EmailAlreadyExists(Exception):
+    """Levée quand l'insertion viole l'unicité de UserModel.email."""
+
 
 class UserRepository:
     """
     Repository pour interagir avec les données des utilisateurs,
     en utilisant l'ORM Django (UserModel) et en retournant des entités User.
+    Les utilisateurs déjà chargés pendant la requête sont servis par la carte d'identité.
     """
 
     def create_user(self, user_entity: User) -> User:
         """
         Crée un nouvel utilisateur dans la base de données.
+        L'insertion est optimiste : un email déjà pris lève EmailAlreadyExists.
         """
+        # Le mot de passe est déjà hashé par le service (UserMapper recopie password_hash)
         user_model = UserMapper.to_model(user_entity)
-        # Le mot de passe doit être hashé avant d'être sauvegardé
-        user_model.set_password(user_entity.password_hash)
-        user_model.save()
-        return UserMapper.to_entity(user_model)
+        try:
+            # Point de sauvegarde : l'échec n'invalide pas une transaction englobante
+            with transaction.atomic():
+                user_model.save(force_insert=True)
+        except IntegrityError as e:
+            if self._is_email_conflict(user_model):
+                raise EmailAlreadyExists(user_model.email) from e
+            raise
+        return self._register(user_model)
+
+    async def acreate_user(self, user_entity: User) -> User:
+        """
+        Version asynchrone de create_user.
+        """
+        # transaction.atomic n'a pas d'équivalent asynchrone : l'insertion passe
+        # par le thread qui porte la connexion de l'ORM synchrone
+        return await sync_to_async(self.create_user)(user_entity)
+
+    @staticmethod
+    def _is_email_conflict(user_model: UserModel) -> bool:
+        """
+        Distingue un email déjà pris d'une autre violation de contrainte.
+        Requête exécutée uniquement sur le chemin d'erreur.
+        """
+        return UserModel.objects.filter(email__iexact=user_model.email).exists()
 
     def get_by_email(self, email: str) -> User | None:
         """
         Récupère un utilisateur par son email.
         """
+        user_id = identity_map_get((UserModel, "email"), email)
+        if user_id is not None:
+            return self.get_by_id(user_id)
         try:
             user_model = UserModel.objects.get(email=email)
-            return UserMapper.to_entity(user_model)
+            return self._register(user_model)
+        except UserModel.DoesNotExist:
+            return None
+
+    async def aget_by_email(self, email: str) -> User | None:
+        """
+        Version asynchrone de get_by_email.
+        """
+        user_id = identity_map_get((UserModel, "email"), email)
+        if user_id is not None:
+            return identity_map_get(User, user_id)
+        try:
+            user_model = await UserModel.objects.aget(email=email)
+            return self._register(user_model)
         except UserModel.DoesNotExist:
             return None
 
@@ -32,14 +81,82 @@ class UserRepository:
         """
         Vérifie si un utilisateur existe avec l'email donné.
         """
+        if identity_map_get((UserModel, "email"), email) is not None:
+            return True
         return UserModel.objects.filter(email=email).exists()
 
+    async def aexists_by_email(self, email: str) -> bool:
+        """
+        Version asynchrone de exists_by_email.
+        """
+        if identity_map_get((UserModel, "email"), email) is not None:
+            return True
+        return await UserModel.objects.filter(email=email).aexists()
+
     def get_by_id(self, user_id) -> User | None:
         """
         Récupère un utilisateur par son ID.
         """
+        user = identity_map_get(User, user_id)
+        if user is not None:
+            return user
+        user_model = identity_map_get(UserModel, user_id)
+        if user_model is not None:
+            return self._register(user_model)
         try:
             user_model = UserModel.objects.get(id=user_id)
-            return UserMapper.to_entity(user_model)
+            return self._register(user_model)
         except UserModel.DoesNotExist:
             return None
+
+    async def aget_by_id(self, user_id) -> User | None:
+        """
+        Version asynchrone de get_by_id.
+        """
+        user = identity_map_get(User, user_id)
+        if user is not None:
+            return user
+        user_model = identity_map_get(UserModel, user_id)
+        if user_model is not None:
+            return self._register(user_model)
+        try:
+            user_model = await UserModel.objects.aget(id=user_id)
+            return self._register(user_model)
+        except UserModel.DoesNotExist:
+            return None
+
+    def set_avatar(self, user_id, name: str) -> User | None:
+        """
+        Remplace l'avatar de l'utilisateur. Le hash est remis à zéro :
+        les miniatures de l'ancien avatar ne sont plus exposées.
+        """
+        updated = UserModel.objects.filter(id=user_id).update(avatar=name, avatar_hash="")
+        if not updated:
+            return None
+        # update() ne déclenche pas post_save
+        invalidate_cached_user(user_id)
+        invalidate_user(user_id)
+        identity_map_remove(User, user_id)
+        identity_map_remove(UserModel, user_id)
+        return self.get_by_id(user_id)
+
+    def update_password_hash(self, user_id, old_hash: str, new_hash: str) -> bool:
+        """
+        Remplace le hash du mot de passe s'il vaut toujours `old_hash` : un
+        changement de mot de passe survenu entre-temps n'est pas écrasé.
+        """
+        updated = UserModel.objects.filter(id=user_id, password=old_hash).update(password=new_hash)
+        if updated:
+            # update() ne déclenche pas post_save
+            invalidate_cached_user(user_id)
+            invalidate_user(user_id)
+        return bool(updated)
+
+    def _register(self, user_model: UserModel) -> User:
+        """
+        Enregistre le modèle et son entité dans la carte d'identité de la requête.
+        """
+        user = UserMapper.to_entity(user_model)
+        identity_map_add(UserModel, user_model.pk, user_model)
+        identity_map_add((UserModel, "email"), user_model.email, user_model.pk)
+        return identity_map_add(User, user_model.pk, user)
@@ -0,0 +1,203 @@
+import hashlib
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.uploadhandler import SkipFile, TemporaryFileUploadHandler
+from django.db import close_old_connections, transaction
+from PIL import Image, UnidentifiedImageError
+from users.application.services.avatar_storage import AvatarStorage
+from users.infrastructure.models.user_model import UserModel
+from users.infrastructure.services.jwt_authentication import invalidate_cached_user
+from users.infrastructure.services.user_cache import invalidate_user
+
+logger = logging.getLogger(__name__)
+
+_config = getattr(settings, "AVATAR_PIPELINE", {})
+MAX_UPLOAD_SIZE = _config.get("MAX_UPLOAD_SIZE", 5 * 1024 * 1024)
+MAX_DIMENSION = _config.get("MAX_DIMENSION", 4096)
+MIN_DIMENSION = _config.get("MIN_DIMENSION", 32)
+THUMBNAIL_SIZES = tuple(_config.get("THUMBNAIL_SIZES", (40, 80, 160)))
+THUMBNAIL_FORMATS = tuple(_config.get("THUMBNAIL_FORMATS", ("webp", "jpeg")))
+
+ALLOWED_FORMATS = {"JPEG": "jpg", "PNG": "png", "WEBP": "webp", "GIF": "gif"}
+_PIL_FORMATS = {"webp": "WEBP", "jpeg": "JPEG"}
+
+
+class LimitedTemporaryFileUploadHandler(TemporaryFileUploadHandler):
+    """
+    Écrit l'upload sur disque au fil de l'eau (jamais entièrement en mémoire)
+    et abandonne le fichier dès qu'il dépasse MAX_UPLOAD_SIZE.
+    """
+
+    def __init__(self, request=None, max_size=MAX_UPLOAD_SIZE):
+        super().__init__(request)
+        self.max_size = max_size
+        self.too_large = False
+
+    def receive_data_chunk(self, raw_data, start):
+        if start + len(raw_data) > self.max_size:
+            self.too_large = True
+            raise SkipFile()
+        return super().receive_data_chunk(raw_data, start)
+
+
+def inspect_image(uploaded_file) -> str:
+    """
+    Valide l'image à partir de son seul en-tête (les pixels ne sont pas décodés)
+    et retourne l'extension à utiliser. Lève ValueError si l'image est refusée.
+    """
+    try:
+        with Image.open(uploaded_file) as image:
+            image_format, (width, height) = image.format, image.size
+    except (UnidentifiedImageError, OSError) as e:
+        raise ValueError("Le fichier n'est pas une image valide.") from e
+    finally:
+        uploaded_file.seek(0)
+
+    if image_format not in ALLOWED_FORMATS:
+        raise ValueError("Format d'image non supporté (JPEG, PNG, WEBP ou GIF).")
+    if max(width, height) > MAX_DIMENSION:
+        raise ValueError(f"L'image ne doit pas dépasser {MAX_DIMENSION}x{MAX_DIMENSION} pixels.")
+    if min(width, height) < MIN_DIMENSION:
+        raise ValueError(f"L'image doit mesurer au moins {MIN_DIMENSION}x{MIN_DIMENSION} pixels.")
+    return ALLOWED_FORMATS[image_format]
+
+
+def content_hash(uploaded_file) -> str:
+    """SHA-256 du fichier, calculé par morceaux."""
+    digest = hashlib.sha256()
+    for chunk in uploaded_file.chunks():
+        digest.update(chunk)
+    uploaded_file.seek(0)
+    return digest.hexdigest()
+
+
+def _storage():
+    return UserModel._meta.get_field("avatar").storage
+
+
+def store_original(uploaded_file, extension: str) -> tuple[str, str]:
+    """
+    Enregistre l'original sous un nom dérivé de son contenu (avatars/<sha256>.<ext>).
+    Un fichier identique déjà présent n'est pas réécrit.
+    """
+    sha = content_hash(uploaded_file)
+    name = f"avatars/{sha}.{extension}"
+    storage = _storage()
+    if not storage.exists(name):
+        name = storage.save(name, uploaded_file)
+    return name, sha
+
+
+def thumbnail_name(sha: str, size: int, image_format: str) -> str:
+    extension = "jpg" if image_format == "jpeg" else image_format
+    return f"avatars/thumbs/{sha}_{size}.{extension}"
+
+
+def generate_thumbnails(name: str, sha: str) -> list[str]:
+    """
+    Produit toutes les variantes (tailles x formats) de l'avatar.
+    L'original n'est décodé qu'une fois, en mode « draft » pour les JPEG
+    (décodage directement à une résolution réduite).
+    """
+    storage = _storage()
+    largest = max(THUMBNAIL_SIZES)
+    with storage.open(name, "rb") as original, Image.open(original) as image:
+        image.draft("RGB", (largest, largest))
+        image = image.convert("RGB")
+        image.thumbnail((largest, largest))
+
+        written = []
+        for size in sorted(THUMBNAIL_SIZES, reverse=True):
+            variant = image.copy()
+            variant.thumbnail((size, size))
+            for image_format in THUMBNAIL_FORMATS:
+                target = thumbnail_name(sha, size, image_format)
+                if storage.exists(target):
+                    continue
+                buffer = BytesIO()
+                variant.save(buffer, format=_PIL_FORMATS[image_format], quality=82, optimize=True)
+                storage.save(target, ContentFile(buffer.getvalue()))
+                written.append(target)
+    return written
+
+
+def process_avatar(user_id, name: str, sha: str):
+    """
+    Tâche de fond : génère les miniatures puis publie le hash de l'avatar,
+    à condition que l'utilisateur n'ait pas changé d'avatar entre-temps.
+    """
+    generate_thumbnails(name, sha)
+    updated = UserModel.objects.filter(id=user_id, avatar=name).update(avatar_hash=sha)
+    if updated:
+        # update() ne déclenche pas post_save
+        invalidate_cached_user(user_id)
+        invalidate_user(user_id)
+
+
+class AvatarProcessor:
+    """
+    Exécute process_avatar dans un pool de threads du processus, hors du cycle
+    de la requête. La commande `process_avatars` rattrape les avatars non traités
+    (redémarrage, erreur).
+    """
+
+    def __init__(self, max_workers=None):
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers or _config.get("WORKERS", min(2, os.cpu_count() or 1)),
+            thread_name_prefix="avatar-processing",
+        )
+
+    def schedule(self, user_id, name: str, sha: str):
+        return self._executor.submit(self._run, user_id, name, sha)
+
+    @staticmethod
+    def _run(user_id, name, sha):
+        close_old_connections()
+        try:
+            process_avatar(user_id, name, sha)
+        except Exception:
+            logger.exception("Échec du traitement de l'avatar %s", name)
+            raise
+        finally:
+            close_old_connections()
+
+
+_processor = None
+_processor_lock = threading.Lock()
+
+
+def get_avatar_processor() -> AvatarProcessor:
+    global _processor
+    if _processor is None:
+        with _processor_lock:
+            if _processor is None:
+                _processor = AvatarProcessor()
+    return _processor
+
+
+class DjangoAvatarStorage(AvatarStorage):
+    """
+    Implémentation de AvatarStorage sur le stockage de UserModel.avatar ;
+    les miniatures sont confiées à l'AvatarProcessor après le commit.
+    """
+
+    def __init__(self, processor: AvatarProcessor | None = None):
+        self.processor = processor
+
+    def validate(self, uploaded_file) -> str:
+        if uploaded_file.size > MAX_UPLOAD_SIZE:
+            raise ValueError(f"L'image ne doit pas dépasser {MAX_UPLOAD_SIZE // (1024 * 1024)} Mo.")
+        return inspect_image(uploaded_file)
+
+    def store(self, uploaded_file, extension: str) -> tuple[str, str]:
+        return store_original(uploaded_file, extension)
+
+    def schedule_thumbnails(self, user_id, name: str, sha: str):
+        processor = self.processor or get_avatar_processor()
+        transaction.on_commit(lambda: processor.schedule(user_id, name, sha))
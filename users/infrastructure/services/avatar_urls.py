@@ -0,0 +1,69 @@
+from functools import partial
+
+from django.conf import settings
+from core import metrics
+from core.lru_cache import LRUTTLCache
+from users.infrastructure.services.avatar_pipeline import THUMBNAIL_FORMATS, THUMBNAIL_SIZES, thumbnail_name
+
+_config = getattr(settings, "AVATAR_URL_CACHE", {})
+_url_cache = LRUTTLCache(maxsize=_config.get("MAX_SIZE", 10000), ttl=_config.get("TTL", 300))
+
+_storage_calls = metrics.counter("avatar_url_storage_calls_total", "Appels à storage.url() pour les avatars.")
+
+
+def _ttl_for(storage):
+    """
+    Durée de vie d'une URL en cache. Pour les URL signées (ex : django-storages S3,
+    `querystring_expire`), on expire l'entrée bien avant la signature.
+    """
+    expire = getattr(storage, "querystring_expire", None)
+    if getattr(storage, "querystring_auth", False) and expire:
+        return min(_url_cache.ttl, expire * 0.8)
+    return _url_cache.ttl
+
+
+def resolve_avatar_url(storage, name: str) -> str:
+    """URL d'un fichier, servie par le cache (clé : stockage + nom du fichier)."""
+    # Le stockage d'un champ vit aussi longtemps que le processus : son id est stable
+    key = (id(storage), name)
+    url = _url_cache.get(key)
+    if url is None:
+        _storage_calls.inc()
+        url = storage.url(name)
+        _url_cache.set(key, url, ttl=_ttl_for(storage))
+    return url
+
+
+def lazy_avatar_url(storage, name: str | None):
+    """
+    Retourne une fonction qui calcule l'URL au premier accès (voir User.avatar),
+    ou None s'il n'y a pas d'avatar. Aucun appel au stockage n'est fait ici.
+    """
+    if not name:
+        return None
+    return partial(resolve_avatar_url, storage, name)
+
+
+def resolve_avatar_variants(storage, sha: str) -> dict:
+    """URL des miniatures : {taille: {format: URL}}."""
+    return {
+        size: {
+            image_format: resolve_avatar_url(storage, thumbnail_name(sha, size, image_format))
+            for image_format in THUMBNAIL_FORMATS
+        }
+        for size in THUMBNAIL_SIZES
+    }
+
+
+def lazy_avatar_variants(storage, sha: str | None):
+    """
+    Comme lazy_avatar_url, pour les miniatures. `sha` n'est renseigné qu'une fois
+    les miniatures générées : sans lui, il n'y a pas de variantes.
+    """
+    if not sha:
+        return None
+    return partial(resolve_avatar_variants, storage, sha)
+
+
+def clear_avatar_url_cache():
+    _url_cache.clear()
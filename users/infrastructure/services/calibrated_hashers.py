@@ -0,0 +1,235 @@
+import hashlib
+import json
+import logging
+import os
+import statistics
+import threading
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth.hashers import PBKDF2PasswordHasher, ScryptPasswordHasher, must_update_salt
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+logger = logging.getLogger(__name__)
+
+# Bornes de scrypt : 2**14 est la valeur de Django, 2**18 représente 256 Mo par hachage (r=8)
+SCRYPT_MIN_WORK_FACTOR = 2**14
+SCRYPT_MAX_WORK_FACTOR = 2**18
+SCRYPT_BLOCK_SIZE = 8
+SCRYPT_PARALLELISM = 1
+
+
+def calibration_config() -> dict:
+    config = {
+        "TARGET_MS": 250,
+        "FILE": Path(settings.BASE_DIR) / "password_hash_calibration.json",
+        # Plancher de sécurité pour PBKDF2-SHA256, quelle que soit la machine ; jamais
+        # en dessous des itérations de Django (voir pbkdf2_floor)
+        "MIN_ITERATIONS": 1_000_000,
+        # Un hash n'est recalculé que si son coût est inférieur de plus de 20 % au coût calibré
+        "TOLERANCE": 0.2,
+    }
+    config.update(getattr(settings, "PASSWORD_HASH_CALIBRATION", {}))
+    return config
+
+
+# ---------------------------------------------------
+# Mesure
+# ---------------------------------------------------
+def _best_time(func, repeat=3) -> float:
+    """Meilleure durée de `repeat` exécutions : la moins perturbée par la machine."""
+    durations = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        durations.append(time.perf_counter() - started)
+    return min(durations)
+
+
+def pbkdf2_floor(min_iterations: int | None = None) -> int:
+    """
+    Plancher des itérations PBKDF2-SHA256 : MIN_ITERATIONS, et au moins la valeur
+    de Django, pour qu'un hash calibré ne soit jamais plus faible que celui de Django.
+    """
+    if min_iterations is None:
+        min_iterations = calibration_config()["MIN_ITERATIONS"]
+    return max(min_iterations, PBKDF2PasswordHasher.iterations)
+
+
+def calibrate_pbkdf2(target_ms: float, min_iterations: int | None = None, probe: int = 20_000) -> dict:
+    """Nombre d'itérations PBKDF2-SHA256 dont le calcul dure environ target_ms (au moins pbkdf2_floor)."""
+    salt = os.urandom(16)
+    seconds = _best_time(lambda: hashlib.pbkdf2_hmac("sha256", b"calibration", salt, probe))
+    iterations = round(target_ms / 1000 * probe / seconds, -3)
+    return {"iterations": max(int(iterations), pbkdf2_floor(min_iterations))}
+
+
+def _scrypt(n: int):
+    hashlib.scrypt(
+        b"calibration", salt=os.urandom(16), n=n, r=SCRYPT_BLOCK_SIZE, p=SCRYPT_PARALLELISM,
+        maxmem=CalibratedScryptPasswordHasher.maxmem, dklen=64,
+    )
+
+
+def calibrate_scrypt(target_ms: float) -> dict:
+    """
+    Facteur de travail scrypt (puissance de 2) dont la durée est la plus proche
+    de target_ms, entre SCRYPT_MIN_WORK_FACTOR et SCRYPT_MAX_WORK_FACTOR.
+    """
+    target = target_ms / 1000
+    n = SCRYPT_MIN_WORK_FACTOR
+    seconds = _best_time(lambda: _scrypt(n), repeat=2)
+    while seconds < target and n < SCRYPT_MAX_WORK_FACTOR:
+        previous = seconds
+        n *= 2
+        seconds = _best_time(lambda: _scrypt(n), repeat=2)
+        if seconds >= target and target / previous < seconds / target:
+            # La valeur précédente est plus proche de la cible (en rapport)
+            n //= 2
+            break
+    return {"work_factor": n, "block_size": SCRYPT_BLOCK_SIZE, "parallelism": SCRYPT_PARALLELISM}
+
+
+def calibrate(algorithm: str, target_ms: float, min_iterations: int | None = None) -> dict:
+    if algorithm == CalibratedPBKDF2PasswordHasher.algorithm:
+        return calibrate_pbkdf2(target_ms, min_iterations)
+    if algorithm == CalibratedScryptPasswordHasher.algorithm:
+        return calibrate_scrypt(target_ms)
+    raise ValueError(f"Algorithme non calibrable : {algorithm} (pbkdf2_sha256 ou scrypt).")
+
+
+def default_parameters(algorithm: str) -> dict:
+    """Paramètres de Django, utilisés tant que la machine n'est pas calibrée."""
+    if algorithm == CalibratedPBKDF2PasswordHasher.algorithm:
+        return {"iterations": PBKDF2PasswordHasher.iterations}
+    return {
+        "work_factor": ScryptPasswordHasher.work_factor,
+        "block_size": SCRYPT_BLOCK_SIZE,
+        "parallelism": SCRYPT_PARALLELISM,
+    }
+
+
+def measure_hasher(algorithm: str, parameters: dict, samples: int = 5) -> tuple[float, float]:
+    """Durées médianes (ms) du hachage et de la vérification avec ces paramètres."""
+    if algorithm == CalibratedPBKDF2PasswordHasher.algorithm:
+        hasher = CalibratedPBKDF2PasswordHasher()
+        arguments = (parameters["iterations"],)
+    else:
+        hasher = CalibratedScryptPasswordHasher()
+        arguments = (parameters["work_factor"], parameters["block_size"], parameters["parallelism"])
+
+    hash_ms, verify_ms = [], []
+    for _ in range(samples):
+        started = time.perf_counter()
+        encoded = hasher.encode("motdepasse-calibration", hasher.salt(), *arguments)
+        hash_ms.append((time.perf_counter() - started) * 1000)
+        started = time.perf_counter()
+        hasher.verify("motdepasse-calibration", encoded)
+        verify_ms.append((time.perf_counter() - started) * 1000)
+    return statistics.median(hash_ms), statistics.median(verify_ms)
+
+
+# ---------------------------------------------------
+# Paramètres calibrés du processus
+# ---------------------------------------------------
+_parameters = {}
+_parameters_lock = threading.Lock()
+
+
+@receiver(setting_changed)
+def _reset_parameters(setting, **kwargs):
+    if setting == "PASSWORD_HASH_CALIBRATION":
+        _parameters.clear()
+
+
+def read_calibration_file(path) -> dict:
+    try:
+        with open(path) as file:
+            return json.load(file)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError):
+        logger.warning("Fichier de calibration illisible : %s", path)
+        return {}
+
+
+def write_calibration(path, algorithm: str, target_ms: float, parameters: dict):
+    """Enregistre les paramètres d'un algorithme (les autres algorithmes du fichier sont conservés)."""
+    data = read_calibration_file(path)
+    data[algorithm] = {"target_ms": target_ms, **parameters}
+    Path(path).write_text(json.dumps(data, indent=2) + "\n")
+    with _parameters_lock:
+        _parameters.clear()
+
+
+def calibrated_parameters(algorithm: str) -> dict:
+    """
+    Paramètres de l'algorithme pour la cible TARGET_MS, lus dans FILE (commande
+    calibrate_password_hasher). Sans calibration, les valeurs de Django : mesurer ici
+    bloquerait la requête qui déclenche le premier hachage de chaque worker.
+    """
+    try:
+        return _parameters[algorithm]
+    except KeyError:
+        pass
+    with _parameters_lock:
+        if algorithm not in _parameters:
+            config = calibration_config()
+            stored = read_calibration_file(config["FILE"]).get(algorithm)
+            if stored and stored.get("target_ms") == config["TARGET_MS"]:
+                parameters = {key: value for key, value in stored.items() if key != "target_ms"}
+            else:
+                parameters = default_parameters(algorithm)
+                logger.warning(
+                    "Aucune calibration %s pour %s ms dans %s : paramètres de Django %s "
+                    "(python manage.py calibrate_password_hasher --write).",
+                    algorithm, config["TARGET_MS"], config["FILE"], parameters,
+                )
+            _parameters[algorithm] = parameters
+        return _parameters[algorithm]
+
+
+# ---------------------------------------------------
+# Hashers Django
+# ---------------------------------------------------
+class CalibratedPBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """
+    PBKDF2-SHA256 dont le nombre d'itérations est calibré sur la machine
+    (PASSWORD_HASH_CALIBRATION). Même algorithme que le hasher de Django : les
+    hashes existants restent valides.
+    """
+
+    @property
+    def iterations(self):
+        return calibrated_parameters(self.algorithm)["iterations"]
+
+    def must_update(self, encoded):
+        # Mise à niveau seulement, au-delà de la tolérance : deux workers calibrés
+        # à quelques pour cent près ne recalculent pas les hashes l'un de l'autre
+        decoded = self.decode(encoded)
+        return (
+            decoded["iterations"] < self.iterations * (1 - calibration_config()["TOLERANCE"])
+            or must_update_salt(decoded["salt"], self.salt_entropy)
+        )
+
+
+class CalibratedScryptPasswordHasher(ScryptPasswordHasher):
+    """scrypt (hashlib) dont le facteur de travail est calibré sur la machine."""
+    block_size = SCRYPT_BLOCK_SIZE
+    parallelism = SCRYPT_PARALLELISM
+    # Permet aussi de vérifier les hashes calculés avec le facteur maximal
+    maxmem = 2 * 128 * SCRYPT_MAX_WORK_FACTOR * SCRYPT_BLOCK_SIZE
+
+    @property
+    def work_factor(self):
+        return calibrated_parameters(self.algorithm)["work_factor"]
+
+    def must_update(self, encoded):
+        decoded = self.decode(encoded)
+        return (
+            decoded["work_factor"] < self.work_factor * (1 - calibration_config()["TOLERANCE"])
+            or decoded["block_size"] != self.block_size
+            or decoded["parallelism"] != self.parallelism
+        )
@@ -1,9 +1,22 @@
-from django.contrib.auth.hashers import make_password, check_password
+from django.contrib.auth.hashers import check_password, get_hasher, identify_hasher, make_password
+from core.request_timing import timed
 from users.application.services.password_hasher import PasswordHasher
 
 class DjangoPasswordHasher(PasswordHasher):
     def hash(self, password: str) -> str:
-        return make_password(password)
+        with timed("hash"):
+            return make_password(password)
 
     def verify(self, password_hash: str, password: str) -> bool:
-        return check_password(password, password_hash)
+        with timed("hash"):
+            return check_password(password, password_hash)
+
+    def needs_rehash(self, password_hash: str) -> bool:
+        # Même règle que check_password() : autre algorithme que le premier de
+        # PASSWORD_HASHERS, ou paramètres jugés dépassés par ce hasher
+        preferred = get_hasher("default")
+        try:
+            current = identify_hasher(password_hash)
+        except ValueError:
+            return False
+        return current.algorithm != preferred.algorithm or preferred.must_update(password_hash)
@@ -0,0 +1,113 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from core import metrics
+
+
+class HashingPoolSaturated(Exception):
+    """Levée quand le pool de hachage et sa file d'attente sont pleins."""
+
+
+class BoundedHashingPool:
+    """
+    Pool de threads dédié au hachage des mots de passe, de taille bornée.
+
+    PBKDF2 (hashlib) libère le GIL pendant le calcul : des threads suffisent pour
+    paralléliser sans bloquer la boucle asyncio. Au-delà de `max_workers` tâches en
+    cours et `max_queue` tâches en attente, les nouvelles demandes sont refusées
+    immédiatement (HashingPoolSaturated) au lieu de s'accumuler.
+    """
+
+    def __init__(self, max_workers: int, max_queue: int):
+        if max_workers < 1 or max_queue < 0:
+            raise ValueError("max_workers doit être >= 1 et max_queue >= 0.")
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="password-hashing")
+        self._in_flight = 0
+        self._lock = threading.Lock()
+
+    @property
+    def in_flight(self) -> int:
+        """Tâches en cours d'exécution ou en attente."""
+        return self._in_flight
+
+    @property
+    def queued(self) -> int:
+        """Tâches en attente d'un thread libre."""
+        return max(0, self._in_flight - self.max_workers)
+
+    def _acquire(self):
+        with self._lock:
+            if self._in_flight >= self.max_workers + self.max_queue:
+                _rejected_total.inc()
+                raise HashingPoolSaturated("Le service d'authentification est saturé, réessayez plus tard.")
+            self._in_flight += 1
+
+    def _release(self, future=None):
+        with self._lock:
+            self._in_flight -= 1
+        if future is not None and not future.cancelled():
+            _completed_total.inc()
+
+    async def run(self, func, *args):
+        """
+        Exécute `func(*args)` dans le pool et attend son résultat.
+
+        La place est rendue quand le thread a fini, pas quand l'appelant cesse
+        d'attendre : une requête annulée (client déconnecté) ne libère pas une
+        place encore occupée par son hachage.
+        """
+        self._acquire()
+        try:
+            future = self._executor.submit(func, *args)
+        except BaseException:
+            self._release()
+            raise
+        # Tâche encore en file : annulée avec l'appelant, sa place est rendue aussitôt
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait=wait)
+
+
+_rejected_total = metrics.counter(
+    "password_hashing_pool_rejected_total",
+    "Demandes de hachage refusées car le pool était saturé.",
+)
+_completed_total = metrics.counter(
+    "password_hashing_pool_completed_total",
+    "Opérations de hachage exécutées par le pool.",
+)
+_workers = metrics.gauge("password_hashing_pool_workers", "Nombre de threads du pool de hachage.")
+_queue_capacity = metrics.gauge("password_hashing_pool_queue_capacity", "Taille maximale de la file d'attente.")
+_in_flight = metrics.gauge("password_hashing_pool_in_flight", "Tâches de hachage en cours ou en attente.")
+_queued = metrics.gauge("password_hashing_pool_queued", "Tâches de hachage en attente d'un thread.")
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_hashing_pool() -> BoundedHashingPool:
+    """
+    Retourne le pool du processus, créé à la première utilisation
+    à partir de settings.PASSWORD_HASHING_POOL.
+    """
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                config = getattr(settings, "PASSWORD_HASHING_POOL", {})
+                pool = BoundedHashingPool(
+                    max_workers=config.get("MAX_WORKERS", 4),
+                    max_queue=config.get("MAX_QUEUE", 16),
+                )
+                _workers.set_function(lambda: pool.max_workers)
+                _queue_capacity.set_function(lambda: pool.max_queue)
+                _in_flight.set_function(lambda: pool.in_flight)
+                _queued.set_function(lambda: pool.queued)
+                _pool = pool
+    return _pool
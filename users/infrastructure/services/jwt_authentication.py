@@ -0,0 +1,167 @@
+import copy
+import uuid
+
+from django.conf import settings
+from django.core.cache import DEFAULT_CACHE_ALIAS, cache, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+from core import metrics
+from core.identity_map import identity_map_add
+from core.lru_cache import LRUTTLCache
+from users.infrastructure.models.user_model import UserModel
+
+
+class IdentityMapJWTAuthentication(JWTAuthentication):
+    """
+    Authentification JWT qui enregistre l'utilisateur authentifié (request.user)
+    dans la carte d'identité de la requête : les repositories ne le rechargent pas.
+    """
+
+    def get_user(self, validated_token):
+        user = super().get_user(validated_token)
+        return identity_map_add(UserModel, user.pk, user)
+
+
+_config = getattr(settings, "JWT_USER_CACHE", {})
+_user_cache = LRUTTLCache(maxsize=_config.get("MAX_SIZE", 10000), ttl=_config.get("TTL", 60))
+
+_cache_hits = metrics.counter("jwt_user_cache_hits_total", "Utilisateurs authentifiés servis par le cache.")
+_cache_misses = metrics.counter("jwt_user_cache_misses_total", "Utilisateurs authentifiés chargés depuis la base.")
+
+_enabled = None
+
+
+def user_cache_enabled() -> bool:
+    """
+    Vrai si le cache local des utilisateurs est utilisé. Il n'est sûr que si la
+    génération (cache Django) est vue par tous les processus : avec LocMemCache ou
+    DummyCache, un autre worker continuerait d'authentifier un utilisateur
+    désactivé jusqu'à l'expiration de son entrée.
+    JWT_USER_CACHE["ENABLED"] force le choix (None : selon le backend du cache).
+    """
+    global _enabled
+    if _enabled is None:
+        enabled = getattr(settings, "JWT_USER_CACHE", {}).get("ENABLED")
+        if enabled is None:
+            enabled = not isinstance(caches[DEFAULT_CACHE_ALIAS], (LocMemCache, DummyCache))
+        _enabled = enabled
+    return _enabled
+
+
+@receiver(setting_changed)
+def _reset_enabled(setting, **kwargs):
+    global _enabled
+    if setting in ("JWT_USER_CACHE", "CACHES"):
+        _enabled = None
+
+
+def _generation_key(user_id):
+    return f"jwt-user-cache:generation:{user_id}"
+
+
+def invalidate_cached_user(user_id):
+    """
+    Invalide l'utilisateur dans le cache local et, via le cache Django partagé,
+    dans celui des autres processus (ils comparent la génération à chaque lecture).
+    À appeler après toute modification qui contourne save() (ex : queryset.update()).
+    """
+    user_id = str(user_id)
+    _user_cache.delete_where(lambda key: key[0] == user_id)
+    # La génération doit survivre aux entrées locales qu'elle invalide
+    cache.set(_generation_key(user_id), uuid.uuid4().hex, timeout=_user_cache.ttl * 2)
+
+
+class CachedJWTAuthentication(IdentityMapJWTAuthentication):
+    """
+    Authentification JWT sans requête en base sur le chemin chaud.
+
+    L'utilisateur est conservé dans un cache LRU+TTL du processus (si le cache
+    Django est partagé entre processus, voir user_cache_enabled), indexé par
+    (id utilisateur, version du token). La version est le claim de révocation
+    (SIMPLE_JWT["CHECK_REVOKE_TOKEN"]) : un changement de mot de passe produit une
+    nouvelle clé. Seuls les utilisateurs actifs sont mis en cache ; les signaux de
+    UserModel (voir users/signals.py) invalident l'entrée à chaque sauvegarde.
+
+    Pour les vues qui n'ont besoin que de l'identifiant, JWTStatelessUserAuthentication
+    de simplejwt fournit un TokenUser construit à partir des seuls claims.
+    """
+
+    def get_user(self, validated_token):
+        if not user_cache_enabled():
+            return super().get_user(validated_token)
+        try:
+            user_id = str(validated_token[api_settings.USER_ID_CLAIM])
+        except KeyError:
+            # Le parent lève l'erreur appropriée
+            return super().get_user(validated_token)
+
+        key = (user_id, validated_token.get(api_settings.REVOKE_TOKEN_CLAIM))
+        generation = cache.get(_generation_key(user_id))
+        cached = _user_cache.get(key)
+        if cached is not None and cached[0] == generation:
+            _cache_hits.inc()
+            # Copie : chaque requête reçoit sa propre instance du modèle
+            user = copy.copy(cached[1])
+            return identity_map_add(UserModel, user.pk, user)
+
+        _cache_misses.inc()
+        user = super().get_user(validated_token)
+        _user_cache.set(key, (generation, copy.copy(user)))
+        return user
+
+    async def aauthenticate(self, request):
+        """
+        Version asynchrone de authenticate(), pour les vues asynchrones (core/async_views.py).
+        Le token est validé dans la boucle (calcul pur) ; l'utilisateur vient du cache
+        ou, à défaut, de l'ORM asynchrone.
+        """
+        header = self.get_header(request)
+        if header is None:
+            return None
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+        validated_token = self.get_validated_token(raw_token)
+        return await self.aget_user(validated_token), validated_token
+
+    async def aget_user(self, validated_token):
+        """Version asynchrone de get_user (mêmes contrôles que simplejwt)."""
+        try:
+            user_id = str(validated_token[api_settings.USER_ID_CLAIM])
+        except KeyError as e:
+            raise InvalidToken(_("Token contained no recognizable user identification")) from e
+
+        key = (user_id, validated_token.get(api_settings.REVOKE_TOKEN_CLAIM))
+        enabled = user_cache_enabled()
+        if enabled:
+            generation = await cache.aget(_generation_key(user_id))
+            cached = _user_cache.get(key)
+            if cached is not None and cached[0] == generation:
+                _cache_hits.inc()
+                user = copy.copy(cached[1])
+                return identity_map_add(UserModel, user.pk, user)
+            _cache_misses.inc()
+
+        try:
+            user = await self.user_model.objects.aget(**{api_settings.USER_ID_FIELD: user_id})
+        except self.user_model.DoesNotExist as e:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found") from e
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        if api_settings.CHECK_REVOKE_TOKEN and key[1] != get_md5_hash_password(user.password):
+            raise AuthenticationFailed(_("The user's password has been changed."), code="password_changed")
+
+        if enabled:
+            _user_cache.set(key, (generation, copy.copy(user)))
+        return identity_map_add(UserModel, user.pk, user)
+
+
+def clear_user_cache():
+    _user_cache.clear()
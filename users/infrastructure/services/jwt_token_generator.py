@@ -1,4 +1,9 @@
+from typing import Callable
+
+from rest_framework_simplejwt.settings import api_settings
 from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.utils import get_md5_hash_password
+from core.identity_map import identity_map_get
 from users.application.services.token_generator import TokenGenerator
 from users.domain.entities.user import User
 from users.infrastructure.models.user_model import UserModel
@@ -6,7 +11,8 @@ from users.infrastructure.models.user_model import UserModel
 class JWTTokenGenerator(TokenGenerator):
     def generate_tokens(self, user: User) -> dict:
         try:
-            user_model = UserModel.objects.get(id=user.id)
+            # Le modèle est souvent déjà chargé par le repository pendant la requête
+            user_model = identity_map_get(UserModel, user.id) or UserModel.objects.get(id=user.id)
             refresh = RefreshToken.for_user(user_model)
             return {
                 "access": str(refresh.access_token),
@@ -17,3 +23,30 @@ class JWTTokenGenerator(TokenGenerator):
             # Depending on the desired behavior, you could log an error, raise an exception, or return an empty dict.
             # For this example, let's raise a ValueError to indicate a problem.
             raise ValueError(f"No UserModel found for user with ID {user.id}")
+
+
+class StatelessJWTTokenGenerator(TokenGenerator):
+    """
+    Génère les tokens directement à partir de l'entité User, sans requête en base.
+    Les claims produits sont identiques à ceux de RefreshToken.for_user.
+    `extra_claims` permet d'ajouter des claims personnalisés : user -> dict.
+    """
+
+    def __init__(self, extra_claims: Callable[[User], dict] | None = None):
+        self.extra_claims = extra_claims
+
+    def generate_tokens(self, user: User) -> dict:
+        refresh = RefreshToken()
+        refresh[api_settings.USER_ID_CLAIM] = str(getattr(user, api_settings.USER_ID_FIELD))
+
+        if api_settings.CHECK_REVOKE_TOKEN:
+            refresh[api_settings.REVOKE_TOKEN_CLAIM] = get_md5_hash_password(user.password_hash)
+
+        if self.extra_claims:
+            for claim, value in self.extra_claims(user).items():
+                refresh[claim] = value
+
+        return {
+            "access": str(refresh.access_token),
+            "refresh": str(refresh),
+        }
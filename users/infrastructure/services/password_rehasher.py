@@ -0,0 +1,49 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import close_old_connections
+from core import metrics
+from users.application.services.password_hasher import PasswordHasher
+from users.application.services.password_rehasher import PasswordRehasher
+from users.domain.entities.user import User
+from users.infrastructure.repositories.user_repository import UserRepository
+
+logger = logging.getLogger(__name__)
+
+_rehashes = metrics.counter(
+    "password_rehash_total",
+    "Hashes de mots de passe recalculés après connexion (updated, skipped si le hash a changé entre-temps, failed).",
+    labelnames=("result",),
+)
+
+
+class DeferredPasswordRehasher(PasswordRehasher):
+    """
+    Recalcule le hash d'un mot de passe dépassé après la connexion, dans un
+    thread du processus : la réponse n'attend ni le hachage ni l'écriture, et
+    la connexion ne coûte aucune requête SQL de plus.
+    """
+
+    def __init__(self, hasher: PasswordHasher, user_repository: UserRepository, max_workers: int = 1):
+        self.hasher = hasher
+        self.user_repository = user_repository
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="password-rehash")
+
+    def schedule(self, user: User, password: str):
+        return self._executor.submit(self._run, user.id, user.password_hash, password)
+
+    def rehash(self, user_id, old_hash: str, password: str) -> bool:
+        updated = self.user_repository.update_password_hash(user_id, old_hash, self.hasher.hash(password))
+        _rehashes.inc(result="updated" if updated else "skipped")
+        return updated
+
+    def _run(self, user_id, old_hash, password):
+        close_old_connections()
+        try:
+            return self.rehash(user_id, old_hash, password)
+        except Exception:
+            _rehashes.inc(result="failed")
+            logger.exception("Échec du recalcul du hash de l'utilisateur %s", user_id)
+            raise
+        finally:
+            close_old_connections()
@@ -0,0 +1,33 @@
+from core.request_timing import timed
+from users.application.services.password_hasher import PasswordHasher
+from users.infrastructure.services.hashing_pool import BoundedHashingPool
+
+
+class PooledPasswordHasher(PasswordHasher):
+    """
+    Délègue le hachage à un autre hasher ; les versions asynchrones
+    s'exécutent dans un pool borné pour ne pas bloquer la boucle d'événements.
+    """
+
+    def __init__(self, hasher: PasswordHasher, pool: BoundedHashingPool):
+        self.hasher = hasher
+        self.pool = pool
+
+    def hash(self, password: str) -> str:
+        return self.hasher.hash(password)
+
+    def verify(self, password_hash: str, password: str) -> bool:
+        return self.hasher.verify(password_hash, password)
+
+    def needs_rehash(self, password_hash: str) -> bool:
+        return self.hasher.needs_rehash(password_hash)
+
+    # Mesuré côté boucle (attente dans la file comprise) : les threads du pool
+    # ne voient pas le contexte de la requête
+    async def ahash(self, password: str) -> str:
+        with timed("hash"):
+            return await self.pool.run(self.hasher.hash, password)
+
+    async def averify(self, password_hash: str, password: str) -> bool:
+        with timed("hash"):
+            return await self.pool.run(self.hasher.verify, password_hash, password)
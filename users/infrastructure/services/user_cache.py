@@ -0,0 +1,17 @@
+from core.entity_cache import EntityCache
+from core.identity_map import identity_map_remove
+from users.domain.entities.user import User
+
+# Lignes UserModel (UserMapper.CACHE_FIELDS, sans le hash du mot de passe) lues par
+# CachedUserRepository ; le nom diffère des anciennes entrées, qui contenaient le hash
+user_cache = EntityCache("user_profile")
+
+# Entrées de la carte d'identité construites depuis ce cache (password_hash=None),
+# distinctes de celles de User que UserRepository sert à la connexion
+CACHED_USER = (User, "cached")
+
+
+def invalidate_user(user_id):
+    """À appeler après toute modification de UserModel qui contourne save()."""
+    user_cache.invalidate(user_cache.key(user_id))
+    identity_map_remove(CACHED_USER, user_id)
@@ -0,0 +1,145 @@
+import csv
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from itertools import islice
+
+from django.contrib.auth.hashers import identify_hasher, make_password
+from django.db import transaction
+from users.infrastructure.models.user_model import UserModel
+
+
+@dataclass
+class ImportStats:
+    read: int = 0
+    created: int = 0
+    duplicates: int = 0
+    invalid: int = 0
+    errors: list = field(default_factory=list)
+
+
+def read_records(stream, input_format: str):
+    """
+    Lit les utilisateurs au fil de l'eau (CSV avec en-tête, ou un objet JSON par ligne).
+    Produit des dictionnaires ; une ligne NDJSON illisible produit None.
+    """
+    if input_format == "csv":
+        yield from csv.DictReader(stream)
+        return
+    for line in stream:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError:
+            yield None
+
+
+def batched(iterable, size: int):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def hash_passwords(passwords: list) -> list:
+    """
+    Hache une liste de mots de passe (None -> mot de passe inutilisable).
+    Fonction de module : exécutée dans les processus du pool.
+    """
+    return [make_password(password) for password in passwords]
+
+
+def _init_worker(settings_module):
+    # Avec la méthode « spawn », le processus fils doit configurer Django lui-même
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", settings_module)
+    import django
+    django.setup()
+
+
+class UserImporter:
+    """
+    Importe des utilisateurs par lots : lecture en flux, hachage PBKDF2 réparti sur
+    un pool de processus (le hachage domine le coût d'un import), puis un bulk_create
+    par lot. Les emails déjà présents sont écartés avant le hachage.
+    """
+
+    def __init__(self, batch_size=1000, workers=None, pre_hashed=False):
+        self.batch_size = batch_size
+        self.workers = os.cpu_count() if workers is None else workers
+        self.pre_hashed = pre_hashed
+        self._executor = None
+
+    def __enter__(self):
+        if self.workers > 0 and not self.pre_hashed:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_worker,
+                initargs=(os.environ.get("DJANGO_SETTINGS_MODULE", "core.settings"),),
+            )
+        return self
+
+    def __exit__(self, *exc_info):
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def import_batch(self, records, stats: ImportStats, first_index: int):
+        """Valide, hache et insère un lot. `first_index` sert aux messages d'erreur."""
+        rows = {}
+        for index, record in enumerate(records, start=first_index):
+            stats.read += 1
+            row, error = self._clean(record)
+            if error:
+                stats.invalid += 1
+                stats.errors.append(f"Enregistrement {index} : {error}")
+            elif row["email"] in rows:
+                stats.duplicates += 1
+            else:
+                rows[row["email"]] = row
+        if not rows:
+            return
+
+        existing = set(UserModel.objects.filter(email__in=list(rows)).values_list("email", flat=True))
+        stats.duplicates += len(existing)
+        rows = [row for email, row in rows.items() if email not in existing]
+        if not rows:
+            return
+
+        passwords = self._hash([row.pop("password") for row in rows])
+        models = [UserModel(password=password, **row) for row, password in zip(rows, passwords)]
+        with transaction.atomic():
+            # ignore_conflicts : un email inséré entre-temps par un autre processus est ignoré
+            UserModel.objects.bulk_create(models, batch_size=self.batch_size, ignore_conflicts=True)
+            # bulk_create(ignore_conflicts=True) ne renvoie pas les lignes réellement insérées
+            created = UserModel.objects.filter(id__in=[model.id for model in models]).count()
+        stats.created += created
+        stats.duplicates += len(models) - created
+
+    def _clean(self, record):
+        if not isinstance(record, dict):
+            return None, "enregistrement illisible."
+        # Adresse entière en minuscules, comme User._validate_email : la connexion retrouve le compte
+        email = (record.get("email") or "").strip().lower()
+        full_name = (record.get("full_name") or "").strip()
+        password = record.get("password") or None
+        if "@" not in email or len(email) > 191:
+            return None, "l'adresse email est invalide."
+        if not full_name or len(full_name) > 191:
+            return None, "le nom complet est requis (191 caractères maximum)."
+        if self.pre_hashed and password is not None:
+            try:
+                identify_hasher(password)
+            except ValueError:
+                return None, "le hash du mot de passe n'est pas reconnu."
+        return {"email": email, "full_name": full_name, "password": password}, None
+
+    def _hash(self, passwords: list) -> list:
+        if self.pre_hashed:
+            return [password or make_password(None) for password in passwords]
+        if self._executor is None:
+            return hash_passwords(passwords)
+        chunk_size = max(1, -(-len(passwords) // self.workers))
+        chunks = [passwords[i:i + chunk_size] for i in range(0, len(passwords), chunk_size)]
+        return [password for hashed in self._executor.map(hash_passwords, chunks) for password in hashed]
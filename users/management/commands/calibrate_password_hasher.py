@@ -0,0 +1,50 @@
+from django.contrib.auth.hashers import get_hasher
+from django.core.management.base import BaseCommand, CommandError
+from users.infrastructure.services.calibrated_hashers import (
+    calibrate,
+    calibration_config,
+    measure_hasher,
+    pbkdf2_floor,
+    write_calibration,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Calibre le coût du hachage des mots de passe (itérations PBKDF2 ou facteur scrypt) "
+        "pour la durée visée sur cette machine, et affiche les durées mesurées."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--algorithm", choices=("pbkdf2_sha256", "scrypt"), default=None,
+            help="Algorithme à calibrer (par défaut : celui du premier hasher de PASSWORD_HASHERS).",
+        )
+        parser.add_argument("--target-ms", type=float, default=None, help="Durée visée (par défaut : TARGET_MS).")
+        parser.add_argument("--samples", type=int, default=5, help="Mesures de hachage et de vérification.")
+        parser.add_argument("--write", action="store_true", help="Enregistre le résultat dans le fichier FILE.")
+
+    def handle(self, *args, **options):
+        config = calibration_config()
+        algorithm = options["algorithm"] or get_hasher("default").algorithm
+        target_ms = options["target_ms"] or config["TARGET_MS"]
+        if options["write"] and target_ms != config["TARGET_MS"]:
+            # Les hashers ne relisent que la calibration faite pour TARGET_MS
+            raise CommandError("--write enregistre la calibration de TARGET_MS : ne pas combiner avec --target-ms.")
+        try:
+            parameters = calibrate(algorithm, target_ms, config["MIN_ITERATIONS"])
+        except ValueError as e:
+            raise CommandError(str(e)) from e
+
+        hash_ms, verify_ms = measure_hasher(algorithm, parameters, options["samples"])
+        summary = ", ".join(f"{key}={value}" for key, value in parameters.items())
+        self.stdout.write(f"{algorithm} : {summary} (cible {target_ms:g} ms)")
+        self.stdout.write(f"Hachage : {hash_ms:.1f} ms, vérification : {verify_ms:.1f} ms (médianes sur {options['samples']})")
+        if algorithm == "pbkdf2_sha256" and parameters["iterations"] == pbkdf2_floor(config["MIN_ITERATIONS"]):
+            self.stdout.write(self.style.WARNING(
+                f"Plancher de {parameters['iterations']} itérations atteint : la cible de {target_ms:g} ms n'est pas tenue sur cette machine."
+            ))
+
+        if options["write"]:
+            write_calibration(config["FILE"], algorithm, target_ms, parameters)
+            self.stdout.write(self.style.SUCCESS(f"Calibration enregistrée dans {config['FILE']}."))
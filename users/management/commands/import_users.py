@@ -0,0 +1,92 @@
+import json
+import os
+import sys
+import time
+from itertools import islice
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from users.infrastructure.services.user_import import ImportStats, UserImporter, batched, read_records
+
+
+class Command(BaseCommand):
+    help = (
+        "Importe des utilisateurs depuis un fichier CSV (email,full_name,password) ou NDJSON, "
+        "par lots, avec hachage des mots de passe en parallèle."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Fichier à importer ('-' pour l'entrée standard).")
+        parser.add_argument("--format", choices=["csv", "ndjson"], help="Déduit de l'extension par défaut.")
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument(
+            "--workers", type=int, default=None,
+            help="Processus de hachage (nombre de CPU par défaut, 0 pour hacher dans le processus courant).",
+        )
+        parser.add_argument(
+            "--pre-hashed", action="store_true",
+            help="La colonne password contient déjà un hash Django (ex : export d'une autre instance).",
+        )
+        parser.add_argument(
+            "--checkpoint",
+            help="Fichier de reprise, mis à jour après chaque lot ; un import interrompu reprend après le dernier lot validé.",
+        )
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        input_format = options["format"] or ("csv" if path.endswith(".csv") else "ndjson")
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size doit être positif.")
+
+        checkpoint = Path(options["checkpoint"]) if options["checkpoint"] else None
+        start = self._load_checkpoint(checkpoint, path)
+        if start:
+            self.stdout.write(f"Reprise après {start} enregistrement(s).")
+
+        stats = ImportStats()
+        started_at = time.perf_counter()
+        stream = sys.stdin if path == "-" else open(path, newline="", encoding="utf-8")
+        try:
+            records = islice(read_records(stream, input_format), start, None)
+            importer = UserImporter(options["batch_size"], options["workers"], options["pre_hashed"])
+            with importer:
+                position = start
+                for batch in batched(records, options["batch_size"]):
+                    importer.import_batch(batch, stats, first_index=position + 1)
+                    position += len(batch)
+                    self._save_checkpoint(checkpoint, path, position)
+                    self._report(stats, started_at)
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+
+        for error in stats.errors:
+            self.stderr.write(error)
+        elapsed = time.perf_counter() - started_at
+        self.stdout.write(self.style.SUCCESS(
+            f"{stats.created} créé(s), {stats.duplicates} doublon(s), {stats.invalid} invalide(s) "
+            f"en {elapsed:.1f} s ({stats.created / elapsed if elapsed else 0:.0f} utilisateurs/s)."
+        ))
+
+    def _report(self, stats, started_at):
+        elapsed = time.perf_counter() - started_at
+        rate = stats.read / elapsed if elapsed else 0
+        self.stdout.write(f"{stats.read} lu(s), {stats.created} créé(s) — {rate:.0f} utilisateurs/s")
+
+    @staticmethod
+    def _load_checkpoint(checkpoint, path):
+        if checkpoint is None or not checkpoint.exists():
+            return 0
+        data = json.loads(checkpoint.read_text())
+        if data.get("path") != os.path.abspath(path):
+            raise CommandError(f"Le fichier de reprise {checkpoint} concerne un autre import ({data.get('path')}).")
+        return data["position"]
+
+    @staticmethod
+    def _save_checkpoint(checkpoint, path, position):
+        if checkpoint is None:
+            return
+        # Écriture atomique : un arrêt brutal ne laisse jamais un fichier tronqué
+        temporary = checkpoint.with_suffix(checkpoint.suffix + ".tmp")
+        temporary.write_text(json.dumps({"path": os.path.abspath(path), "position": position}))
+        os.replace(temporary, checkpoint)
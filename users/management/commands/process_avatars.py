@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+from users.infrastructure.models.user_model import UserModel
+from users.infrastructure.services.avatar_pipeline import content_hash, process_avatar
+
+
+class Command(BaseCommand):
+    help = "Génère les miniatures des avatars qui n'ont pas encore été traités (anciens uploads, échecs)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--limit", type=int, default=None, help="Nombre maximal d'avatars à traiter.")
+
+    def handle(self, *args, **options):
+        storage = UserModel._meta.get_field("avatar").storage
+        pending = UserModel.objects.exclude(avatar="").filter(avatar_hash="").values_list("id", "avatar")
+        if options["limit"]:
+            pending = pending[:options["limit"]]
+
+        processed = failed = 0
+        for user_id, name in pending.iterator(chunk_size=500):
+            try:
+                # Les miniatures sont nommées d'après le contenu, quel que soit le nom de l'original
+                with storage.open(name, "rb") as original:
+                    sha = content_hash(original)
+                process_avatar(user_id, name, sha)
+                processed += 1
+            except Exception as e:
+                failed += 1
+                self.stderr.write(f"{name} : {e}")
+
+        self.stdout.write(self.style.SUCCESS(f"{processed} avatar(s) traité(s), {failed} échec(s)."))
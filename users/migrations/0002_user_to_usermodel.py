@@ -0,0 +1,74 @@
+# Generated by Django 5.2.7 on 2026-10-18 16:40
+
+import django.utils.timezone
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    """
+    Aligne la base sur le modèle UserModel : 0001_initial créait un modèle « User »
+    (table users_user, clé entière) que le code n'a jamais défini, si bien que les
+    migrations d'admin et de projects (clés étrangères vers AUTH_USER_MODEL) échouaient.
+
+    Le changement de type de la clé primaire ne conserve pas les identifiants
+    entiers : la table ne pouvait de toute façon recevoir aucune ligne créée par
+    l'application, dont les identifiants sont des UUID.
+    """
+
+    dependencies = [
+        ('users', '0001_initial'),
+    ]
+
+    # Les clés étrangères vers AUTH_USER_MODEL (admin, projects) visent users.UserModel,
+    # qui n'existe qu'à partir d'ici
+    run_before = [
+        ('admin', '0001_initial'),
+        ('projects', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.RenameModel(
+            old_name='User',
+            new_name='UserModel',
+        ),
+        migrations.AlterModelOptions(
+            name='usermodel',
+            options={'ordering': ['-date_joined'], 'verbose_name': 'Utilisateur', 'verbose_name_plural': 'Utilisateurs'},
+        ),
+        migrations.AlterField(
+            model_name='usermodel',
+            name='id',
+            field=models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='usermodel',
+            name='email',
+            field=models.EmailField(max_length=191, unique=True),
+        ),
+        migrations.AlterField(
+            model_name='usermodel',
+            name='full_name',
+            field=models.CharField(max_length=191),
+        ),
+        migrations.AlterField(
+            model_name='usermodel',
+            name='avatar',
+            field=models.ImageField(blank=True, null=True, upload_to='avatars/'),
+        ),
+        migrations.AlterField(
+            model_name='usermodel',
+            name='is_active',
+            field=models.BooleanField(default=True),
+        ),
+        migrations.AlterField(
+            model_name='usermodel',
+            name='is_staff',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AlterField(
+            model_name='usermodel',
+            name='date_joined',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+    ]
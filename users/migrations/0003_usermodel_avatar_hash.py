@@ -0,0 +1,24 @@
+# Generated by Django 5.2.7 on 2026-10-18 08:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    # Anciennement 0002_usermodel_avatar_hash : une base qui l'a déjà appliquée
+    # ne rejoue pas l'ajout de la colonne
+    replaces = [
+        ('users', '0002_usermodel_avatar_hash'),
+    ]
+
+    dependencies = [
+        ('users', '0002_user_to_usermodel'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='usermodel',
+            name='avatar_hash',
+            field=models.CharField(blank=True, default='', max_length=64),
+        ),
+    ]
@@ -1,5 +1,4 @@
 from rest_framework import serializers
-from users.domain.entities.user import User
 
 
 class RegisterSerializer(serializers.Serializer):
@@ -13,10 +12,7 @@ class RegisterSerializer(serializers.Serializer):
         if data["password"] != data["password_confirm"]:
             raise serializers.ValidationError({"password_confirm": "Les mots de passe ne correspondent pas."})
 
-        # Vérifier que l'email n'existe pas déjà
-        if User.objects.filter(email=data["email"]).exists():
-            raise serializers.ValidationError({"email": "Cet email est déjà utilisé."})
-
+        # L'unicité de l'email est garantie par la contrainte de la base, à l'insertion
         return data
 
 
@@ -0,0 +1,7 @@
+from rest_framework import serializers
+
+
+class AvatarUploadSerializer(serializers.Serializer):
+    # FileField et non ImageField : ImageField décode toute l'image pour la valider,
+    # le service se contente de l'en-tête
+    avatar = serializers.FileField()
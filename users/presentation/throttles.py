@@ -0,0 +1,90 @@
+import hashlib
+from collections.abc import Mapping
+
+from django.conf import settings
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+from core import metrics
+from core.rate_limit import SlidingWindowLimiter
+
+_throttled = metrics.counter(
+    "login_throttled_total",
+    "Tentatives de connexion refusées par le limiteur, par clé (ip, email).",
+    labelnames=("scope",),
+)
+
+
+def login_throttle_config() -> dict:
+    config = {"IP_RATE": "20/min", "EMAIL_RATE": "5/min"}
+    config.update(getattr(settings, "LOGIN_THROTTLE", {}))
+    return config
+
+
+def _client_ip(request) -> str:
+    """
+    Adresse du client : REMOTE_ADDR, sauf si NUM_PROXIES (REST_FRAMEWORK) déclare les
+    proxys de confiance. Sans cela, X-Forwarded-For est fourni par le client, qui
+    pourrait en changer à chaque tentative pour échapper à la limite.
+    """
+    if api_settings.NUM_PROXIES is None:
+        return request.META.get("REMOTE_ADDR") or ""
+    return BaseThrottle().get_ident(request)
+
+
+def _login_attempts(request, email):
+    """(scope, limiteur, identifiant) à vérifier ; un taux à None désactive la clé."""
+    config = login_throttle_config()
+    if config["IP_RATE"]:
+        yield "ip", SlidingWindowLimiter.from_rate("login-ip", config["IP_RATE"]), _client_ip(request)
+    if config["EMAIL_RATE"] and isinstance(email, str) and email.strip():
+        # Empreinte de l'email : clé de cache de taille fixe, sans donnée personnelle
+        ident = hashlib.sha256(email.strip().lower().encode()).hexdigest()[:32]
+        yield "email", SlidingWindowLimiter.from_rate("login-email", config["EMAIL_RATE"]), ident
+
+
+def check_login_throttle(request, email) -> float:
+    """
+    Compte la tentative par adresse IP puis par email ; retourne 0 si elle est
+    permise, sinon le délai d'attente en secondes. Une tentative refusée n'est
+    comptée par aucune clé : les places déjà prises sont rendues. Aucun accès
+    à la base.
+    """
+    counted = []
+    for scope, limiter, ident in _login_attempts(request, email):
+        wait, key = limiter.hit(ident)
+        if wait:
+            _throttled.inc(scope=scope)
+            for previous, previous_key in counted:
+                previous.release(previous_key)
+            return wait
+        counted.append((limiter, key))
+    return 0.0
+
+
+async def acheck_login_throttle(request, email) -> float:
+    """Version asynchrone de check_login_throttle."""
+    counted = []
+    for scope, limiter, ident in _login_attempts(request, email):
+        wait, key = await limiter.ahit(ident)
+        if wait:
+            _throttled.inc(scope=scope)
+            for previous, previous_key in counted:
+                await previous.arelease(previous_key)
+            return wait
+        counted.append((limiter, key))
+    return 0.0
+
+
+class LoginRateThrottle(BaseThrottle):
+    """
+    Limite les tentatives de connexion par IP et par email (LOGIN_THROTTLE), avant
+    la validation, la lecture de l'utilisateur et la vérification du mot de passe.
+    """
+
+    def allow_request(self, request, view):
+        email = request.data.get("email") if isinstance(request.data, Mapping) else None
+        self._wait = check_login_throttle(request, email)
+        return not self._wait
+
+    def wait(self):
+        return self._wait
@@ -1,9 +1,15 @@
 from django.urls import path
-from .views.user_view import ping
+from .views.user_view import ping, aping
 from .views.auth_view import RegisterView, LoginView
+from .views.async_auth_view import AsyncRegisterView, AsyncLoginView
+from .views.avatar_view import AvatarUploadView
 
 urlpatterns = [
     path("ping/", ping, name="ping"),
     path("register/", RegisterView.as_view(), name="register"),
     path("login/", LoginView.as_view(), name="login"),
+    path("async/ping/", aping, name="async-ping"),
+    path("async/register/", AsyncRegisterView.as_view(), name="async-register"),
+    path("async/login/", AsyncLoginView.as_view(), name="async-login"),
+    path("me/avatar/", AvatarUploadView.as_view(), name="avatar-upload"),
 ]
@@ -0,0 +1,94 @@
+import math
+
+from django.http import JsonResponse
+from rest_framework import status
+from rest_framework.exceptions import Throttled
+from core.async_views import AsyncAPIView, error_response, parse_json
+from users.presentation.serializers.auth_serializers import RegisterSerializer, LoginSerializer
+from users.infrastructure.services.hashing_pool import HashingPoolSaturated
+from users.presentation.throttles import acheck_login_throttle
+from core.container import container
+
+# Injection de dépendances : le hachage passe par le pool borné du processus
+def get_async_auth_service():
+    return container.resolve("async_auth_service")
+
+
+def _throttled_response(wait):
+    # Même réponse que le limiteur de LoginView sous DRF
+    response = error_response(Throttled(wait))
+    response["Retry-After"] = str(math.ceil(wait))
+    return response
+
+
+def _saturated_response(error):
+    response = JsonResponse({"error": str(error)}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+    response["Retry-After"] = "1"
+    return response
+
+
+class AsyncRegisterView(AsyncAPIView):
+    """
+    Variante asynchrone de RegisterView, à servir via core/asgi.py.
+    Le hachage du mot de passe s'exécute dans le pool de hachage borné.
+    """
+    http_method_names = ["post"]
+
+    async def post(self, request):
+        data = parse_json(request)
+        if data is None:
+            return JsonResponse({"error": "JSON invalide."}, status=status.HTTP_400_BAD_REQUEST)
+
+        serializer = RegisterSerializer(data=data)
+        if not serializer.is_valid():
+            return JsonResponse(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            auth_service = get_async_auth_service()
+            user = await auth_service.aregister_user(
+                email=serializer.validated_data["email"],
+                password=serializer.validated_data["password"],
+                full_name=serializer.validated_data["full_name"],
+            )
+            return JsonResponse({
+                "message": "Utilisateur créé avec succès.",
+                "user": {
+                    "id": user.id,
+                    "email": user.email,
+                    "full_name": user.full_name,
+                }
+            }, status=status.HTTP_201_CREATED)
+        except HashingPoolSaturated as e:
+            return _saturated_response(e)
+        except ValueError as e:
+            return JsonResponse({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+
+class AsyncLoginView(AsyncAPIView):
+    """
+    Variante asynchrone de LoginView, à servir via core/asgi.py.
+    La vérification du mot de passe s'exécute dans le pool de hachage borné.
+    """
+    http_method_names = ["post"]
+
+    async def post(self, request):
+        data = parse_json(request)
+        if data is None:
+            return JsonResponse({"error": "JSON invalide."}, status=status.HTTP_400_BAD_REQUEST)
+
+        wait = await acheck_login_throttle(request, data.get("email") if isinstance(data, dict) else None)
+        if wait:
+            return _throttled_response(wait)
+
+        serializer = LoginSerializer(data=data)
+        if not serializer.is_valid():
+            return JsonResponse(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            auth_service = get_async_auth_service()
+            data = await auth_service.alogin_user(**serializer.validated_data)
+            return JsonResponse(data, status=status.HTTP_200_OK)
+        except HashingPoolSaturated as e:
+            return _saturated_response(e)
+        except ValueError as e:
+            return JsonResponse({"error": str(e)}, status=status.HTTP_401_UNAUTHORIZED)
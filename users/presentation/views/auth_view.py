@@ -2,17 +2,12 @@ from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.views import APIView
 from users.presentation.serializers.auth_serializers import RegisterSerializer, LoginSerializer
-from users.application.services.auth_service import AuthService
-from users.infrastructure.repositories.user_repository import UserRepository
-from users.infrastructure.services.django_password_hasher import DjangoPasswordHasher
-from users.infrastructure.services.jwt_token_generator import JWTTokenGenerator
+from users.presentation.throttles import LoginRateThrottle
+from core.container import container
 
-# Injection de dépendances
+# Injection de dépendances : service construit une fois par processus (core/container.py)
 def get_auth_service():
-    user_repository = UserRepository()
-    password_hasher = DjangoPasswordHasher()
-    token_generator = JWTTokenGenerator()
-    return AuthService(user_repository, password_hasher, token_generator)
+    return container.resolve("auth_service")
 
 class RegisterView(APIView):
     def post(self, request):
@@ -21,7 +16,11 @@ class RegisterView(APIView):
 
         try:
             auth_service = get_auth_service()
-            user = auth_service.register_user(**serializer.validated_data)
+            user = auth_service.register_user(
+                email=serializer.validated_data["email"],
+                password=serializer.validated_data["password"],
+                full_name=serializer.validated_data["full_name"],
+            )
             return Response({
                 "message": "Utilisateur créé avec succès.",
                 "user": {
@@ -34,6 +33,10 @@ class RegisterView(APIView):
             return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
 class LoginView(APIView):
+    # Pas d'authentification JWT : le limiteur passe avant tout accès à la base
+    authentication_classes = []
+    throttle_classes = [LoginRateThrottle]
+
     def post(self, request):
         serializer = LoginSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
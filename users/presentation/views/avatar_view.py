@@ -0,0 +1,42 @@
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from users.presentation.serializers.avatar_serializers import AvatarUploadSerializer
+from users.infrastructure.services.avatar_pipeline import MAX_UPLOAD_SIZE, LimitedTemporaryFileUploadHandler
+from core.container import container
+
+# Injection de dépendances : service construit une fois par processus (core/container.py)
+def get_avatar_service():
+    return container.resolve("avatar_service")
+
+class AvatarUploadView(APIView):
+    permission_classes = [IsAuthenticated]
+    max_upload_size = MAX_UPLOAD_SIZE
+
+    def initialize_request(self, request, *args, **kwargs):
+        # L'upload est écrit sur disque par morceaux et abandonné au-delà de la limite
+        self.upload_handler = LimitedTemporaryFileUploadHandler(request, self.max_upload_size)
+        request.upload_handlers = [self.upload_handler]
+        return super().initialize_request(request, *args, **kwargs)
+
+    def post(self, request):
+        serializer = AvatarUploadSerializer(data=request.data)
+        if self.upload_handler.too_large:
+            return Response(
+                {"error": f"L'image ne doit pas dépasser {self.max_upload_size // (1024 * 1024)} Mo."},
+                status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            )
+        serializer.is_valid(raise_exception=True)
+
+        try:
+            avatar_service = get_avatar_service()
+            user = avatar_service.update_avatar(request.user.id, serializer.validated_data["avatar"])
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        # Les miniatures sont générées en arrière-plan : avatar_variants se remplit ensuite
+        return Response({
+            "avatar": user.avatar,
+            "avatar_variants": user.avatar_variants,
+        }, status=status.HTTP_202_ACCEPTED)
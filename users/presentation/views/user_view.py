@@ -1,3 +1,4 @@
+from django.http import JsonResponse
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
 
@@ -7,3 +8,10 @@ def ping(request):
     Simple health check endpoint.
     """
     return Response({"message": "pong 🏓 test"})
+
+
+async def aping(request):
+    """
+    Variante asynchrone de ping, servie sur la boucle d'événements sous ASGI.
+    """
+    return JsonResponse({"message": "pong 🏓 test"})
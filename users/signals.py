@@ -0,0 +1,13 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from users.infrastructure.models.user_model import UserModel
+from users.infrastructure.services.jwt_authentication import invalidate_cached_user
+from users.infrastructure.services.user_cache import invalidate_user
+
+
+@receiver(post_save, sender=UserModel)
+@receiver(post_delete, sender=UserModel)
+def invalidate_authentication_cache(sender, instance, **kwargs):
+    """Toute sauvegarde (mot de passe, is_active, ...) invalide l'utilisateur en cache."""
+    invalidate_cached_user(instance.pk)
+    invalidate_user(instance.pk)
@@ -1,3 +1,1084 @@
-from django.test import TestCase
+import asyncio
+import json
+import tempfile
+import threading
+import time
+import uuid
+from io import BytesIO, StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.hashers import PBKDF2PasswordHasher, make_password
+from django.contrib.auth.models import Group
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import OperationalError, connections
+from django.db.migrations.executor import MigrationExecutor
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, TransactionTestCase, override_settings
+from PIL import Image
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+
+from core import metrics
+from core.container import Container, container
+from core.rate_limit import SlidingWindowLimiter, parse_rate
+from core.db_router import (
+    ReplicaFailureWrapper,
+    ReplicaRouter,
+    ReplicaRoutingMiddleware,
+    is_replica_down,
+    reset_replica_health,
+    routing_scope,
+)
+from core.identity_map import identity_map_scope
+from core.lru_cache import LRUTTLCache
+from users.domain.entities.user import User
+from users.infrastructure.models.user_model import UserModel
+from users.infrastructure.mappers.user_mapper import UserMapper
+from users.infrastructure.repositories.user_repository import UserRepository
+from users.infrastructure.repositories.cached_user_repository import CachedUserRepository
+from users.infrastructure.services import avatar_pipeline, calibrated_hashers, jwt_authentication
+from users.infrastructure.services.avatar_urls import clear_avatar_url_cache
+from users.infrastructure.services.django_password_hasher import DjangoPasswordHasher
+from users.infrastructure.services.jwt_authentication import clear_user_cache
+from users.infrastructure.services.hashing_pool import BoundedHashingPool, HashingPoolSaturated
+from users.infrastructure.services.jwt_token_generator import StatelessJWTTokenGenerator
+from users.infrastructure.services.password_rehasher import DeferredPasswordRehasher
+from users.infrastructure.services.user_cache import user_cache
+from users.presentation.views.avatar_view import AvatarUploadView
+
+
+class IdentityMapUserRepositoryTests(TestCase):
+    def setUp(self):
+        self.user_model = UserModel.objects.create_user(
+            email="alice@example.com", password="motdepasse123", full_name="Alice Martin"
+        )
+        self.repository = UserRepository()
+
+    def test_get_by_id_is_served_from_memory_within_a_request(self):
+        with identity_map_scope():
+            with self.assertNumQueries(1):
+                first = self.repository.get_by_id(self.user_model.id)
+                second = self.repository.get_by_id(self.user_model.id)
+        self.assertIs(first, second)
+
+    def test_get_by_email_then_get_by_id_shares_the_same_entity(self):
+        with identity_map_scope():
+            with self.assertNumQueries(1):
+                by_email = self.repository.get_by_email("alice@example.com")
+                by_id = self.repository.get_by_id(self.user_model.id)
+                self.assertTrue(self.repository.exists_by_email("alice@example.com"))
+        self.assertIs(by_email, by_id)
+
+    def test_nothing_is_cached_outside_a_request(self):
+        with self.assertNumQueries(2):
+            self.repository.get_by_id(self.user_model.id)
+            self.repository.get_by_id(self.user_model.id)
+
+
+class CachedUserRepositoryTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user_model = UserModel.objects.create_user(
+            email="alice@example.com", password="motdepasse123", full_name="Alice Martin"
+        )
+        self.repository = CachedUserRepository()
+
+    def get(self):
+        with identity_map_scope():
+            return self.repository.get_by_id(self.user_model.id)
+
+    def test_get_by_id_is_cached_and_invalidated_on_save(self):
+        self.get()
+        with self.assertNumQueries(0):
+            user = self.get()
+        self.assertEqual(user.full_name, "Alice Martin")
+        # Le hash du mot de passe ne passe jamais par le cache partagé
+        self.assertIsNone(user.password_hash)
+
+        self.user_model.full_name = "Alice Dupont"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user_model.save()
+        self.assertEqual(self.get().full_name, "Alice Dupont")
+
+    def test_cached_row_excludes_password_hash(self):
+        self.get()
+        row = cache.get(user_cache.key(self.user_model.id))
+        self.assertEqual(len(row), len(UserMapper.CACHE_FIELDS))
+        self.assertNotIn(self.user_model.password, row)
+
+    def test_login_reads_password_hash_from_database_after_cached_read(self):
+        with identity_map_scope():
+            self.assertIsNone(self.repository.get_by_id(self.user_model.id).password_hash)
+            user = UserRepository().get_by_email("alice@example.com")
+        self.assertEqual(user.password_hash, self.user_model.password)
+        response = self.client.post(
+            "/api/login/", {"email": "alice@example.com", "password": "motdepasse123"},
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 200)
+
+    def test_updates_that_bypass_save_invalidate_the_entry(self):
+        self.get()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.repository.set_avatar(self.user_model.id, "avatars/nouveau.png")
+        self.assertEqual(self.get().avatar, "/media/avatars/nouveau.png")
+
+
+class UserMapperTests(TestCase):
+    FIELDS = (
+        "id", "email", "full_name", "password_hash", "avatar", "avatar_variants",
+        "is_active", "is_staff", "date_joined",
+    )
+
+    def setUp(self):
+        clear_avatar_url_cache()
+        self.with_avatar = UserModel.objects.create_user(
+            email="Alice@Example.com", password="motdepasse123", full_name="Alice Martin",
+            avatar="avatars/alice.png", avatar_hash="a1b2c3", is_staff=True,
+        )
+        self.without_avatar = UserModel.objects.create_user(
+            email="bob@example.com", password="motdepasse123", full_name="Bob Durand", is_active=False,
+        )
+
+    def fields(self, user):
+        return {field: getattr(user, field) for field in self.FIELDS}
+
+    def test_to_entities_matches_to_entity(self):
+        queryset = UserModel.objects.order_by("email")
+        bulk = list(UserMapper.to_entities(queryset, chunk_size=1))
+        single = [UserMapper.to_entity(user_model) for user_model in queryset]
+
+        self.assertEqual([self.fields(user) for user in bulk], [self.fields(user) for user in single])
+        # Email en minuscules sur les deux chemins, comme la validation de l'entité
+        self.assertEqual(bulk[0].email, "alice@example.com")
+
+    def test_avatar_and_variants_are_resolved_or_none_on_both_paths(self):
+        queryset = UserModel.objects.filter(pk=self.with_avatar.pk)
+        bulk, single = next(UserMapper.to_entities(queryset)), UserMapper.to_entity(queryset.get())
+        self.assertEqual(bulk.avatar, "/media/avatars/alice.png")
+        self.assertEqual(bulk.avatar_variants, single.avatar_variants)
+        self.assertTrue(bulk.avatar_variants)
+
+        queryset = UserModel.objects.filter(pk=self.without_avatar.pk)
+        bulk, single = next(UserMapper.to_entities(queryset)), UserMapper.to_entity(queryset.get())
+        self.assertIsNone(bulk.avatar)
+        self.assertIsNone(single.avatar)
+        self.assertEqual(bulk.avatar_variants, {})
+        self.assertEqual(single.avatar_variants, {})
+
+    def test_bulk_path_costs_the_same_single_query(self):
+        UserModel.objects.bulk_create(
+            UserModel(email=f"user{i}@example.com", full_name=f"User {i}", password="!") for i in range(100)
+        )
+        with self.assertNumQueries(1):
+            bulk = list(UserMapper.to_entities(UserModel.objects.all()))
+        with self.assertNumQueries(1):
+            single = [UserMapper.to_entity(user_model) for user_model in UserModel.objects.all()]
+        self.assertEqual(len(bulk), len(single))
+
+
+class SlottedUserTests(TestCase):
+    def test_user_has_no_instance_dict(self):
+        for cls in (User, *User.__subclasses__()):
+            for base in cls.__mro__[:-1]:
+                self.assertIn("__slots__", vars(base), base.__qualname__)
+        user = User(id=None, email="Alice@Example.com", full_name=" Alice Martin ")
+        self.assertFalse(hasattr(user, "__dict__"))
+        with self.assertRaises(AttributeError):
+            user.attribut_inconnu = 1
+
+    def test_validation_is_unchanged(self):
+        user = User(id=None, email="Alice@Example.com", full_name=" Alice Martin ")
+        self.assertEqual(user.email, "alice@example.com")
+        self.assertEqual(user.full_name, "Alice Martin")
+        with self.assertRaises(ValueError):
+            User(id=None, email="pas-un-email", full_name="Alice")
+        with self.assertRaises(ValueError):
+            User(id=None, email="alice@example.com", full_name="   ")
+
+    def test_equality_and_hash_follow_the_id(self):
+        user = User(id=None, email="alice@example.com", full_name="Alice")
+        trusted = User.from_trusted(user.id, "autre@example.com", "Autre", None, None, True, False, None)
+        self.assertEqual(user, trusted)
+        self.assertEqual(len({user, trusted}), 1)
+        self.assertNotEqual(user, User(id=None, email="alice@example.com", full_name="Alice"))
+
+
+class AuthQueryBudgetTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        UserModel.objects.create_user(
+            email="alice@example.com", password="motdepasse123", full_name="Alice Martin"
+        )
+
+    def test_login_query_budget(self):
+        # Lecture de l'utilisateur par email ; le générateur de tokens réutilise le modèle chargé
+        with self.assertNumQueries(1):
+            response = self.client.post(
+                "/api/login/",
+                {"email": "alice@example.com", "password": "motdepasse123"},
+                format="json",
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("access", response.data)
+
+
+class RegistrationTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.payload = {
+            "email": "bob@example.com",
+            "full_name": "Bob Durand",
+            "password": "motdepasse123",
+            "password_confirm": "motdepasse123",
+        }
+
+    def test_register_is_a_single_insert(self):
+        # Savepoint + INSERT + libération du savepoint (TestCase tourne dans une transaction)
+        with self.assertNumQueries(3):
+            response = self.client.post("/api/register/", self.payload, format="json")
+        self.assertEqual(response.status_code, 201)
+        self.assertIsNotNone(UserModel.objects.get(email="bob@example.com").date_joined)
+
+    def test_password_is_hashed_once_and_stored_as_is(self):
+        # Le repository ne rehache pas le hash calculé par le service (set_password)
+        with mock.patch.object(DjangoPasswordHasher, "hash", wraps=DjangoPasswordHasher().hash) as hash_:
+            self.client.post("/api/register/", self.payload, format="json")
+        hash_.assert_called_once_with("motdepasse123")
+        self.assertTrue(UserModel.objects.get(email="bob@example.com").check_password("motdepasse123"))
+        response = self.client.post(
+            "/api/login/", {"email": "bob@example.com", "password": "motdepasse123"}, format="json"
+        )
+        self.assertEqual(response.status_code, 200)
+
+    def test_async_registration_stores_a_verifiable_hash(self):
+        response = self.client.post("/api/async/register/", self.payload, format="json")
+        self.assertEqual(response.status_code, 201)
+        self.assertTrue(UserModel.objects.get(email="bob@example.com").check_password("motdepasse123"))
+
+    def test_duplicate_email_is_reported_by_the_unique_constraint(self):
+        self.client.post("/api/register/", self.payload, format="json")
+
+        response = self.client.post("/api/register/", self.payload, format="json")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data["error"], "Un utilisateur avec cet email existe déjà.")
+        self.assertEqual(UserModel.objects.count(), 1)
+
+    def test_async_duplicate_email(self):
+        self.client.post("/api/async/register/", self.payload, format="json")
+
+        response = self.client.post("/api/async/register/", self.payload, format="json")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()["error"], "Un utilisateur avec cet email existe déjà.")
+
+
+class BaselineMigrationTests(TransactionTestCase):
+    """Une base migrée avec l'ancien 0001_initial (modèle « User ») rejoint le schéma actuel."""
+
+    def migrate(self, targets):
+        executor = MigrationExecutor(connections["default"])
+        executor.migrate(targets or executor.loader.graph.leaf_nodes())
+
+    def test_baseline_database_migrates_to_usermodel(self):
+        self.addCleanup(self.migrate, None)
+        self.migrate([("admin", None), ("projects", None), ("users", None)])
+        self.migrate([("users", "0001_initial"), ("projects", "0001_initial")])
+        tables = connections["default"].introspection.table_names()
+        self.assertIn("users_user", tables)
+
+        self.migrate(None)
+
+        tables = connections["default"].introspection.table_names()
+        self.assertNotIn("users_user", tables)
+        user = UserModel.objects.create_user(email="alice@example.com", password="motdepasse123", full_name="Alice")
+        user.groups.add(Group.objects.create(name="Équipe"))
+        self.assertIsInstance(user.pk, uuid.UUID)
+        self.assertEqual(list(user.groups.values_list("name", flat=True)), ["Équipe"])
+
+
+class ConcurrentRegistrationTests(TransactionTestCase):
+    def test_only_one_concurrent_registration_wins(self):
+        from users.presentation.views.auth_view import get_auth_service
+        from django.db import connection
+
+        attempts = 4
+        barrier = threading.Barrier(attempts)
+        results = []
+
+        def register():
+            barrier.wait()
+            try:
+                get_auth_service().register_user(email="race@example.com", password="motdepasse123", full_name="Race")
+                results.append("created")
+            except ValueError as e:
+                results.append(str(e))
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=register) for _ in range(attempts)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(results.count("created"), 1)
+        self.assertEqual(results.count("Un utilisateur avec cet email existe déjà."), attempts - 1)
+        self.assertEqual(UserModel.objects.filter(email="race@example.com").count(), 1)
+
+
+class StatelessJWTTokenGeneratorTests(TestCase):
+    def setUp(self):
+        self.user_model = UserModel.objects.create_user(
+            email="alice@example.com", password="motdepasse123", full_name="Alice Martin"
+        )
+        self.user = UserMapper.to_entity(self.user_model)
+
+    def test_tokens_have_the_same_claims_as_for_user(self):
+        with self.assertNumQueries(0):
+            tokens = StatelessJWTTokenGenerator().generate_tokens(self.user)
+        expected = RefreshToken.for_user(self.user_model)
+
+        refresh = RefreshToken(tokens["refresh"])
+        access = AccessToken(tokens["access"])
+        self.assertEqual(set(refresh.payload), set(expected.payload))
+        self.assertEqual(set(access.payload), set(expected.access_token.payload))
+        self.assertEqual(access["user_id"], str(self.user_model.id))
+
+    def test_extra_claims_hook(self):
+        generator = StatelessJWTTokenGenerator(extra_claims=lambda user: {"email": user.email})
+        tokens = generator.generate_tokens(self.user)
+        self.assertEqual(AccessToken(tokens["access"])["email"], "alice@example.com")
+
+
+class AsyncLoginViewTests(TestCase):
+    def setUp(self):
+        UserModel.objects.create_user(
+            email="alice@example.com", password="motdepasse123", full_name="Alice Martin"
+        )
+
+    async def test_async_login_returns_tokens(self):
+        response = await self.async_client.post(
+            "/api/async/login/",
+            {"email": "alice@example.com", "password": "motdepasse123"},
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("access", response.json())
+
+    async def test_async_login_rejects_bad_password(self):
+        response = await self.async_client.post(
+            "/api/async/login/",
+            {"email": "alice@example.com", "password": "mauvais-mot-de-passe"},
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 401)
+
+
+class BoundedHashingPoolTests(TestCase):
+    def test_rejects_immediately_when_saturated(self):
+        pool = BoundedHashingPool(max_workers=1, max_queue=0)
+        release = threading.Event()
+
+        async def scenario():
+            busy = asyncio.ensure_future(pool.run(release.wait))
+            await asyncio.sleep(0.01)
+            with self.assertRaises(HashingPoolSaturated):
+                await pool.run(lambda: None)
+            release.set()
+            await busy
+
+        try:
+            asyncio.run(scenario())
+        finally:
+            pool.shutdown()
+        self.assertEqual(pool.in_flight, 0)
+
+    def test_cancelled_caller_keeps_slot_until_thread_finishes(self):
+        pool = BoundedHashingPool(max_workers=1, max_queue=0)
+        started, release = threading.Event(), threading.Event()
+
+        def hash_():
+            started.set()
+            release.wait()
+
+        async def scenario():
+            busy = asyncio.ensure_future(pool.run(hash_))
+            await asyncio.to_thread(started.wait)
+            busy.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await busy
+            # Le thread calcule encore : la place reste prise
+            self.assertEqual(pool.in_flight, 1)
+            with self.assertRaises(HashingPoolSaturated):
+                await pool.run(lambda: None)
+
+        try:
+            asyncio.run(scenario())
+        finally:
+            release.set()
+            # Attend la fin du thread
+            pool.shutdown()
+        self.assertEqual(pool.in_flight, 0)
+
+
+class CachedJWTAuthenticationTests(TestCase):
+    def setUp(self):
+        clear_user_cache()
+        self.user_model = UserModel.objects.create_user(
+            email="alice@example.com", password="motdepasse123", full_name="Alice Martin"
+        )
+        self.client = APIClient()
+        access = RefreshToken.for_user(self.user_model).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+
+    def test_second_request_does_not_query_the_user(self):
+        self.assertEqual(self.client.post("/api/projects/", {"name": "Projet A"}, format="json").status_code, 201)
+        with self.assertNumQueries(2):
+            self.client.post("/api/projects/", {"name": "Projet B"}, format="json")
+
+    def test_deactivation_takes_effect_immediately(self):
+        self.client.post("/api/projects/", {"name": "Projet A"}, format="json")
+        self.user_model.is_active = False
+        self.user_model.save()
+
+        response = self.client.post("/api/projects/", {"name": "Projet B"}, format="json")
+        self.assertEqual(response.status_code, 401)
+
+    def test_deactivation_reaches_another_process_cache(self):
+        # Deux caches locaux (deux workers) autour du même cache Django
+        other_worker = LRUTTLCache(maxsize=100, ttl=60)
+        self.client.post("/api/projects/", {"name": "Projet A"}, format="json")
+        with mock.patch.object(jwt_authentication, "_user_cache", other_worker):
+            self.client.post("/api/projects/", {"name": "Projet B"}, format="json")
+        self.assertEqual(len(other_worker), 1)
+
+        # Sauvegarde dans le premier worker : le second n'est pas prévenu directement
+        self.user_model.is_active = False
+        self.user_model.save()
+        self.assertEqual(len(other_worker), 1)
+
+        with mock.patch.object(jwt_authentication, "_user_cache", other_worker):
+            response = self.client.post("/api/projects/", {"name": "Projet C"}, format="json")
+        self.assertEqual(response.status_code, 401)
+
+    @override_settings(JWT_USER_CACHE={"ENABLED": None})
+    def test_process_local_cache_backend_disables_the_cache(self):
+        # LocMemCache n'est pas partagé entre workers : les invalidations n'y circuleraient pas
+        self.assertFalse(jwt_authentication.user_cache_enabled())
+        self.client.post("/api/projects/", {"name": "Projet A"}, format="json")
+        with self.assertNumQueries(3):
+            self.client.post("/api/projects/", {"name": "Projet B"}, format="json")
+
+        with override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+                                                   "LOCATION": tempfile.gettempdir()}}):
+            self.assertTrue(jwt_authentication.user_cache_enabled())
+
+
+class LazyAvatarUrlTests(TestCase):
+    def setUp(self):
+        clear_avatar_url_cache()
+        UserModel.objects.bulk_create(
+            UserModel(email=f"user{i}@example.com", full_name=f"User {i}", password="!", avatar="avatars/commun.png")
+            for i in range(50)
+        )
+        self.storage = UserModel._meta.get_field("avatar").storage
+
+    def test_mapping_does_not_touch_the_storage(self):
+        with mock.patch.object(self.storage, "url", wraps=self.storage.url) as url:
+            users = list(UserMapper.to_entities(UserModel.objects.all()))
+            users += [UserMapper.to_entity(user_model) for user_model in UserModel.objects.all()]
+            self.assertEqual(url.call_count, 0)
+
+            self.assertEqual(users[0].avatar, "/media/avatars/commun.png")
+            self.assertEqual(users[-1].avatar, "/media/avatars/commun.png")
+            # Même fichier, même stockage : une seule résolution grâce au cache
+            self.assertEqual(url.call_count, 1)
+
+
+def make_image(size=(400, 300), image_format="PNG"):
+    buffer = BytesIO()
+    Image.new("RGB", size, (200, 30, 30)).save(buffer, format=image_format)
+    return buffer.getvalue()
+
+
+class AvatarPipelineTests(TestCase):
+    def setUp(self):
+        clear_avatar_url_cache()
+        self.user_model = UserModel.objects.create_user(email="avatar@example.com", full_name="Avatar", password="secret123")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user_model)
+        self.storage = UserModel._meta.get_field("avatar").storage
+
+    def upload(self, content, name="avatar.png"):
+        with mock.patch.object(avatar_pipeline.AvatarProcessor, "schedule") as schedule:
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.client.post(
+                    "/api/me/avatar/", {"avatar": SimpleUploadedFile(name, content)}, format="multipart"
+                )
+        return response, schedule
+
+    def test_upload_stores_original_and_schedules_thumbnails(self):
+        response, schedule = self.upload(make_image())
+
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.data["avatar_variants"], {})
+        user_id, name, sha = schedule.call_args.args
+        self.assertEqual(name, f"avatars/{sha}.png")
+        self.assertTrue(self.storage.exists(name))
+
+        avatar_pipeline.process_avatar(user_id, name, sha)
+
+        user = UserMapper.to_entity(UserModel.objects.get(pk=self.user_model.pk))
+        self.assertEqual(set(user.avatar_variants), set(avatar_pipeline.THUMBNAIL_SIZES))
+        for size in avatar_pipeline.THUMBNAIL_SIZES:
+            for image_format in avatar_pipeline.THUMBNAIL_FORMATS:
+                thumbnail = avatar_pipeline.thumbnail_name(sha, size, image_format)
+                self.assertEqual(user.avatar_variants[size][image_format], self.storage.url(thumbnail))
+                with self.storage.open(thumbnail) as f, Image.open(f) as image:
+                    self.assertEqual(max(image.size), size)
+
+    def test_new_upload_hides_previous_variants(self):
+        _, schedule = self.upload(make_image())
+        avatar_pipeline.process_avatar(*schedule.call_args.args)
+
+        self.upload(make_image(size=(300, 300)))
+
+        user = list(UserMapper.to_entities(UserModel.objects.filter(pk=self.user_model.pk)))[0]
+        self.assertEqual(user.avatar_variants, {})
+
+    def test_rejects_invalid_images(self):
+        response, schedule = self.upload(b"pas une image", name="avatar.png")
+        self.assertEqual(response.status_code, 400)
+
+        response, schedule = self.upload(make_image(size=(10, 10)))
+        self.assertEqual(response.status_code, 400)
+        schedule.assert_not_called()
+
+    def test_rejects_oversized_upload_without_buffering_it(self):
+        with mock.patch.object(AvatarUploadView, "max_upload_size", 1024):
+            response, schedule = self.upload(make_image(size=(1000, 1000)))
+
+        self.assertEqual(response.status_code, 413)
+        schedule.assert_not_called()
+
+
+class ImportUsersCommandTests(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        UserModel.objects.create_user(email="existant@example.com", full_name="Existant", password="secret123")
+
+    def write(self, name, content):
+        path = f"{self.directory.name}/{name}"
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(content)
+        return path
+
+    def call(self, *args):
+        out, err = StringIO(), StringIO()
+        call_command("import_users", *args, stdout=out, stderr=err)
+        return out.getvalue(), err.getvalue()
+
+    def test_csv_import_skips_duplicates_and_invalid_rows(self):
+        path = self.write("users.csv", "\n".join([
+            "email,full_name,password",
+            "alice@example.com,Alice,motdepasse1",
+            "bob@example.com,Bob,motdepasse2",
+            "existant@example.com,Existant,motdepasse3",
+            "alice@example.com,Alice bis,motdepasse4",
+            "pas-un-email,Invalide,motdepasse5",
+        ]))
+
+        out, err = self.call(path, "--workers", "0", "--batch-size", "2")
+
+        self.assertIn("2 créé(s), 2 doublon(s), 1 invalide(s)", out)
+        self.assertIn("utilisateurs/s", out)
+        self.assertIn("Enregistrement 5", err)
+        self.assertTrue(UserModel.objects.get(email="alice@example.com").check_password("motdepasse1"))
+
+    def test_mixed_case_email_is_imported_lowercase_and_can_log_in(self):
+        path = self.write("users.csv", "email,full_name,password\n Mixed.Case@Example.COM ,Mixte,motdepasse1\n")
+
+        self.call(path, "--workers", "0")
+
+        self.assertTrue(UserModel.objects.filter(email="mixed.case@example.com").exists())
+        response = self.client.post(
+            "/api/login/", {"email": "Mixed.Case@Example.COM", "password": "motdepasse1"},
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 200)
+
+    def test_passwords_are_hashed_in_a_process_pool(self):
+        path = self.write("users.ndjson", "\n".join(
+            json.dumps({"email": f"user{i}@example.com", "full_name": f"User {i}", "password": f"motdepasse{i}"})
+            for i in range(10)
+        ))
+
+        self.call(path, "--workers", "2", "--batch-size", "4")
+
+        self.assertEqual(UserModel.objects.filter(email__startswith="user").count(), 10)
+        self.assertTrue(UserModel.objects.get(email="user7@example.com").check_password("motdepasse7"))
+
+    def test_pre_hashed_passwords_are_stored_as_is(self):
+        password_hash = make_password("motdepasse")
+        path = self.write("users.ndjson", "\n".join([
+            json.dumps({"email": "carol@example.com", "full_name": "Carol", "password": password_hash}),
+            json.dumps({"email": "dave@example.com", "full_name": "Dave", "password": "en-clair"}),
+        ]))
+
+        out, _ = self.call(path, "--pre-hashed")
+
+        self.assertEqual(UserModel.objects.get(email="carol@example.com").password, password_hash)
+        self.assertFalse(UserModel.objects.filter(email="dave@example.com").exists())
+        self.assertIn("1 invalide(s)", out)
+
+    def test_resumes_from_checkpoint(self):
+        path = self.write("users.ndjson", "\n".join(
+            json.dumps({"email": f"user{i}@example.com", "full_name": f"User {i}"}) for i in range(5)
+        ))
+        checkpoint = self.write("import.checkpoint", json.dumps({"path": path, "position": 3}))
+
+        out, _ = self.call(path, "--workers", "0", "--checkpoint", checkpoint)
+
+        self.assertIn("Reprise après 3", out)
+        self.assertEqual(
+            sorted(UserModel.objects.filter(email__startswith="user").values_list("email", flat=True)),
+            ["user3@example.com", "user4@example.com"],
+        )
+        with open(checkpoint) as f:
+            self.assertEqual(json.load(f)["position"], 5)
+
+
+@override_settings(REPLICA_ROUTING={**settings.REPLICA_ROUTING, "REPLICAS": ["replica_1"], "STICKY_SECONDS": 5})
+class ReplicaRoutingTests(TransactionTestCase):
+    databases = {"default", "replica_1", "replica_2"}
+
+    def setUp(self):
+        reset_replica_health()
+        cache.clear()
+        self.addCleanup(reset_replica_health)
+        # Utilisateur présent sur le seul « réplica » : le lire prouve que la lecture y est partie
+        UserModel.objects.db_manager("replica_1").create_user(
+            email="replica@example.com", password="motdepasse123", full_name="Réplica"
+        )
+
+    def _read_database(self, request):
+        def get_response(request):
+            return HttpResponse(ReplicaRouter().db_for_read(UserModel))
+        return ReplicaRoutingMiddleware(get_response)(request).content.decode()
+
+    def test_reads_go_to_replica(self):
+        with routing_scope():
+            self.assertIsNotNone(UserRepository().get_by_email("replica@example.com"))
+        # Hors requête, les lectures restent sur le primaire
+        self.assertIsNone(UserRepository().get_by_email("replica@example.com"))
+
+    def test_write_pins_following_reads_to_primary(self):
+        repository = UserRepository()
+        with routing_scope() as state:
+            repository.create_user(UserMapper.to_entity(UserModel(email="new@example.com", full_name="New", password="!")))
+            self.assertTrue(state.wrote)
+            # Absent du réplica (pas de réplication en test) : lu sur le primaire
+            self.assertIsNotNone(repository.get_by_email("new@example.com"))
+
+    def test_cookie_keeps_user_on_primary_after_write(self):
+        response = self.client.post(
+            "/api/register/",
+            {
+                "email": "sticky@example.com", "password": "motdepasse123",
+                "password_confirm": "motdepasse123", "full_name": "Sticky",
+            },
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertIn("primary_db_until", response.cookies)
+
+        factory = RequestFactory()
+        self.assertEqual(self._read_database(factory.get("/")), "replica_1")
+        request = factory.get("/")
+        request.COOKIES["primary_db_until"] = response.cookies["primary_db_until"].value
+        self.assertEqual(self._read_database(request), "default")
+
+    def test_token_claim_keeps_user_on_primary_after_write(self):
+        user = UserModel.objects.create_user(email="api@example.com", password="motdepasse123", full_name="API")
+        headers = {"HTTP_AUTHORIZATION": f"Bearer {AccessToken.for_user(user)}"}
+        factory = RequestFactory()
+        self.assertEqual(self._read_database(factory.get("/", **headers)), "replica_1")
+
+        def write(request):
+            UserModel.objects.filter(id=user.id).update(full_name="API modifié")
+            return HttpResponse()
+        ReplicaRoutingMiddleware(write)(factory.post("/", **headers))
+
+        self.assertEqual(self._read_database(factory.get("/", **headers)), "default")
+
+    @override_settings(REPLICA_ROUTING={**settings.REPLICA_ROUTING, "REPLICAS": ["replica_2", "replica_1"]})
+    def test_unreachable_replica_is_marked_down(self):
+        replica = connections["replica_2"]
+        name = replica.settings_dict["NAME"]
+        replica.close()
+        replica.settings_dict["NAME"] = "/nonexistent/replica.sqlite3"
+
+        def restore():
+            replica.close()
+            replica.settings_dict["NAME"] = name
+        self.addCleanup(restore)
+
+        failures = metrics.REGISTRY.get("db_replica_failures_total")
+        before = failures.value(database="replica_2")
+        # Ordre des candidats fixé : replica_2 est essayé en premier
+        with mock.patch("core.db_router.random.shuffle"):
+            for _ in range(5):
+                with routing_scope():
+                    self.assertEqual(ReplicaRouter().db_for_read(UserModel), "replica_1")
+        self.assertTrue(is_replica_down("replica_2"))
+        # Écarté après la première erreur : une seule tentative de connexion
+        self.assertEqual(failures.value(database="replica_2"), before + 1)
+
+    def test_query_error_marks_replica_down(self):
+        with connections["replica_1"].execute_wrapper(ReplicaFailureWrapper("replica_1")):
+            with self.assertRaises(OperationalError):
+                with connections["replica_1"].cursor() as cursor:
+                    cursor.execute("SELECT * FROM table_inexistante")
+        self.assertTrue(is_replica_down("replica_1"))
+        with routing_scope():
+            self.assertEqual(ReplicaRouter().db_for_read(UserModel), "default")
+
+
+class PasswordHashTimingTests(TestCase):
+    def setUp(self):
+        UserModel.objects.create_user(email="timing@example.com", password="motdepasse123", full_name="Timing")
+        self.payload = {"email": "timing@example.com", "password": "motdepasse123"}
+
+    def test_login_reports_hash_time(self):
+        histogram = metrics.REGISTRY.get("http_request_password_hash_seconds")
+        before = histogram.count(view="LoginView")
+        response = self.client.post("/api/login/", self.payload, content_type="application/json")
+        self.assertEqual(response.status_code, 200)
+        self.assertRegex(response["Server-Timing"], r"hash;dur=[\d.]+")
+        self.assertEqual(histogram.count(view="LoginView"), before + 1)
+
+    async def test_async_login_reports_hash_time(self):
+        response = await self.async_client.post("/api/async/login/", self.payload, content_type="application/json")
+        self.assertEqual(response.status_code, 200)
+        self.assertRegex(response["Server-Timing"], r"hash;dur=[\d.]+")
+
+
+class ServiceContainerTests(TestCase):
+    def test_services_are_built_once_per_process(self):
+        from users.presentation.views.auth_view import get_auth_service
+        from users.presentation.views.async_auth_view import get_async_auth_service
+
+        self.assertIs(get_auth_service(), get_auth_service())
+        # Dépendances partagées entre services
+        self.assertIs(get_auth_service().user_repository, get_async_auth_service().user_repository)
+        self.assertIs(get_async_auth_service().password_hasher.hasher, container.resolve("password_hasher"))
+
+    def test_concurrent_first_resolution_builds_one_instance(self):
+        local = Container()
+        built = []
+
+        def provider(c):
+            built.append(threading.get_ident())
+            time.sleep(0.01)
+            return object()
+
+        local.register("service", provider)
+        barrier = threading.Barrier(8)
+        results = []
+
+        def resolve():
+            barrier.wait()
+            results.append(local.resolve("service"))
+
+        threads = [threading.Thread(target=resolve) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(built), 1)
+        self.assertEqual(len({id(result) for result in results}), 1)
+
+    def test_unknown_service(self):
+        with self.assertRaises(LookupError):
+            Container().resolve("inconnu")
+
+    def test_override_replaces_service_for_the_block_only(self):
+        fake = mock.Mock()
+        fake.login_user.return_value = {"access": "a", "refresh": "r"}
+        payload = {"email": "container@example.com", "password": "motdepasse123"}
+
+        with container.override("auth_service", fake):
+            response = self.client.post("/api/login/", payload, content_type="application/json")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {"access": "a", "refresh": "r"})
+        fake.login_user.assert_called_once_with(**payload)
+
+        response = self.client.post("/api/login/", payload, content_type="application/json")
+        self.assertEqual(response.status_code, 401)
+
+    def test_override_is_local_to_the_current_context(self):
+        seen = []
+        with container.override("auth_service", "remplacé"):
+            thread = threading.Thread(target=lambda: seen.append(container.resolve("auth_service")))
+            thread.start()
+            thread.join()
+        self.assertIsNot(seen[0], "remplacé")
+
+
+CALIBRATED_HASHERS = [
+    "users.infrastructure.services.calibrated_hashers.CalibratedPBKDF2PasswordHasher",
+    "users.infrastructure.services.calibrated_hashers.CalibratedScryptPasswordHasher",
+    "django.contrib.auth.hashers.MD5PasswordHasher",
+]
+
+
+class PasswordRehashTests(TestCase):
+    def setUp(self):
+        clear_user_cache()
+        # Hash MD5 (settings de test) : algorithme dépassé
+        self.user_model = UserModel.objects.create_user(
+            email="rehash@example.com", password="motdepasse123", full_name="Rehash"
+        )
+        self.old_hash = self.user_model.password
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.calibration_file = f"{directory.name}/calibration.json"
+        calibrated_hashers.write_calibration(self.calibration_file, "pbkdf2_sha256", 250, {"iterations": 2000})
+        calibrated_hashers.write_calibration(
+            self.calibration_file, "scrypt", 250, {"work_factor": 2**14, "block_size": 8, "parallelism": 1}
+        )
+        settings_override = override_settings(
+            PASSWORD_HASHERS=CALIBRATED_HASHERS,
+            PASSWORD_HASH_CALIBRATION={"TARGET_MS": 250, "FILE": self.calibration_file, "MIN_ITERATIONS": 1000},
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.payload = {"email": "rehash@example.com", "password": "motdepasse123"}
+
+    def login(self):
+        with mock.patch.object(DeferredPasswordRehasher, "schedule") as schedule:
+            with self.assertNumQueries(1):
+                response = self.client.post("/api/login/", self.payload, content_type="application/json")
+        self.assertEqual(response.status_code, 200)
+        return schedule
+
+    def test_login_defers_rehash_of_outdated_hash(self):
+        self.assertTrue(self.old_hash.startswith("md5$"))
+        schedule = self.login()
+
+        user, password = schedule.call_args.args
+        self.assertEqual((user.id, password), (self.user_model.id, "motdepasse123"))
+        rehasher = container.resolve("password_rehasher")
+        self.assertTrue(rehasher.rehash(user.id, user.password_hash, password))
+
+        new_hash = UserModel.objects.get(pk=self.user_model.pk).password
+        self.assertTrue(new_hash.startswith("pbkdf2_sha256$2000$"))
+        # Hash à jour : plus de recalcul
+        self.login().assert_not_called()
+
+    def test_rehash_does_not_overwrite_a_newer_password(self):
+        self.user_model.set_password("nouveaumotdepasse")
+        self.user_model.save()
+        rehasher = container.resolve("password_rehasher")
+
+        self.assertFalse(rehasher.rehash(self.user_model.id, self.old_hash, "motdepasse123"))
+        self.assertTrue(UserModel.objects.get(pk=self.user_model.pk).check_password("nouveaumotdepasse"))
+
+    def test_async_login_defers_rehash(self):
+        with mock.patch.object(DeferredPasswordRehasher, "schedule") as schedule:
+            response = self.client.post("/api/async/login/", self.payload, content_type="application/json")
+        self.assertEqual(response.status_code, 200)
+        schedule.assert_called_once()
+
+    def test_only_clearly_weaker_hashes_are_upgraded(self):
+        hasher = calibrated_hashers.CalibratedPBKDF2PasswordHasher()
+        salt = hasher.salt()
+        self.assertFalse(hasher.must_update(hasher.encode("motdepasse123", salt, 1800)))
+        self.assertFalse(hasher.must_update(hasher.encode("motdepasse123", salt, 4000)))
+        self.assertTrue(hasher.must_update(hasher.encode("motdepasse123", salt, 1000)))
+
+        scrypt = calibrated_hashers.CalibratedScryptPasswordHasher()
+        self.assertFalse(scrypt.must_update(scrypt.encode("motdepasse123", salt)))
+        # Hash scrypt aux paramètres de Django (parallélisme 5)
+        self.assertTrue(scrypt.must_update(scrypt.encode("motdepasse123", salt, 2**14, 8, 5)))
+
+    def test_calibration_command_reports_and_writes_parameters(self):
+        out = StringIO()
+        # Plancher de Django abaissé : le test ne mesure pas un million d'itérations
+        with mock.patch.object(PBKDF2PasswordHasher, "iterations", 1000):
+            call_command(
+                "calibrate_password_hasher", "--algorithm", "pbkdf2_sha256", "--samples", "1", "--write", stdout=out
+            )
+
+        output = out.getvalue()
+        self.assertRegex(output, r"Hachage : [\d.]+ ms, vérification : [\d.]+ ms")
+        with open(self.calibration_file) as file:
+            stored = json.load(file)
+        self.assertEqual(stored["pbkdf2_sha256"]["target_ms"], 250)
+        self.assertGreaterEqual(stored["pbkdf2_sha256"]["iterations"], 1000)
+        # Les autres algorithmes du fichier sont conservés
+        self.assertEqual(stored["scrypt"]["work_factor"], 2**14)
+        self.assertEqual(
+            calibrated_hashers.CalibratedPBKDF2PasswordHasher().iterations, stored["pbkdf2_sha256"]["iterations"]
+        )
+
+    def test_calibration_never_goes_below_django_iterations(self):
+        parameters = calibrated_hashers.calibrate("pbkdf2_sha256", target_ms=1, min_iterations=1000)
+        self.assertEqual(parameters["iterations"], PBKDF2PasswordHasher.iterations)
+
+    def test_uses_django_parameters_without_file(self):
+        with override_settings(PASSWORD_HASH_CALIBRATION={"TARGET_MS": 250, "FILE": "/inexistant.json"}):
+            with mock.patch.object(calibrated_hashers, "calibrate") as calibrate:
+                with self.assertLogs(calibrated_hashers.logger, "WARNING"):
+                    iterations = calibrated_hashers.CalibratedPBKDF2PasswordHasher().iterations
+                    work_factor = calibrated_hashers.CalibratedScryptPasswordHasher().work_factor
+        # Aucune mesure pendant une requête
+        calibrate.assert_not_called()
+        self.assertEqual(iterations, PBKDF2PasswordHasher.iterations)
+        self.assertEqual(work_factor, 2**14)
+
+
+class SlidingWindowLimiterTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.limiter = SlidingWindowLimiter("test", limit=2, window=60)
+
+    def hit_at(self, now):
+        with mock.patch("core.rate_limit.time.time", return_value=now):
+            wait, self.key = self.limiter.hit("client")
+        return wait
+
+    def release_at(self, now, key):
+        # LocMemCache date ses entrées avec time.time() : même horloge que hit_at
+        with mock.patch("core.rate_limit.time.time", return_value=now):
+            self.limiter.release(key)
+
+    def test_previous_window_is_weighted_by_remaining_overlap(self):
+        self.assertEqual(self.hit_at(600), 0)
+        self.assertEqual(self.hit_at(610), 0)
+        self.assertGreater(self.hit_at(620), 0)
+        # 30 s dans la fenêtre suivante : la précédente compte pour moitié (2 x 0.5)
+        self.assertEqual(self.hit_at(690), 0)
+        self.assertGreater(self.hit_at(690), 0)
+        # Fenêtre précédente presque écoulée
+        self.assertEqual(self.hit_at(719), 0)
+
+    def test_rejected_attempts_are_not_counted(self):
+        self.hit_at(600)
+        self.hit_at(600)
+        for _ in range(10):
+            self.assertGreater(self.hit_at(601), 0)
+        self.assertEqual(self.hit_at(690), 0)
+
+    def test_release_gives_back_a_counted_attempt(self):
+        self.hit_at(600)
+        self.hit_at(600)
+        self.release_at(600, self.key)
+        self.assertEqual(self.hit_at(601), 0)
+        self.assertGreater(self.hit_at(601), 0)
+
+    def test_release_after_window_change_gives_back_the_counted_window(self):
+        self.hit_at(659)
+        self.hit_at(659)
+        key = self.key
+        self.assertIsNotNone(key)
+        # Fenêtre suivante : l'essai est rendu dans la fenêtre où il a été compté
+        self.release_at(661, key)
+        self.assertEqual(self.hit_at(661), 0)
+        self.assertEqual(self.hit_at(661), 0)
+        self.assertGreater(self.hit_at(661), 0)
+        self.assertIsNone(self.key)
+
+    def test_parse_rate(self):
+        self.assertEqual(parse_rate("5/min"), (5, 60))
+        self.assertEqual(parse_rate("100/h"), (100, 3600))
+        with self.assertRaises(ValueError):
+            parse_rate("5/semaine")
+
+
+@override_settings(LOGIN_THROTTLE={"IP_RATE": "3/min", "EMAIL_RATE": "2/min"})
+class LoginThrottleTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        UserModel.objects.create_user(email="cible@example.com", password="motdepasse123", full_name="Cible")
+
+    def login(self, email, ip="10.0.0.1", path="/api/login/"):
+        return self.client.post(
+            path, {"email": email, "password": "mauvais-mdp"}, content_type="application/json", REMOTE_ADDR=ip
+        )
+
+    def test_limits_attempts_per_ip_before_any_database_or_hashing_work(self):
+        for i in range(3):
+            self.assertEqual(self.login(f"inconnu{i}@example.com").status_code, 401)
+
+        throttled = metrics.REGISTRY.get("login_throttled_total")
+        before = throttled.value(scope="ip")
+        with mock.patch.object(DjangoPasswordHasher, "hash") as hash_, \
+                mock.patch.object(DjangoPasswordHasher, "verify") as verify, \
+                self.assertNumQueries(0):
+            response = self.login("autre@example.com")
+
+        self.assertEqual(response.status_code, 429)
+        self.assertGreaterEqual(int(response["Retry-After"]), 1)
+        hash_.assert_not_called()
+        verify.assert_not_called()
+        self.assertEqual(throttled.value(scope="ip"), before + 1)
+        # Une autre adresse IP n'est pas concernée
+        self.assertEqual(self.login("autre@example.com", ip="10.0.0.2").status_code, 401)
+
+    def test_spoofed_forwarded_for_does_not_escape_ip_limit(self):
+        # Sans NUM_PROXIES, X-Forwarded-For vient du client : la limite suit REMOTE_ADDR
+        for i in range(3):
+            response = self.client.post(
+                "/api/login/", {"email": f"inconnu{i}@example.com", "password": "mauvais-mdp"},
+                content_type="application/json", REMOTE_ADDR="10.0.0.1", HTTP_X_FORWARDED_FOR=f"203.0.113.{i}",
+            )
+            self.assertEqual(response.status_code, 401)
+        response = self.client.post(
+            "/api/login/", {"email": "autre@example.com", "password": "mauvais-mdp"},
+            content_type="application/json", REMOTE_ADDR="10.0.0.1", HTTP_X_FORWARDED_FOR="203.0.113.99",
+        )
+        self.assertEqual(response.status_code, 429)
+
+    def test_limits_attempts_per_email_across_ips(self):
+        self.assertEqual(self.login("cible@example.com", ip="10.0.0.1").status_code, 401)
+        self.assertEqual(self.login("Cible@Example.com", ip="10.0.0.2").status_code, 401)
+
+        before = metrics.REGISTRY.get("login_throttled_total").value(scope="email")
+        response = self.login("cible@example.com", ip="10.0.0.3")
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(metrics.REGISTRY.get("login_throttled_total").value(scope="email"), before + 1)
+
+    def test_attempt_refused_by_email_does_not_consume_ip_slot(self):
+        self.assertEqual(self.login("cible@example.com").status_code, 401)
+        self.assertEqual(self.login("cible@example.com").status_code, 401)
+        # Refusées par la limite email : la limite IP (3/min) ne les compte pas
+        for _ in range(3):
+            self.assertEqual(self.login("cible@example.com").status_code, 429)
+        self.assertEqual(self.login("autre@example.com").status_code, 401)
+
+    def test_async_attempt_refused_by_email_does_not_consume_ip_slot(self):
+        path = "/api/async/login/"
+        for _ in range(2):
+            self.assertEqual(self.login("cible@example.com", path=path).status_code, 401)
+        for _ in range(3):
+            self.assertEqual(self.login("cible@example.com", path=path).status_code, 429)
+        self.assertEqual(self.login("autre@example.com", path=path).status_code, 401)
+
+    def test_async_login_is_throttled(self):
+        for i in range(3):
+            self.assertEqual(self.login(f"inconnu{i}@example.com", path="/api/async/login/").status_code, 401)
+        response = self.login("autre@example.com", path="/api/async/login/")
+        self.assertEqual(response.status_code, 429)
+        self.assertIn("Retry-After", response)
+        self.assertIn("detail", response.json())
+
+    def test_missing_email_costs_a_hash(self):
+        with mock.patch.object(DjangoPasswordHasher, "hash", return_value="x") as hash_:
+            response = self.login("inconnu@example.com")
+        self.assertEqual(response.status_code, 401)
+        hash_.assert_called_once_with("mauvais-mdp")